@@ -0,0 +1,6 @@
+from .containers import CONTAINER_KEY, AsyncContainer
+from .health import routes as health_routes
+from .incident import routes as incident_routes
+from .util import apigateway_middleware
+
+__all__ = ['CONTAINER_KEY', 'AsyncContainer', 'health_routes', 'incident_routes', 'apigateway_middleware']
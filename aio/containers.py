@@ -0,0 +1,45 @@
+from aiohttp import web
+from dependency_injector import providers
+from dependency_injector.containers import WiringConfiguration
+
+from containers import Container
+from repositories.rest.aio import (
+    AsyncHttpClient,
+    AsyncRestEmployeeRepository,
+    AsyncRestIncidentRepository,
+    AsyncRestUserRepository,
+)
+
+
+# Kept apart from Container so the WSGI deployment never imports aiohttp
+class AsyncContainer(Container):
+    wiring_config = WiringConfiguration(packages=['aio'])
+
+    async_http_client = providers.ThreadSafeSingleton(
+        AsyncHttpClient,
+        options=Container.http_options,
+    )
+
+    async_user_repo = providers.ThreadSafeSingleton(
+        AsyncRestUserRepository,
+        base_url=Container.config.svc.user.url,
+        token_provider=Container.config.svc.user.token_provider,
+        client=async_http_client,
+    )
+
+    async_incident_repo = providers.ThreadSafeSingleton(
+        AsyncRestIncidentRepository,
+        base_url=Container.config.svc.incidentmodify.url,
+        token_provider=Container.config.svc.incidentmodify.token_provider,
+        client=async_http_client,
+    )
+
+    async_employee_repo = providers.ThreadSafeSingleton(
+        AsyncRestEmployeeRepository,
+        base_url=Container.config.svc.client.url,
+        token_provider=Container.config.svc.client.token_provider,
+        client=async_http_client,
+    )
+
+
+CONTAINER_KEY = web.AppKey('container', AsyncContainer)
@@ -0,0 +1,11 @@
+from aiohttp import web
+
+from .util import json_response
+
+routes = web.RouteTableDef()
+
+
+@routes.view('/api/v1/health/registroapp')
+class HealthCheck(web.View):
+    async def get(self) -> web.Response:
+        return json_response({'status': 'Ok'}, 200)
@@ -0,0 +1,117 @@
+import asyncio
+
+import marshmallow
+from aiohttp import web
+from dependency_injector.wiring import Provide
+
+from blueprints.incident import EMPLOYEE_ROLES, JSON_VALIDATION_ERROR
+from blueprints.schemas import IncidentMobileRegistrationBody, IncidentRegistrationBody, schemas
+from models import Channel, Claims, Incident, Role
+from repositories import AsyncEmployeeRepository, AsyncIncidentRepository, AsyncUserRepository
+
+from .containers import AsyncContainer
+from .util import error_response, json_response, read_json, requires_token, validation_error_response
+
+routes = web.RouteTableDef()
+
+
+@routes.view('/api/v1/users/me/incidents')
+class UserIncidents(web.View):
+    @requires_token(client=True)
+    async def post(
+        self,
+        claims: Claims,
+        incident_repo: AsyncIncidentRepository = Provide[AsyncContainer.async_incident_repo],
+    ) -> web.Response:
+        incident = Incident(
+            client_id=claims.client_id,
+            name='Test Incident',
+            channel=Channel.MOBILE,
+            reported_by=claims.sub,
+            created_by=claims.sub,
+            description='This is a test incident',
+            assigned_to=claims.sub,
+        )
+        await incident_repo.create(incident)
+
+        return json_response({'id': '753f5554-c545-447d-8a4d-4eccda9e952a'}, 201)
+
+
+@routes.view('/api/v1/incidents/web')
+class WebRegistrationIncident(web.View):
+    @requires_token(EMPLOYEE_ROLES, client=True)
+    async def post(
+        self,
+        claims: Claims,
+        incident_repo: AsyncIncidentRepository = Provide[AsyncContainer.async_incident_repo],
+        user_repo: AsyncUserRepository = Provide[AsyncContainer.async_user_repo],
+    ) -> web.Response:
+        # Parse request body
+        req_json = await read_json(self.request)
+        if req_json is None:
+            return error_response(JSON_VALIDATION_ERROR, 400)
+
+        try:
+            data = schemas.load(IncidentRegistrationBody, req_json)
+        except marshmallow.ValidationError as err:
+            return validation_error_response(err)
+
+        # Get and validate user, the incident service credentials are prepared at the same time
+        user, _ = await asyncio.gather(user_repo.find_by_email(data.email, claims.client_id), incident_repo.prepare())
+
+        if user is None or user.client_id != claims.client_id:
+            return error_response('Invalid value for email: User does not exist.', 404)
+
+        incident = Incident(
+            client_id=claims.client_id,
+            name=data.name,
+            channel=Channel.WEB,
+            reported_by=user.id,
+            created_by=claims.sub,
+            description=data.description,
+            assigned_to=claims.sub,
+        )
+
+        incident_response = await incident_repo.create(incident)
+
+        return json_response(incident_response, 201)
+
+
+@routes.view('/api/v1/incidents/mobile')
+class MobileRegistrationIncident(web.View):
+    @requires_token([Role.USER], client=True)
+    async def post(
+        self,
+        claims: Claims,
+        incident_repo: AsyncIncidentRepository = Provide[AsyncContainer.async_incident_repo],
+        employee_repo: AsyncEmployeeRepository = Provide[AsyncContainer.async_employee_repo],
+    ) -> web.Response:
+        # Parse request body
+        req_json = await read_json(self.request)
+        if req_json is None:
+            return error_response(JSON_VALIDATION_ERROR, 400)
+
+        try:
+            data = schemas.load(IncidentMobileRegistrationBody, req_json)
+        except marshmallow.ValidationError as err:
+            return validation_error_response(err)
+
+        # Get an assignee
+        assignee = await employee_repo.get_random_agent(claims.client_id)
+
+        if assignee is None:
+            return error_response('No agents available to assign the incident.', 404)
+
+        incident = Incident(
+            client_id=claims.client_id,
+            name=data.name,
+            channel=Channel.MOBILE,
+            reported_by=claims.sub,
+            created_by=claims.sub,
+            description=data.description,
+            assigned_to=assignee.id,
+        )
+
+        incident_response = await incident_repo.create(incident)
+
+        return json_response(incident_response, 201)
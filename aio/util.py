@@ -0,0 +1,66 @@
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from aiohttp import web
+from marshmallow import ValidationError
+from tightwrap import wraps
+
+from models import Role
+from util import serializer
+from util.apigateway import AuthPolicy, AuthRejection, auth_rejections, decode_userinfo
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+def json_response(data: object, status: int) -> web.Response:
+    return web.Response(body=serializer.dumps(data), status=status, content_type='application/json')
+
+
+def error_response(msg: str, code: int) -> web.Response:
+    return json_response({'message': msg, 'code': code}, code)
+
+
+def validation_error_response(err: ValidationError) -> web.Response:
+    if isinstance(err.messages, dict):
+        msg = ' '.join([f'Invalid value for {k}: {" ".join(v)}' for k, v in err.messages.items()])
+        return error_response(msg, 400)
+
+    raise NotImplementedError('Validation error response for non-dict messages not implemented.')  # pragma: no cover
+
+
+async def read_json(request: web.Request) -> Any:  # noqa: ANN401
+    # Same semantics as Flask's request.get_json(silent=True)
+    if request.content_type != 'application/json':
+        return None
+
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+@web.middleware
+async def apigateway_middleware(request: web.Request, handler: Handler) -> web.StreamResponse:
+    request['user_token'] = decode_userinfo(request.headers.get('X-Apigateway-Api-Userinfo'))
+    return await handler(request)
+
+
+# Same policy and rejections as the Flask decorator, the view gets the checked claims as its claims argument
+def requires_token(
+    roles: Iterable[Role] | None = None, *, client: bool = False, claims: Iterable[str] = ()
+) -> Callable[[Callable[..., Awaitable[web.Response]]], Callable[..., Awaitable[web.Response]]]:
+    policy = AuthPolicy(roles, client=client, claims=claims)
+
+    def decorator(f: Callable[..., Awaitable[web.Response]]) -> Callable[..., Awaitable[web.Response]]:
+        @wraps(f)
+        async def decorated_function(self: web.View, *args, **kwargs) -> web.Response:  # type: ignore[no-untyped-def] # noqa: ANN002, ANN003
+            claims = policy.check(self.request.get('user_token'))
+            if isinstance(claims, AuthRejection):
+                auth_rejections.add(claims.reason)
+                return error_response(claims.message, claims.status)
+
+            return await f(self, *args, claims=claims, **kwargs)
+
+        return decorated_function
+
+    return decorator
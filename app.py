@@ -1,32 +1,164 @@
+import atexit
+import functools
 import os
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
 
 from flask import Flask
-from gcp_microservice_utils import setup_apigateway, setup_cloud_logging, setup_cloud_trace
 
-from blueprints import BlueprintHealth, BlueprintIncident
+from blueprints import (
+    BlueprintHealth,
+    BlueprintIncident,
+    BlueprintMetrics,
+    setup_admission,
+    setup_apigateway,
+    setup_metrics,
+)
+from blueprints.schemas import build_schemas
+from blueprints.util import circuit_open_response
 from containers import Container
 from environment import configure_environment_variables
+from repositories.cached import RosterEmployeeRepository
+from util.breaker import CircuitOpenError
+from util.startup import StartupProfile
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+    from repositories.rest.base import RestBaseRepository
+    from workers import HealthMonitor, Warmup
 
 
 class FlaskMicroservice(Flask):
     container: Container
+    startup: StartupProfile
+
+
+def setup_cloud_logging() -> None:  # pragma: no cover
+    # The Google Cloud client libraries take longer to import than the rest of the service, load them only when used
+    from gcp_microservice_utils import setup_cloud_logging
+
+    setup_cloud_logging()
+
+
+def setup_cloud_trace(app: Flask) -> None:  # pragma: no cover
+    from gcp_microservice_utils import setup_cloud_trace
+
+    setup_cloud_trace(app)
+
+
+def downstream_services(container: Container) -> list[tuple[str, 'RestBaseRepository']]:
+    services: list[tuple[str, RestBaseRepository]] = [
+        ('user', container.rest_user_repo()),
+        ('client', container.rest_employee_repo()),
+        ('incidentmodify', container.incident_repo()),
+    ]
+    # Only the services configured for this deployment
+    return [(service, repo) for service, repo in services if repo.base_url]
+
+
+def start_warmup(container: Container, warmup: 'Warmup') -> None:
+    connections = container.config.warmup.connections()
+    for service, repo in downstream_services(container):
+        warmup.add(f'{service}.connections', functools.partial(repo.warm_connections, connections))
+        if repo.token_provider is not None:
+            warmup.add(f'{service}.token', repo.token_provider.get_token)
+
+    warmup.add('schemas', build_schemas)
+
+    employee_repo = container.employee_repo()
+    if isinstance(employee_repo, RosterEmployeeRepository):
+        for client_id in container.config.warmup.clients():
+            warmup.add(f'roster.{client_id}', functools.partial(employee_repo.roster, client_id))
+
+    warmup.start()
+
+
+def start_health_monitor(container: Container, monitor: 'HealthMonitor') -> None:
+    for service, repo in downstream_services(container):
+        monitor.add(service, repo.probe)
+
+    monitor.start()
 
 
 def create_app() -> FlaskMicroservice:
-    if os.getenv('ENABLE_CLOUD_LOGGING') == '1':
-        setup_cloud_logging()  # pragma: no cover
+    startup = StartupProfile()
+
+    if os.getenv('ENABLE_CLOUD_LOGGING') == '1':  # pragma: no cover
+        with startup.phase('cloud_logging'):
+            setup_cloud_logging()
 
     app = FlaskMicroservice(__name__)
-    app.container = Container()
+    app.startup = startup
+
+    with startup.phase('container'):
+        app.container = Container()
 
-    configure_environment_variables(app.container)
+    with startup.phase('environment'):
+        configure_environment_variables(app.container)
 
     if os.getenv('ENABLE_CLOUD_TRACE') == '1':  # pragma: no cover
-        setup_cloud_trace(app)
+        with startup.phase('cloud_trace'):
+            setup_cloud_trace(app)
+
+    with startup.phase('blueprints'):
+        # Registered first so the time spent in the other request hooks is included
+        setup_metrics(app)
+        # Overloaded requests are rejected before any other work is done for them
+        setup_admission(app)
+        setup_apigateway(app)
+
+        app.register_blueprint(BlueprintHealth)
+        app.register_blueprint(BlueprintIncident)
+        app.register_blueprint(BlueprintMetrics)
+
+        # Fail fast while a downstream service is unhealthy
+        app.register_error_handler(CircuitOpenError, circuit_open_response)
+
+    if app.container.config.warmup.mode() == 'background':
+        with startup.phase('warmup'):
+            start_warmup(app.container, app.container.warmup())
+
+    if app.container.config.health.mode() == 'background':
+        with startup.phase('health'):
+            start_health_monitor(app.container, app.container.health_monitor())
+
+    if app.container.config.audit.mode() == 'file':
+        with startup.phase('audit'):
+            audit_log = app.container.audit_log()
+            audit_log.start()
+            # Buffered records are written when the worker exits
+            atexit.register(audit_log.stop)
+
+    if app.container.config.incident_queue.mode() == 'sqlite':  # pragma: no cover
+        with startup.phase('forwarder'):
+            app.container.incident_forwarder().start()
+
+    return app
+
+
+def create_async_app() -> 'web.Application':
+    # Imported here so the WSGI deployment does not load aiohttp
+    from aiohttp import web
+
+    from aio import CONTAINER_KEY, AsyncContainer, apigateway_middleware, health_routes, incident_routes
+
+    if os.getenv('ENABLE_CLOUD_LOGGING') == '1':
+        setup_cloud_logging()  # pragma: no cover
+
+    app = web.Application(middlewares=[apigateway_middleware])
+    container = AsyncContainer()
+    app[CONTAINER_KEY] = container
+
+    configure_environment_variables(container)
+
+    app.add_routes(health_routes)
+    app.add_routes(incident_routes)
 
-    setup_apigateway(app)
+    async def http_client_ctx(_: web.Application) -> AsyncIterator[None]:
+        yield
+        await container.async_http_client().close()
 
-    app.register_blueprint(BlueprintHealth)
-    app.register_blueprint(BlueprintIncident)
+    app.cleanup_ctx.append(http_client_ctx)
 
     return app
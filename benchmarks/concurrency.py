@@ -0,0 +1,138 @@
+# Compares how many web registrations one instance keeps in flight with the threaded WSGI deployment
+# (gunicorn --workers 1 --threads 8) and with the aiohttp application, against downstream services with fixed latency.
+#
+#   python -m benchmarks.concurrency --concurrency 64 --requests 512 --latency 0.1
+import argparse
+import asyncio
+import base64
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+
+import aiohttp
+
+from .stubs import StubOptions, StubServices
+
+DEPLOYMENTS = {
+    'threaded': ['--workers', '1', '--threads', '8', 'app:create_app()'],
+    'async': ['--workers', '1', '--worker-class', 'aiohttp.GunicornWebWorker', 'app:create_async_app()'],
+}
+
+
+@dataclass
+class Result:
+    deployment: str
+    requests: int
+    errors: int
+    elapsed: float
+    peak_in_flight: int
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return int(sock.getsockname()[1])
+
+
+def start_instance(args: list[str], port: int, downstream_url: str) -> subprocess.Popen[bytes]:
+    env = {
+        **os.environ,
+        'USER_SVC_URL': downstream_url,
+        'CLIENT_SVC_URL': downstream_url,
+        'INCIDENTMODIFY_SVC_URL': downstream_url,
+        'HTTP_POOL_MAXSIZE': '64',
+    }
+    return subprocess.Popen(  # noqa: S603
+        [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', *args],
+        env=env,
+    )
+
+
+async def wait_ready(url: str, max_wait: float = 30) -> None:
+    deadline = time.monotonic() + max_wait
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.get(f'{url}/api/v1/health/registroapp') as resp:
+                    if resp.status == 200:  # noqa: PLR2004
+                        return
+            except aiohttp.ClientError:
+                if time.monotonic() > deadline:
+                    raise
+            await asyncio.sleep(0.1)
+
+
+async def drive(url: str, concurrency: int, total: int) -> tuple[int, float]:
+    errors = 0
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async def worker(session: aiohttp.ClientSession) -> None:
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            client_id = str(uuid.uuid4())
+            token = {'sub': str(uuid.uuid4()), 'cid': client_id, 'role': 'agent', 'aud': 'agent'}
+            headers = {'X-Apigateway-Api-Userinfo': base64.urlsafe_b64encode(json.dumps(token).encode()).decode()}
+            body = {'email': f'{client_id}@example.com', 'name': 'Benchmark', 'description': 'Benchmark incident'}
+            async with session.post(f'{url}/api/v1/incidents/web', json=body, headers=headers) as resp:
+                await resp.read()
+                if resp.status != 201:  # noqa: PLR2004
+                    errors += 1
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+        return errors, time.perf_counter() - start
+
+
+def run(deployment: str, stubs: StubServices, concurrency: int, total: int) -> Result:
+    port = free_port()
+    url = f'http://127.0.0.1:{port}'
+    process = start_instance(DEPLOYMENTS[deployment], port, stubs.url)
+
+    try:
+        asyncio.run(wait_ready(url))
+        # Warm up connections and schemas before measuring
+        asyncio.run(drive(url, concurrency, concurrency))
+        stubs.reset_counters()
+        errors, elapsed = asyncio.run(drive(url, concurrency, total))
+    finally:
+        process.terminate()
+        process.wait()
+
+    return Result(deployment, total, errors, elapsed, stubs.peak_in_flight)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--concurrency', type=int, default=64, help='concurrent clients')
+    parser.add_argument('--requests', type=int, default=512, help='registrations per deployment')
+    parser.add_argument('--latency', type=float, default=0.1, help='seconds per downstream call')
+    parser.add_argument('--deployment', choices=list(DEPLOYMENTS), action='append', help='deployments to compare')
+    args = parser.parse_args()
+
+    with StubServices(StubOptions(latency=args.latency)) as stubs:
+        results = [run(deployment, stubs, args.concurrency, args.requests) for deployment in args.deployment or DEPLOYMENTS]
+
+    print(f'{"deployment":<10} {"requests":>8} {"errors":>6} {"req/s":>8} {"peak in-flight downstream":>26}')
+    for result in results:
+        print(
+            f'{result.deployment:<10} {result.requests:>8} {result.errors:>6} '
+            f'{result.throughput:>8.1f} {result.peak_in_flight:>26}'
+        )
+
+
+if __name__ == '__main__':
+    main()
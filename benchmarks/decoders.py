@@ -0,0 +1,85 @@
+# Cost of decoding one downstream response into a model, with the old path (renaming the camelCase keys in place and
+# calling dacite.from_dict) versus the compiled decoders.
+#
+#   python -m benchmarks.decoders --number 20000
+import argparse
+import datetime
+import functools
+import timeit
+from collections.abc import Callable
+from enum import Enum
+from typing import Any
+
+import dacite
+
+from models import Employee, IncidentResponse, User
+from repositories.rest.employee import employee_from_json
+from repositories.rest.incident import incident_response_from_json
+from repositories.rest.user import user_from_json
+
+DACITE_CONFIG = dacite.Config(cast=[Enum], type_hooks={datetime.datetime: datetime.datetime.fromisoformat})
+
+USER = {'id': '1', 'clientId': '2', 'name': 'Reporter', 'email': 'reporter@example.com'}
+EMPLOYEE = {
+    'id': '1',
+    'clientId': '2',
+    'name': 'Agent',
+    'email': 'agent@example.com',
+    'role': 'agent',
+    'invitationStatus': 'accepted',
+    'invitationDate': '2024-01-01T00:00:00',
+}
+INCIDENT = {
+    'id': '1',
+    'client_id': '2',
+    'name': 'Printer',
+    'channel': 'web',
+    'reported_by': '3',
+    'created_by': '3',
+    'assigned_to': '4',
+}
+
+
+def dacite_decoder(cls: type[Any], aliases: dict[str, str]) -> Callable[[dict[str, Any]], Any]:
+    def decode(json: dict[str, Any]) -> Any:  # noqa: ANN401
+        for name, key in aliases.items():
+            json[name] = json.pop(key)
+        return dacite.from_dict(data_class=cls, data=json, config=DACITE_CONFIG)
+
+    return decode
+
+
+CASES: list[tuple[str, dict[str, Any], Callable[[dict[str, Any]], Any], Callable[[dict[str, Any]], Any]]] = [
+    ('User', USER, dacite_decoder(User, {'client_id': 'clientId'}), user_from_json),
+    (
+        'Employee',
+        EMPLOYEE,
+        dacite_decoder(
+            Employee,
+            {'client_id': 'clientId', 'invitation_status': 'invitationStatus', 'invitation_date': 'invitationDate'},
+        ),
+        employee_from_json,
+    ),
+    ('IncidentResponse', INCIDENT, dacite_decoder(IncidentResponse, {}), incident_response_from_json),
+]
+
+
+def decode_copy(decode: Callable[[dict[str, Any]], Any], data: dict[str, Any]) -> None:
+    # Decode a fresh copy, as the decoders would a freshly parsed response
+    decode(dict(data))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=20000, help='decodes per measurement')
+    args = parser.parse_args()
+
+    print(f'{"model":<18} {"dacite (us)":>12} {"compiled (us)":>14} {"speedup":>8}')
+    for name, data, old, new in CASES:
+        old_us = timeit.timeit(functools.partial(decode_copy, old, data), number=args.number) / args.number * 1e6
+        new_us = timeit.timeit(functools.partial(decode_copy, new, data), number=args.number) / args.number * 1e6
+        print(f'{name:<18} {old_us:>12.2f} {new_us:>14.2f} {old_us / new_us:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+# Registration load test: drives the web and mobile registration endpoints of a threaded gunicorn instance of the app
+# against stand-in downstream services with configurable latency and errors. Reports throughput, latency percentiles and
+# CPU time of the instance per request, and compares them with a baseline saved by an earlier run (of another commit).
+#
+#   python -m benchmarks.load --requests 1000 --concurrency 32 --latency 0.02 --save
+#   python -m benchmarks.load --requests 1000 --concurrency 32 --latency 0.02 --jitter 0.01 --error-rate 0.01 \
+#       --service incidentmodify:latency=0.1,error_rate=0.05
+import argparse
+import asyncio
+import base64
+import dataclasses
+import json
+import os
+import statistics
+import subprocess
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+from .concurrency import free_port, start_instance, wait_ready
+from .stubs import StubOptions, StubServices
+
+DEFAULT_BASELINE = Path('.benchmarks/load.json')
+
+Request = tuple[dict[str, str], dict[str, str]]
+
+
+def encode_token(token: dict[str, str]) -> dict[str, str]:
+    return {'X-Apigateway-Api-Userinfo': base64.urlsafe_b64encode(json.dumps(token).encode()).decode()}
+
+
+def web_request() -> Request:
+    client_id = str(uuid.uuid4())
+    token = {'sub': str(uuid.uuid4()), 'cid': client_id, 'role': 'agent', 'aud': 'agent'}
+    # The stand-in user service reads the client id from the email
+    body = {'email': f'{client_id}@example.com', 'name': 'Benchmark', 'description': 'Benchmark incident'}
+    return encode_token(token), body
+
+
+def mobile_request() -> Request:
+    token = {'sub': str(uuid.uuid4()), 'cid': str(uuid.uuid4()), 'role': 'user', 'aud': 'user'}
+    body = {'name': 'Benchmark', 'description': 'Benchmark incident'}
+    return encode_token(token), body
+
+
+ENDPOINTS: dict[str, tuple[str, Callable[[], Request]]] = {
+    'web': ('/api/v1/incidents/web', web_request),
+    'mobile': ('/api/v1/incidents/mobile', mobile_request),
+}
+
+
+@dataclass
+class Summary:
+    endpoint: str
+    requests: int
+    # Responses other than 201, by status code
+    errors: dict[str, int]
+    throughput: float
+    p50: float
+    p95: float
+    p99: float
+    # CPU seconds of the instance per request, None where it cannot be measured
+    cpu_per_request: float | None
+
+
+def cpu_seconds(pid: int) -> float | None:
+    # User and system CPU time of a process and its direct children (the gunicorn worker), read from /proc
+    proc = Path('/proc')
+    if not proc.is_dir():
+        return None
+
+    ticks = 0
+    for stat in proc.glob('[0-9]*/stat'):
+        try:
+            process_id = int(stat.parent.name)
+            # Fields after the command name, which may contain spaces: state, ppid, ..., utime (11), stime (12)
+            fields = stat.read_text().rsplit(')', 1)[1].split()
+        except (OSError, IndexError, ValueError):
+            continue
+        if process_id == pid or int(fields[1]) == pid:
+            ticks += int(fields[11]) + int(fields[12])
+
+    return ticks / os.sysconf('SC_CLK_TCK')
+
+
+async def drive(url: str, endpoint: str, concurrency: int, total: int) -> tuple[list[float], Counter[int], float]:
+    path, build = ENDPOINTS[endpoint]
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    remaining = total
+
+    async def worker(session: aiohttp.ClientSession) -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            headers, body = build()
+            start = time.perf_counter()
+            async with session.post(f'{url}{path}', json=body, headers=headers) as resp:
+                await resp.read()
+            latencies.append(time.perf_counter() - start)
+            statuses[resp.status] += 1
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+        return latencies, statuses, time.perf_counter() - start
+
+
+def summarize(endpoint: str, latencies: list[float], statuses: Counter[int], elapsed: float, cpu: float | None) -> Summary:
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return Summary(
+        endpoint=endpoint,
+        requests=len(latencies),
+        errors={str(status): count for status, count in sorted(statuses.items()) if status != 201},  # noqa: PLR2004
+        throughput=len(latencies) / elapsed,
+        p50=cuts[49],
+        p95=cuts[94],
+        p99=cuts[98],
+        cpu_per_request=None if cpu is None else cpu / len(latencies),
+    )
+
+
+def run(stubs: StubServices, threads: int, endpoints: list[str], concurrency: int, total: int) -> list[Summary]:
+    port = free_port()
+    url = f'http://127.0.0.1:{port}'
+    process = start_instance(['--workers', '1', '--threads', str(threads), 'app:create_app()'], port, stubs.url)
+
+    summaries = []
+    try:
+        asyncio.run(wait_ready(url))
+        for endpoint in endpoints:
+            # Warm up connections, caches and schemas before measuring
+            asyncio.run(drive(url, endpoint, concurrency, concurrency))
+            cpu_before = cpu_seconds(process.pid)
+            latencies, statuses, elapsed = asyncio.run(drive(url, endpoint, concurrency, total))
+            cpu_after = cpu_seconds(process.pid)
+            cpu = None if cpu_before is None or cpu_after is None else cpu_after - cpu_before
+            summaries.append(summarize(endpoint, latencies, statuses, elapsed, cpu))
+    finally:
+        process.terminate()
+        process.wait()
+
+    return summaries
+
+
+def parse_service_options(values: list[str], defaults: StubOptions) -> dict[str, StubOptions]:
+    # SERVICE:KEY=VALUE[,KEY=VALUE...], e.g. user:latency=0.1,error_rate=0.05
+    services: dict[str, StubOptions] = {}
+    for value in values:
+        service, _, settings = value.partition(':')
+        changes: dict[str, Any] = {}
+        for setting in filter(None, settings.split(',')):
+            key, _, number = setting.partition('=')
+            if key not in {'latency', 'jitter', 'error_rate', 'error_status'}:
+                raise argparse.ArgumentTypeError(f'Unknown stub option {key}')
+            changes[key] = int(number) if key == 'error_status' else float(number)
+        services[service] = dataclasses.replace(services.get(service, defaults), **changes)
+    return services
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True)  # noqa: S603, S607
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def format_change(value: float, baseline: float | None) -> str:
+    if baseline is None or baseline == 0:
+        return ''
+    return f'{(value - baseline) / baseline * 100:+.0f}%'
+
+
+def report(summaries: list[Summary], baseline: dict[str, Any] | None) -> None:
+    previous = {summary['endpoint']: summary for summary in baseline['results']} if baseline is not None else {}
+    if baseline is not None:
+        print(f'Compared with baseline of commit {baseline.get("commit") or "unknown"}')
+
+    print(
+        f'{"endpoint":<8} {"requests":>8} {"errors":>7} {"req/s":>14} {"p50 (ms)":>14} {"p95 (ms)":>14} '
+        f'{"p99 (ms)":>14} {"cpu/req (ms)":>16}'
+    )
+    for summary in summaries:
+        base = previous.get(summary.endpoint, {})
+        cpu = summary.cpu_per_request
+        cpu_column = 'n/a' if cpu is None else f'{cpu * 1e3:.2f} {format_change(cpu, base.get("cpu_per_request")):>5}'
+        print(
+            f'{summary.endpoint:<8} {summary.requests:>8} {sum(summary.errors.values()):>7} '
+            f'{summary.throughput:>8.1f} {format_change(summary.throughput, base.get("throughput")):>5} '
+            + ' '.join(
+                f'{getattr(summary, name) * 1e3:>8.1f} {format_change(getattr(summary, name), base.get(name)):>5}'
+                for name in ('p50', 'p95', 'p99')
+            )
+            + f' {cpu_column:>16}'
+        )
+        for status, count in summary.errors.items():
+            print(f'  {count} responses with status {status}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=1000, help='registrations per endpoint')
+    parser.add_argument('--concurrency', type=int, default=32, help='concurrent clients')
+    parser.add_argument('--threads', type=int, default=8, help='gunicorn threads of the instance')
+    parser.add_argument('--endpoint', choices=list(ENDPOINTS), action='append', help='endpoints to drive')
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds per downstream call')
+    parser.add_argument('--jitter', type=float, default=0, help='mean of the exponential delay added to downstream calls')
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of downstream calls that fail')
+    parser.add_argument('--error-status', type=int, default=503, help='status code of failed downstream calls')
+    parser.add_argument('--service', action='append', default=[], help='per service stub options, e.g. user:latency=0.1')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the simulated latencies and errors')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='baseline to compare with')
+    parser.add_argument('--save', action='store_true', help='store the results as the new baseline')
+    args = parser.parse_args()
+
+    options = StubOptions(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+    options.services = parse_service_options(args.service, options)
+    endpoints = args.endpoint or list(ENDPOINTS)
+
+    with StubServices(options) as stubs:
+        summaries = run(stubs, args.threads, endpoints, args.concurrency, args.requests)
+
+    settings = {key: value for key, value in vars(args).items() if key not in {'baseline', 'save'}}
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    if baseline is not None and baseline.get('settings') != settings:
+        print('Warning: the baseline was recorded with different settings')
+    report(summaries, baseline)
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        results = [dataclasses.asdict(summary) for summary in summaries]
+        args.baseline.write_text(json.dumps({'commit': git_commit(), 'settings': settings, 'results': results}, indent=2))
+        print(f'Saved baseline to {args.baseline}')
+
+
+if __name__ == '__main__':
+    main()
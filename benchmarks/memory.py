@@ -0,0 +1,113 @@
+# Memory held per cached user (in the user cache, under its email and id keys) and per employee (in an agent roster),
+# for the models as plain dataclasses decoded without interning versus the slotted models with interned strings.
+#
+#   python -m benchmarks.memory --users 10000 --clients 20
+import argparse
+import dataclasses
+import datetime
+import json
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from models import Employee, User
+from repositories.rest import compile_decoder
+from repositories.rest.employee import employee_from_json
+from repositories.rest.user import user_from_json
+from util.ttlcache import TTLCache
+
+USER_ALIASES = {'client_id': 'clientId'}
+EMPLOYEE_ALIASES = {'client_id': 'clientId', 'invitation_status': 'invitationStatus', 'invitation_date': 'invitationDate'}
+
+
+def plain(cls: type[Any]) -> type[Any]:
+    # Same fields, with a per-instance __dict__
+    return dataclasses.make_dataclass(f'Plain{cls.__name__}', [(field.name, field.type) for field in dataclasses.fields(cls)])
+
+
+def user_responses(count: int, clients: list[str]) -> list[bytes]:
+    return [
+        json.dumps(
+            {'id': str(uuid.uuid4()), 'clientId': clients[i % len(clients)], 'name': 'Reporter', 'email': f'{i}@example.com'}
+        ).encode()
+        for i in range(count)
+    ]
+
+
+def employee_responses(count: int, clients: list[str]) -> list[bytes]:
+    return [
+        json.dumps(
+            {
+                'id': str(uuid.uuid4()),
+                'clientId': clients[i % len(clients)],
+                'name': 'Agent',
+                'email': f'agent{i}@example.com',
+                'role': 'agent',
+                'invitationStatus': 'accepted',
+                'invitationDate': datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC).isoformat(),
+            }
+        ).encode()
+        for i in range(count)
+    ]
+
+
+def measure(build: Callable[[], object], count: int) -> float:
+    # Bytes still allocated once the structure is built, per entry. Every response is parsed separately, so strings
+    # are only shared when the decoder interns them.
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return (after - before) / count
+
+
+def cache_users(responses: list[bytes], decode: Callable[[Any], Any]) -> Callable[[], object]:
+    def build() -> object:
+        cache: TTLCache[tuple[str, str | None, str], Any] = TTLCache(len(responses))
+        for response in responses:
+            user = decode(json.loads(response))
+            cache.set(('email', user.client_id, user.email), user, 300)
+            cache.set(('id', user.client_id, user.id), user, 300)
+        return cache
+
+    return build
+
+
+def roster_employees(responses: list[bytes], decode: Callable[[Any], Any]) -> Callable[[], object]:
+    def build() -> object:
+        rosters: dict[str, list[Any]] = {}
+        for response in responses:
+            employee = decode(json.loads(response))
+            rosters.setdefault(employee.client_id, []).append(employee)
+        return {client_id: tuple(agents) for client_id, agents in rosters.items()}
+
+    return build
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=10000, help='cached users and roster employees')
+    parser.add_argument('--clients', type=int, default=20, help='clients the users belong to')
+    args = parser.parse_args()
+
+    clients = [str(uuid.uuid4()) for _ in range(args.clients)]
+    users = user_responses(args.users, clients)
+    employees = employee_responses(args.users, clients)
+
+    cases = [
+        ('cached user', 'plain', cache_users(users, compile_decoder(plain(User), USER_ALIASES))),
+        ('cached user', 'slotted', cache_users(users, user_from_json)),
+        ('roster employee', 'plain', roster_employees(employees, compile_decoder(plain(Employee), EMPLOYEE_ALIASES))),
+        ('roster employee', 'slotted', roster_employees(employees, employee_from_json)),
+    ]
+
+    print(f'{"entry":<16} {"model":<8} {"bytes/entry":>12}')
+    for entry, model, build in cases:
+        print(f'{entry:<16} {model:<8} {measure(build, args.users):>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+# Validation cost of one registration body, rebuilding the schema on every request (the old behaviour) versus
+# reusing the schema from the registry.
+#
+#   python -m benchmarks.schemas --number 2000
+import argparse
+import timeit
+from typing import Any
+
+import marshmallow_dataclass
+
+from blueprints.schemas import IncidentMobileRegistrationBody, IncidentRegistrationBody, SchemaRegistry
+
+BODIES: dict[type[Any], dict[str, str]] = {
+    IncidentRegistrationBody: {'email': 'reporter@example.com', 'name': 'Printer', 'description': 'It does not print'},
+    IncidentMobileRegistrationBody: {'name': 'Printer', 'description': 'It does not print'},
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=2000, help='validations per measurement')
+    args = parser.parse_args()
+
+    registry = SchemaRegistry()
+
+    print(f'{"schema":<32} {"rebuilt (us)":>12} {"cached (us)":>12} {"speedup":>8}')
+    for cls, body in BODIES.items():
+
+        def rebuilt_schema(cls: type[Any] = cls, body: dict[str, str] = body) -> None:
+            marshmallow_dataclass.class_schema(cls)().load(body)
+
+        def cached_schema(cls: type[Any] = cls, body: dict[str, str] = body) -> None:
+            registry.get(cls).load(body)
+
+        rebuilt = timeit.timeit(rebuilt_schema, number=args.number)
+        cached = timeit.timeit(cached_schema, number=args.number)
+        rebuilt_us = rebuilt / args.number * 1e6
+        cached_us = cached / args.number * 1e6
+        print(f'{cls.__name__:<32} {rebuilt_us:>12.1f} {cached_us:>12.1f} {rebuilt_us / cached_us:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# Cost of building a JSON response for a created incident and for an error, with the old path (intermediate dict +
+# json.dumps into a str body) and with each serializer backend writing bytes from the dataclass directly.
+#
+#   python -m benchmarks.serialization --number 20000
+import argparse
+import json
+import timeit
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from flask import Response
+
+from models import Channel, IncidentResponse
+from util.serializer import JsonSerializer, OrjsonSerializer, StdlibJsonSerializer
+
+INCIDENT = IncidentResponse(
+    id=str(uuid.uuid4()),
+    client_id=str(uuid.uuid4()),
+    name='Printer',
+    channel=Channel.WEB,
+    reported_by=str(uuid.uuid4()),
+    created_by=str(uuid.uuid4()),
+    assigned_to=str(uuid.uuid4()),
+)
+
+ERROR = {'message': 'Invalid value for email: User does not exist.', 'code': 404}
+
+
+def incident_to_dict(incident: IncidentResponse) -> dict[str, Any]:
+    return {
+        'id': incident.id,
+        'client_id': incident.client_id,
+        'name': incident.name,
+        'channel': incident.channel,
+        'reported_by': incident.reported_by,
+        'created_by': incident.created_by,
+        'assigned_to': incident.assigned_to,
+    }
+
+
+def legacy_success() -> Response:
+    return Response(json.dumps(incident_to_dict(INCIDENT)), status=201, mimetype='application/json')
+
+
+def legacy_error() -> Response:
+    return Response(json.dumps(ERROR), status=404, mimetype='application/json')
+
+
+def backend(serializer: JsonSerializer, data: object, status: int) -> Callable[[], Response]:
+    def build() -> Response:
+        return Response(serializer.dumps(data), status=status, mimetype='application/json')
+
+    return build
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=20000, help='responses per measurement')
+    args = parser.parse_args()
+
+    cases: list[tuple[str, str, Callable[[], Response]]] = [
+        ('success', 'legacy', legacy_success),
+        ('error', 'legacy', legacy_error),
+    ]
+    for serializer in (StdlibJsonSerializer(), OrjsonSerializer()):
+        cases.append(('success', serializer.name, backend(serializer, INCIDENT, 201)))
+        cases.append(('error', serializer.name, backend(serializer, ERROR, 404)))
+
+    print(f'{"body":<8} {"backend":<8} {"us/response":>12}')
+    for body, name, build in sorted(cases, key=lambda case: case[0], reverse=True):
+        elapsed = timeit.timeit(build, number=args.number)
+        print(f'{body:<8} {name:<8} {elapsed / args.number * 1e6:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
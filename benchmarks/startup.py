@@ -0,0 +1,55 @@
+# Startup regression check: median import time of the app module and time to the first response over fresh
+# interpreters, failing (exit status 1) when either exceeds its threshold.
+#
+#   python -m benchmarks.startup --runs 5 --max-import-ms 600 --max-first-response-ms 800
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+
+def measure() -> dict[str, float]:
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, '-m', 'util.startup', '--json'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    phases: dict[str, float] = json.loads(result.stdout)
+    return phases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters to measure')
+    parser.add_argument('--max-import-ms', type=float, default=600, help='threshold for the median import time')
+    parser.add_argument(
+        '--max-first-response-ms', type=float, default=800, help='threshold for the median time to first response'
+    )
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.runs)]
+    checks = [
+        ('import app', 'import', args.max_import_ms),
+        ('create_app', 'create_app', None),
+        ('first response', 'first_response', None),
+        ('time to first response', 'total', args.max_first_response_ms),
+    ]
+
+    failed = False
+    print(f'{"phase":<24} {"median (ms)":>12} {"max (ms)":>9} {"threshold":>10}')
+    for label, key, threshold in checks:
+        median_ms = statistics.median(run[key] for run in runs) * 1e3
+        max_ms = max(run[key] for run in runs) * 1e3
+        exceeded = threshold is not None and median_ms > threshold
+        failed = failed or exceeded
+        limit = '' if threshold is None else f'{threshold:.0f}'
+        print(f'{label:<24} {median_ms:>12.1f} {max_ms:>9.1f} {limit:>10}{"  FAILED" if exceeded else ""}')
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
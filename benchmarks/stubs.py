@@ -0,0 +1,135 @@
+import asyncio
+import random
+import threading
+import uuid
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any
+
+from aiohttp import web
+
+
+@dataclass
+class StubOptions:
+    # Seconds every downstream call takes
+    latency: float = 0.05
+    # Mean of an exponentially distributed delay added to the latency, for a long tail
+    jitter: float = 0
+    # Fraction of calls answered with error_status
+    error_rate: float = 0
+    error_status: int = 503
+    # Options of individual services (user, client or incidentmodify), overriding the ones above
+    services: dict[str, 'StubOptions'] = field(default_factory=dict)
+    seed: int | None = None
+
+    def for_service(self, service: str) -> 'StubOptions':
+        return self.services.get(service, self)
+
+
+# In-process stand-in for the user, client and incidentmodify services. All of them share one server, their paths do
+# not overlap, so the same URL is used for every *_SVC_URL variable.
+class StubServices:
+    def __init__(self, options: StubOptions | None = None) -> None:
+        self.options = options or StubOptions()
+        self.url = ''
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.calls = 0
+        self.errors = 0
+        self._random = random.Random(self.options.seed)  # noqa: S311
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._runner: web.AppRunner | None = None
+
+    def __enter__(self) -> 'StubServices':
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def reset_counters(self) -> None:
+        self.peak_in_flight = 0
+        self.calls = 0
+        self.errors = 0
+
+    async def _start(self) -> None:
+        app = web.Application()
+        app.router.add_post('/api/v1/users/detail', self.find_user)
+        app.router.add_get('/api/v1/random/{client_id}/agent', self.random_agent)
+        app.router.add_get('/api/v1/clients/{client_id}/agents', self.list_agents)
+        app.router.add_post('/api/v1/register/incident', self.register_incident)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f'http://127.0.0.1:{port}'
+
+    async def _stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _simulate(self, service: str) -> web.Response | None:
+        # Returns the error response to send instead of a successful one, if any
+        options = self.options.for_service(service)
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            delay = options.latency
+            if options.jitter > 0:
+                delay += self._random.expovariate(1 / options.jitter)
+            await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+
+        if self._random.random() < options.error_rate:
+            self.errors += 1
+            return web.json_response({'message': 'Simulated failure'}, status=options.error_status)
+
+        return None
+
+    async def find_user(self, request: web.Request) -> web.Response:
+        if (error := await self._simulate('user')) is not None:
+            return error
+        body = await request.json()
+        # The client id is encoded in the email so the registration passes the tenant check
+        client_id = body['email'].split('@')[0]
+        return web.json_response({'id': str(uuid.uuid4()), 'clientId': client_id, 'name': 'Reporter', 'email': body['email']})
+
+    def _agent(self, client_id: str) -> dict[str, str]:
+        return {
+            'id': str(uuid.uuid4()),
+            'clientId': client_id,
+            'name': 'Agent',
+            'email': 'agent@example.com',
+            'role': 'agent',
+            'invitationStatus': 'accepted',
+            'invitationDate': '2024-01-01T00:00:00',
+        }
+
+    async def random_agent(self, request: web.Request) -> web.Response:
+        if (error := await self._simulate('client')) is not None:
+            return error
+        return web.json_response(self._agent(request.match_info['client_id']))
+
+    async def list_agents(self, request: web.Request) -> web.Response:
+        if (error := await self._simulate('client')) is not None:
+            return error
+        return web.json_response([self._agent(request.match_info['client_id']) for _ in range(5)])
+
+    async def register_incident(self, request: web.Request) -> web.Response:
+        if (error := await self._simulate('incidentmodify')) is not None:
+            return error
+        body: dict[str, Any] = await request.json()
+        body.pop('description')
+        return web.json_response({'id': str(uuid.uuid4()), **body}, status=201)
@@ -1,6 +1,10 @@
 # ruff: noqa: N812
 
+from .admission import setup_admission
 from .health import blp as BlueprintHealth
 from .incident import blp as BlueprintIncident
+from .metrics import blp as BlueprintMetrics
+from .metrics import setup_metrics
+from .util import setup_apigateway
 
-__all__ = ['BlueprintHealth', 'BlueprintIncident']
+__all__ = ['BlueprintHealth', 'BlueprintIncident', 'BlueprintMetrics', 'setup_admission', 'setup_apigateway', 'setup_metrics']
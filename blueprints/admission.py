@@ -0,0 +1,50 @@
+import time
+
+from dependency_injector.wiring import Provide
+from flask import Flask, Response, g, request
+
+from containers import Container
+from util.admission import AdaptiveLimiter
+
+from .util import error_response
+
+# Blueprints whose requests go through admission control, health checks and metrics are always served
+ADMITTED_BLUEPRINTS = frozenset({'Incidents'})
+# Bulk registrations and imports last as long as their registrations, they would hold a slot throughout and count as
+# slow requests, shrinking the limit for single registrations. They are limited by their own number of concurrent
+# requests instead.
+EXEMPT_ENDPOINTS = frozenset({'Incidents.BulkWebRegistrationIncident', 'Incidents.WebImportIncident'})
+
+
+def admission_limiter(limiter: AdaptiveLimiter | None = Provide[Container.admission_limiter]) -> AdaptiveLimiter | None:
+    return limiter
+
+
+def admit_request() -> Response | None:
+    if request.blueprint not in ADMITTED_BLUEPRINTS or request.endpoint in EXEMPT_ENDPOINTS:
+        return None
+
+    limiter = admission_limiter()
+    if limiter is None:
+        return None
+
+    if not limiter.try_acquire():
+        response = error_response('Service overloaded, try again later.', 503)
+        response.headers['Retry-After'] = str(limiter.retry_after)
+        return response
+
+    g.admission = (limiter, time.perf_counter())
+    return None
+
+
+def release_request(_: BaseException | None) -> None:
+    # Runs for every request, also when the view raised
+    admission: tuple[AdaptiveLimiter, float] | None = g.pop('admission', None)
+    if admission is not None:
+        limiter, start = admission
+        limiter.release(time.perf_counter() - start)
+
+
+def setup_admission(app: Flask) -> None:
+    app.before_request(admit_request)
+    app.teardown_request(release_request)
@@ -0,0 +1,54 @@
+import time
+from collections.abc import Callable
+
+from dependency_injector.wiring import Provide
+from flask import Response, g
+from tightwrap import wraps
+
+from containers import Container
+from models import AuditRecord, Channel, Claims, Incident
+from util.breaker import CircuitOpenError
+from workers import AuditLog
+
+
+def audit_log(log: AuditLog | None = Provide[Container.audit_log]) -> AuditLog | None:
+    return log
+
+
+def audited(channel: Channel) -> Callable[[Callable[..., Response]], Callable[..., Response]]:
+    # Goes after requires_token. The assignee is taken from the incident the view registered, replayed responses have none.
+    def decorator(f: Callable[..., Response]) -> Callable[..., Response]:
+        @wraps(f)
+        def decorated_function(*args, claims: Claims, **kwargs) -> Response:  # type: ignore[no-untyped-def] # noqa: ANN002, ANN003
+            log = audit_log()
+            if log is None:
+                return f(*args, claims=claims, **kwargs)
+
+            timestamp = time.time()
+            start = time.perf_counter()
+            status = 500
+            try:
+                response = f(*args, claims=claims, **kwargs)
+            except CircuitOpenError:
+                status = 503
+                raise
+            else:
+                status = response.status_code
+                return response
+            finally:
+                incident: Incident | None = g.get('incident')
+                log.record(
+                    AuditRecord(
+                        timestamp=timestamp,
+                        channel=channel,
+                        client_id=claims.cid,
+                        user_id=claims.sub,
+                        assigned_to=incident.assigned_to if incident is not None else None,
+                        status=status,
+                        latency=time.perf_counter() - start,
+                    )
+                )
+
+        return decorated_function
+
+    return decorator
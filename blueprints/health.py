@@ -1,14 +1,93 @@
+import time
+from typing import Any
+
+from dependency_injector.wiring import Provide
 from flask import Blueprint, Response
 from flask.views import MethodView
 
+from containers import Container
+from workers import HealthMonitor, Warmup
+
 from .util import class_route, json_response
 
 blp = Blueprint('Health Check', __name__)
 
 
+def warmup(warmup: Warmup | None = Provide[Container.warmup]) -> Warmup | None:
+    return warmup
+
+
+def health_monitor(monitor: HealthMonitor | None = Provide[Container.health_monitor]) -> HealthMonitor | None:
+    return monitor
+
+
 @class_route(blp, '/api/v1/health/registroapp')
 class HealthCheck(MethodView):
     init_every_request = False
 
     def get(self) -> Response:
         return json_response({'status': 'Ok'}, 200)
+
+
+# Separate from the liveness check: an instance that is still warming up is alive, but not ready for traffic
+@class_route(blp, '/api/v1/health/registroapp/ready')
+class ReadinessCheck(MethodView):
+    init_every_request = False
+
+    def get(self) -> Response:
+        current = warmup()
+        if current is None:
+            return json_response({'status': 'Ready'}, 200)
+
+        status = current.status()
+        body = {
+            'status': 'Ready' if status.ready else 'Warming',
+            'elapsed': round(status.elapsed, 3),
+            'tasks': {
+                task.name: {
+                    'status': task.status,
+                    'duration': None if task.duration is None else round(task.duration, 3),
+                    'error': task.error,
+                }
+                for task in status.tasks
+            },
+        }
+        return json_response(body, 200 if status.ready else 503)
+
+
+# Reports the downstream services as last probed by the health monitor, without calling them
+@class_route(blp, '/api/v1/health/registroapp/dependencies')
+class DependencyHealthCheck(MethodView):
+    init_every_request = False
+
+    def get(self) -> Response:
+        monitor = health_monitor()
+        if monitor is None:
+            return json_response({'status': 'Ok', 'dependencies': {}}, 200)
+
+        results = monitor.results()
+        now = time.time()
+        healthy = True
+        dependencies: dict[str, dict[str, Any]] = {}
+        for name in monitor.dependencies:
+            result = results.get(name)
+            if result is None:
+                # Not probed yet
+                healthy = False
+                dependencies[name] = {'status': 'unknown'}
+                continue
+
+            age = now - result.checked_at
+            stale = age > monitor.max_age
+            healthy = healthy and result.healthy and not stale
+            dependencies[name] = {
+                'status': 'up' if result.healthy else 'down',
+                'latency': round(result.latency, 3),
+                'age': round(age, 3),
+                'stale': stale,
+                'error': result.error,
+            }
+
+        return json_response(
+            {'status': 'Ok' if healthy else 'Unhealthy', 'dependencies': dependencies}, 200 if healthy else 503
+        )
@@ -0,0 +1,95 @@
+import hashlib
+from collections.abc import Callable
+
+from dependency_injector.wiring import Provide
+from flask import Response, request
+from tightwrap import wraps
+
+from containers import Container
+from models import Claims, StoredResponse
+from repositories import IdempotencyRepository
+from util.singleflight import SingleFlight
+
+from .util import error_response
+
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+REPLAYED_HEADER = 'Idempotent-Replayed'
+# Headers replayed along with the stored status and body
+STORED_HEADERS = ('Content-Type', 'Location')
+
+# Requests with a key that is still being processed wait for the first one instead of running again
+in_flight: SingleFlight[str, StoredResponse] = SingleFlight()
+
+
+def request_fingerprint() -> str:
+    return hashlib.sha256(request.get_data()).hexdigest()
+
+
+def store_response(fingerprint: str, response: Response) -> StoredResponse:
+    return StoredResponse(
+        fingerprint=fingerprint,
+        status=response.status_code,
+        body=response.get_data(),
+        headers=tuple((name, response.headers[name]) for name in STORED_HEADERS if name in response.headers),
+    )
+
+
+def stored_to_response(stored: StoredResponse, *, replayed: bool) -> Response:
+    response = Response(stored.body, status=stored.status, headers=list(stored.headers))
+    if replayed:
+        response.headers[REPLAYED_HEADER] = 'true'
+    return response
+
+
+def idempotency_repository(
+    repo: IdempotencyRepository | None = Provide[Container.idempotency_repo],
+) -> IdempotencyRepository | None:
+    return repo
+
+
+def run_idempotent(repo: IdempotencyRepository | None, scope: str, handler: Callable[[], Response]) -> Response:
+    # Runs the handler once per Idempotency-Key (within the scope, the caller and endpoint), later requests with the same
+    # key get the stored response. Server errors are not stored, so the request can be retried.
+    key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    if repo is None or key is None:
+        return handler()
+
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        return error_response(
+            f'{IDEMPOTENCY_KEY_HEADER} must have between 1 and {IDEMPOTENCY_KEY_MAX_LENGTH} characters.', 400
+        )
+
+    scoped_key = f'{scope}:{key}'
+    fingerprint = request_fingerprint()
+    executed = False
+
+    def execute() -> StoredResponse:
+        nonlocal executed
+        # A request with the same key may have finished between the lookup and this call
+        stored = repo.get(scoped_key)
+        if stored is not None:
+            return stored
+
+        executed = True
+        stored = store_response(fingerprint, handler())
+        if stored.status < 500:  # noqa: PLR2004
+            repo.save(scoped_key, stored)
+        return stored
+
+    stored = repo.get(scoped_key) or in_flight.do(scoped_key, execute)
+
+    if stored.fingerprint != fingerprint:
+        return error_response(f'{IDEMPOTENCY_KEY_HEADER} was already used for a different request.', 422)
+
+    return stored_to_response(stored, replayed=not executed)
+
+
+def idempotent(f: Callable[..., Response]) -> Callable[..., Response]:
+    # Goes after requires_token, keys are scoped to the user and client of the claims and to the endpoint
+    @wraps(f)
+    def decorated_function(*args, claims: Claims, **kwargs) -> Response:  # type: ignore[no-untyped-def] # noqa: ANN002, ANN003
+        scope = f'{claims.cid}:{claims.sub}:{request.path}'
+        return run_idempotent(idempotency_repository(), scope, lambda: f(*args, claims=claims, **kwargs))
+
+    return decorated_function
@@ -1,68 +1,70 @@
-from dataclasses import dataclass, field
-from typing import Any
+import functools
+import json
+import logging
+import threading
+from collections.abc import Iterable, Iterator
+from typing import IO, Any
 
 import marshmallow
-import marshmallow_dataclass
 from dependency_injector.wiring import Provide
-from flask import Blueprint, Response, request
+from flask import Blueprint, Response, g, request, stream_with_context
 from flask.views import MethodView
 
 from containers import Container
-from models import Channel, Incident, IncidentResponse, Role
-from repositories import EmployeeRepository, IncidentRepository, UserRepository
-
-from .util import class_route, error_response, json_response, requires_token, validation_error_response
+from models import Channel, Claims, Incident, IncidentResponse, Role, Submission, User
+from repositories import EmployeeRepository, IncidentRepository, SubmissionRepository, UserRepository
+from util import FanOut, serializer
+from util.spool import UploadSpool
+
+from .audit import audited
+from .idempotency import idempotent
+from .schemas import IncidentMobileRegistrationBody, IncidentRegistrationBody, schemas
+from .util import (
+    class_route,
+    error_response,
+    json_response,
+    read_lines,
+    requires_token,
+    validation_error_message,
+    validation_error_response,
+)
 
 blp = Blueprint('Incidents', __name__)
 
 JSON_VALIDATION_ERROR = 'Request body must be a JSON object.'
-
-
-def incident_to_dict(incident: IncidentResponse) -> dict[str, Any]:
-    return {
-        'id': incident.id,
-        'client_id': incident.client_id,
-        'name': incident.name,
-        'channel': incident.channel,
-        'reported_by': incident.reported_by,
-        'created_by': incident.created_by,
-        'assigned_to': incident.assigned_to,
-    }
-
-
-# Incident validation class
-@dataclass
-class IncidentRegistrationBody:
-    email: str = field(metadata={'validate': [marshmallow.validate.Email(), marshmallow.validate.Length(min=1, max=60)]})
-    name: str = field(metadata={'validate': [marshmallow.validate.Length(min=1, max=60)]})
-    description: str = field(metadata={'validate': [marshmallow.validate.Length(min=1, max=1000)]})
-
-
-# Incident validation class for mobile
-@dataclass
-class IncidentMobileRegistrationBody:
-    name: str = field(metadata={'validate': [marshmallow.validate.Length(min=1, max=60)]})
-    description: str = field(metadata={'validate': [marshmallow.validate.Length(min=1, max=1000)]})
+USER_NOT_FOUND_ERROR = 'Invalid value for email: User does not exist.'
+BULK_MAX_INCIDENTS = 100
+# Bulk requests take as long as up to BULK_MAX_INCIDENTS registrations, at most this many run at a time
+BULK_MAX_CONCURRENT = 2
+BULK_RETRY_AFTER = 2
+# Streamed imports hold at most this many lines in memory, counting those being registered and those waiting to be sent
+IMPORT_MAX_IN_FLIGHT = 16
+IMPORT_MAX_LINE_BYTES = 64 * 1024
+# Imports run for as long as their registrations take, at most this many at a time so they never take every worker thread
+IMPORT_MAX_CONCURRENT = 2
+IMPORT_RETRY_AFTER = 5
+NDJSON_MIMETYPE = 'application/x-ndjson'
+EMPLOYEE_ROLES = (Role.ADMIN, Role.AGENT)
 
 
 @class_route(blp, '/api/v1/users/me/incidents')
 class UserIncidents(MethodView):
     init_every_request = False
 
-    @requires_token
+    @requires_token(client=True)
     def post(
         self,
-        token: dict[str, Any],
+        claims: Claims,
         incident_repo: IncidentRepository = Provide[Container.incident_repo],
     ) -> Response:
         incident = Incident(
-            client_id=token['cid'],
+            client_id=claims.client_id,
             name='Test Incident',
             channel=Channel.MOBILE,
-            reported_by=token['sub'],
-            created_by=token['sub'],
+            reported_by=claims.sub,
+            created_by=claims.sub,
             description='This is a test incident',
-            assigned_to=token['sub'],
+            assigned_to=claims.sub,
         )
         incident_repo.create(incident)
 
@@ -73,111 +75,415 @@ class UserIncidents(MethodView):
 class WebRegistrationIncident(MethodView):
     init_every_request = False
 
-    def validate_token_info(self, token: dict[str, Any]) -> tuple[str | None, int | None]:
-        error_message = None
-        error_code = None
-
-        if token['role'] not in [Role.ADMIN.value, Role.AGENT.value]:
-            error_message = 'Forbidden: You do not have access to this resource.'
-            error_code = 403
-        if token['cid'] is None:
-            error_message = 'Unauthorized: You do not belong to any client.'
-            error_code = 401
-
-        return error_message, error_code
-
-    @requires_token
+    @requires_token(EMPLOYEE_ROLES, client=True)
+    @audited(Channel.WEB)
+    @idempotent
     def post(
         self,
-        token: dict[str, Any],
+        claims: Claims,
         incident_repo: IncidentRepository = Provide[Container.incident_repo],
         user_repo: UserRepository = Provide[Container.user_repo],
+        fanout: FanOut = Provide[Container.fanout],
+        submission_repo: SubmissionRepository | None = Provide[Container.submission_repo],
     ) -> Response:
-        # Validate employee
-        error_message, error_code = self.validate_token_info(token)
-
-        # Return error response if any
-        if error_message and error_code:
-            return error_response(error_message, error_code)
-
         # Parse request body
-        incident_schema = marshmallow_dataclass.class_schema(IncidentRegistrationBody)()
         req_json = request.get_json(silent=True)
         if req_json is None:
             return error_response(JSON_VALIDATION_ERROR, 400)
 
         try:
-            data: IncidentRegistrationBody = incident_schema.load(req_json)
+            data = schemas.load(IncidentRegistrationBody, req_json)
         except marshmallow.ValidationError as err:
             return validation_error_response(err)
 
-        # Get and validate user
-        user = user_repo.find_by_email(data.email)
-
-        if user is None or user.client_id != token['cid']:
-            return error_response('Invalid value for email: User does not exist.', 404)
+        # Get and validate user, the incident service credentials are prepared at the same time
+        user, _ = fanout.gather(
+            self.__class__.__name__,
+            lambda: user_repo.find_by_email(data.email, claims.client_id),
+            incident_repo.prepare,
+        )
 
-        # Return error response if any
-        if error_message and error_code:
-            return error_response(error_message, error_code)
+        if user is None or user.client_id != claims.client_id:
+            return error_response(USER_NOT_FOUND_ERROR, 404)
 
         incident = Incident(
-            client_id=token['cid'],
+            client_id=claims.client_id,
             name=data.name,
             channel=Channel.WEB,
             reported_by=user.id,
-            created_by=token['sub'],
+            created_by=claims.sub,
             description=data.description,
-            assigned_to=token['sub'],
+            assigned_to=claims.sub,
         )
 
-        incident_response = incident_repo.create(incident)
+        return register_incident(incident, incident_repo, submission_repo)
+
+
+def submission_to_dict(submission: Submission) -> dict[str, Any]:
+    return {
+        'id': submission.id,
+        'status': submission.status.value,
+        'attempts': submission.attempts,
+        'incident': submission.response,
+        'error': submission.error,
+        'created_at': submission.created_at.isoformat(),
+        'updated_at': submission.updated_at.isoformat(),
+    }
+
 
-        return json_response(incident_to_dict(incident_response), 201)
+def register_incident(
+    incident: Incident,
+    incident_repo: IncidentRepository,
+    submission_repo: SubmissionRepository | None,
+) -> Response:
+    # Kept for the audit log
+    g.incident = incident
+
+    if submission_repo is None:
+        return json_response(incident_repo.create(incident), 201)
+
+    # Accept now, the incident is forwarded to the incident service in the background
+    submission = submission_repo.enqueue(incident)
+    response = json_response(submission_to_dict(submission), 202)
+    response.headers['Location'] = f'/api/v1/incidents/submissions/{submission.id}'
+    return response
+
+
+def bulk_item_error(index: int, msg: str, code: int) -> dict[str, Any]:
+    return {'index': index, 'code': code, 'message': msg}
+
+
+bulk_slots = threading.BoundedSemaphore(BULK_MAX_CONCURRENT)
+
+
+@class_route(blp, '/api/v1/incidents/web/bulk')
+class BulkWebRegistrationIncident(MethodView):
+    init_every_request = False
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def parse_body(self) -> list[Any] | Response:
+        req_json = request.get_json(silent=True)
+        if not isinstance(req_json, list) or not req_json:
+            return error_response('Request body must be a non-empty JSON array of incidents.', 400)
+
+        if len(req_json) > BULK_MAX_INCIDENTS:
+            return error_response(f'Request body must not contain more than {BULK_MAX_INCIDENTS} incidents.', 400)
+
+        return req_json
+
+    def validate_items(self, items: list[Any], results: list[dict[str, Any]]) -> list[tuple[int, IncidentRegistrationBody]]:
+        # Invalid items are reported without rejecting the whole batch
+        valid: list[tuple[int, IncidentRegistrationBody]] = []
+
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = bulk_item_error(index, JSON_VALIDATION_ERROR, 400)
+                continue
+
+            try:
+                valid.append((index, schemas.load(IncidentRegistrationBody, item)))
+            except marshmallow.ValidationError as err:
+                results[index] = bulk_item_error(index, validation_error_message(err), 400)
+
+        return valid
+
+    def create_incidents(
+        self,
+        pending: list[tuple[int, Incident]],
+        results: list[dict[str, Any]],
+        incident_repo: IncidentRepository,
+        fanout: FanOut,
+    ) -> None:
+        def create(incident: Incident) -> IncidentResponse | None:
+            try:
+                return incident_repo.create(incident)
+            except Exception:
+                self.logger.exception('Unable to register incident of bulk request')
+                return None
+
+        created = fanout.map(self.__class__.__name__, create, [incident for _, incident in pending])
+
+        for (index, _), incident_response in zip(pending, created, strict=True):
+            if incident_response is None:
+                results[index] = bulk_item_error(index, 'Unable to register the incident.', 502)
+            else:
+                results[index] = {'index': index, 'code': 201, 'incident': incident_response}
+
+    @requires_token(EMPLOYEE_ROLES, client=True)
+    def post(
+        self,
+        claims: Claims,
+        incident_repo: IncidentRepository = Provide[Container.incident_repo],
+        user_repo: UserRepository = Provide[Container.user_repo],
+        fanout: FanOut = Provide[Container.fanout],
+    ) -> Response:
+        if not bulk_slots.acquire(blocking=False):
+            response = error_response('Too many bulk registrations in progress, try again later.', 503)
+            response.headers['Retry-After'] = str(BULK_RETRY_AFTER)
+            return response
+
+        try:
+            return self.register_batch(claims, incident_repo, user_repo, fanout)
+        finally:
+            bulk_slots.release()
+
+    def register_batch(
+        self,
+        claims: Claims,
+        incident_repo: IncidentRepository,
+        user_repo: UserRepository,
+        fanout: FanOut,
+    ) -> Response:
+        items = self.parse_body()
+        if isinstance(items, Response):
+            return items
+
+        results: list[dict[str, Any]] = [{} for _ in items]
+        valid = self.validate_items(items, results)
+
+        # A failed lookup only fails the items of that email
+        def find_user(email: str) -> User | Exception | None:
+            try:
+                return user_repo.find_by_email(email, claims.client_id)
+            except Exception as exc:
+                self.logger.exception('Unable to look up user of bulk request')
+                return exc
+
+        # Look up each distinct email once, the incident service credentials are prepared at the same time
+        endpoint = self.__class__.__name__
+        emails = list(dict.fromkeys(data.email for _, data in valid))
+        found, _ = fanout.gather(endpoint, lambda: fanout.map(endpoint, find_user, emails), incident_repo.prepare)
+        users: dict[str, User | Exception | None] = dict(zip(emails, found, strict=True))
+
+        pending: list[tuple[int, Incident]] = []
+        for index, data in valid:
+            user = users[data.email]
+            if isinstance(user, Exception):
+                results[index] = bulk_item_error(index, 'Unable to look up the user.', 502)
+                continue
+            if user is None or user.client_id != claims.client_id:
+                results[index] = bulk_item_error(index, USER_NOT_FOUND_ERROR, 404)
+                continue
+
+            incident = Incident(
+                client_id=claims.client_id,
+                name=data.name,
+                channel=Channel.WEB,
+                reported_by=user.id,
+                created_by=claims.sub,
+                description=data.description,
+                assigned_to=claims.sub,
+            )
+            pending.append((index, incident))
+
+        self.create_incidents(pending, results, incident_repo, fanout)
+
+        # Multi-Status when any incident was not registered
+        status = 201 if all(result['code'] == 201 for result in results) else 207  # noqa: PLR2004
+        return json_response({'results': results}, status)
+
+
+def import_line_error(line: int, msg: str, code: int) -> dict[str, Any]:
+    return {'line': line, 'code': code, 'message': msg}
+
+
+import_slots = threading.BoundedSemaphore(IMPORT_MAX_CONCURRENT)
+
+
+@class_route(blp, '/api/v1/incidents/web/import')
+class WebImportIncident(MethodView):
+    init_every_request = False
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def parse_lines(self, body: IO[bytes]) -> Iterator[tuple[int, IncidentRegistrationBody | dict[str, Any]]]:
+        # Each line is validated as it is read, invalid lines are reported without stopping the import
+        for number, line in enumerate(read_lines(body, IMPORT_MAX_LINE_BYTES), 1):
+            if line is None:
+                yield number, import_line_error(number, f'Line must not be longer than {IMPORT_MAX_LINE_BYTES} bytes.', 413)
+                continue
+
+            if not line.strip():
+                continue
+
+            try:
+                item = json.loads(line)
+            except ValueError:
+                item = None
+
+            if not isinstance(item, dict):
+                yield number, import_line_error(number, JSON_VALIDATION_ERROR, 400)
+                continue
+
+            try:
+                yield number, schemas.load(IncidentRegistrationBody, item)
+            except marshmallow.ValidationError as err:
+                yield number, import_line_error(number, validation_error_message(err), 400)
+
+    def register(
+        self,
+        claims: Claims,
+        user_repo: UserRepository,
+        incident_repo: IncidentRepository,
+        entry: tuple[int, IncidentRegistrationBody | dict[str, Any]],
+    ) -> dict[str, Any]:
+        number, data = entry
+        if isinstance(data, dict):
+            return data
+
+        try:
+            user = user_repo.find_by_email(data.email, claims.client_id)
+            if user is None or user.client_id != claims.client_id:
+                return import_line_error(number, USER_NOT_FOUND_ERROR, 404)
+
+            incident = Incident(
+                client_id=claims.client_id,
+                name=data.name,
+                channel=Channel.WEB,
+                reported_by=user.id,
+                created_by=claims.sub,
+                description=data.description,
+                assigned_to=claims.sub,
+            )
+            return {'line': number, 'code': 201, 'incident': incident_repo.create(incident)}
+        except Exception:
+            self.logger.exception('Unable to register incident of import')
+            return import_line_error(number, 'Unable to register the incident.', 502)
+
+    def write_results(self, results: Iterable[dict[str, Any]]) -> Iterator[bytes]:
+        created = failed = 0
+        for result in results:
+            if result['code'] == 201:  # noqa: PLR2004
+                created += 1
+            else:
+                failed += 1
+            yield serializer.dumps(result) + b'\n'
+
+        yield serializer.dumps({'summary': {'created': created, 'failed': failed}}) + b'\n'
+
+    @requires_token(EMPLOYEE_ROLES, client=True)
+    def post(
+        self,
+        claims: Claims,
+        incident_repo: IncidentRepository = Provide[Container.incident_repo],
+        user_repo: UserRepository = Provide[Container.user_repo],
+        fanout: FanOut = Provide[Container.fanout],
+        spool: UploadSpool = Provide[Container.import_spool],
+    ) -> Response:
+        if request.mimetype != NDJSON_MIMETYPE:
+            return error_response(f'Request body must be newline-delimited JSON ({NDJSON_MIMETYPE}).', 415)
+
+        if not import_slots.acquire(blocking=False):
+            response = error_response('Too many imports in progress, try again later.', 503)
+            response.headers['Retry-After'] = str(IMPORT_RETRY_AFTER)
+            return response
+
+        try:
+            response = self.start_import(claims, incident_repo, user_repo, fanout, spool)
+        except BaseException:
+            import_slots.release()
+            raise
+
+        response.call_on_close(import_slots.release)
+        return response
+
+    def start_import(
+        self,
+        claims: Claims,
+        incident_repo: IncidentRepository,
+        user_repo: UserRepository,
+        fanout: FanOut,
+        spool: UploadSpool,
+    ) -> Response:
+        # The whole upload is read (into the spool) before the first result is written. Clients (curl, requests,
+        # browsers) only read the response once they sent the request, so writing results during the upload would fill
+        # both socket buffers and block the client and the worker on each other.
+        if request.content_length is not None and request.content_length > spool.max_bytes:
+            body = None
+        else:
+            body = spool.read(request.stream)
+        if body is None:
+            return error_response(f'Request body must not be larger than {spool.max_bytes} bytes.', 413)
+
+        incident_repo.prepare()
+
+        # Lines are then registered and answered as a pipeline, with at most IMPORT_MAX_IN_FLIGHT results held in memory
+        results = fanout.stream(
+            self.__class__.__name__,
+            functools.partial(self.register, claims, user_repo, incident_repo),
+            self.parse_lines(body),
+            IMPORT_MAX_IN_FLIGHT,
+        )
+        response = Response(stream_with_context(self.write_results(results)), status=200, mimetype=NDJSON_MIMETYPE)
+        response.call_on_close(body.close)
+        return response
 
 
 @class_route(blp, '/api/v1/incidents/mobile')
 class MobileRegistrationIncident(MethodView):
     init_every_request = False
 
-    @requires_token
+    @requires_token([Role.USER], client=True)
+    @audited(Channel.MOBILE)
+    @idempotent
     def post(
         self,
-        token: dict[str, Any],
+        claims: Claims,
         incident_repo: IncidentRepository = Provide[Container.incident_repo],
         employee_repo: EmployeeRepository = Provide[Container.employee_repo],
+        submission_repo: SubmissionRepository | None = Provide[Container.submission_repo],
     ) -> Response:
-        # Validate user
-        if token['role'] != Role.USER.value:
-            return error_response('Forbidden: You do not have access to this resource.', 403)
-
         # Parse request body
-        incident_schema = marshmallow_dataclass.class_schema(IncidentMobileRegistrationBody)()
         req_json = request.get_json(silent=True)
         if req_json is None:
             return error_response(JSON_VALIDATION_ERROR, 400)
 
         try:
-            data: IncidentMobileRegistrationBody = incident_schema.load(req_json)
+            data = schemas.load(IncidentMobileRegistrationBody, req_json)
         except marshmallow.ValidationError as err:
             return validation_error_response(err)
 
         # Get an assignee
-        assignee = employee_repo.get_random_agent(token['cid'])
+        assignee = employee_repo.get_random_agent(claims.client_id)
 
         if assignee is None:
             return error_response('No agents available to assign the incident.', 404)
 
         incident = Incident(
-            client_id=token['cid'],
+            client_id=claims.client_id,
             name=data.name,
             channel=Channel.MOBILE,
-            reported_by=token['sub'],
-            created_by=token['sub'],
+            reported_by=claims.sub,
+            created_by=claims.sub,
             description=data.description,
             assigned_to=assignee.id,
         )
 
-        incident_response = incident_repo.create(incident)
+        return register_incident(incident, incident_repo, submission_repo)
+
+
+@class_route(blp, '/api/v1/incidents/submissions/<submission_id>')
+class IncidentSubmission(MethodView):
+    init_every_request = False
+
+    @requires_token()
+    def get(
+        self,
+        submission_id: str,
+        claims: Claims,
+        submission_repo: SubmissionRepository | None = Provide[Container.submission_repo],
+    ) -> Response:
+        submission = submission_repo.get(submission_id) if submission_repo is not None else None
+
+        # Users only see the incidents they reported, employees every incident of their client
+        if (
+            submission is None
+            or submission.incident.client_id != claims.cid
+            or (claims.role == Role.USER and submission.incident.reported_by != claims.sub)
+        ):
+            return error_response('Incident submission not found.', 404)
 
-        return json_response(incident_to_dict(incident_response), 201)
+        return json_response(submission_to_dict(submission), 200)
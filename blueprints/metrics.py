@@ -0,0 +1,243 @@
+import time
+
+from dependency_injector.wiring import Provide
+from flask import Blueprint, Flask, Response, g, request
+from flask.views import MethodView
+
+from containers import Container
+from repositories import EmployeeRepository, IncidentRepository, SubmissionRepository, UserRepository
+from repositories.cached import CachedUserRepository, RosterEmployeeRepository
+from repositories.rest import CachingTokenProvider
+from repositories.rest.base import RestBaseRepository
+from util.admission import AdaptiveLimiter
+from util.apigateway import auth_rejections
+from util.breaker import CircuitState
+from util.metrics import MetricFamily, counter_family, gauge_family, registry, request_seconds
+from workers import AuditLog
+
+from .audit import audit_log
+from .util import class_route
+
+blp = Blueprint('Metrics', __name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def start_request_timer() -> None:
+    g.request_start = time.perf_counter()
+
+
+def record_request_duration(response: Response) -> Response:
+    start: float | None = g.get('request_start')
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        request_seconds.observe((route, request.method, str(response.status_code)), time.perf_counter() - start)
+
+    return response
+
+
+def setup_metrics(app: Flask) -> None:
+    app.before_request(start_request_timer)
+    app.after_request(record_request_duration)
+
+
+def repository_families(*repos: object) -> list[MetricFamily]:
+    pool: list[tuple[dict[str, str], float]] = []
+    coalesced: list[tuple[dict[str, str], float]] = []
+    hedges: list[tuple[dict[str, str], float]] = []
+    token: list[tuple[dict[str, str], float]] = []
+    user_cache: list[tuple[dict[str, str], float]] = []
+    user_cache_size: list[tuple[dict[str, str], float]] = []
+    roster: list[tuple[dict[str, str], float]] = []
+    breaker_state: list[tuple[dict[str, str], float]] = []
+    breaker_events: list[tuple[dict[str, str], float]] = []
+    retries: dict[int, list[tuple[dict[str, str], float]]] = {}
+
+    for repo in repos:
+        inner = repo
+
+        if isinstance(inner, CachedUserRepository):
+            stats = inner.stats()
+            user_cache.extend(
+                [
+                    ({'result': 'hit'}, stats.hits),
+                    ({'result': 'miss'}, stats.misses),
+                    ({'result': 'eviction'}, stats.evictions),
+                    ({'result': 'expiration'}, stats.expirations),
+                ]
+            )
+            user_cache_size.append(({}, stats.size))
+            inner = inner.repo
+
+        if isinstance(inner, RosterEmployeeRepository):
+            roster_stats = inner.stats()
+            roster.extend(
+                [
+                    ({'result': 'local'}, roster_stats.local),
+                    ({'result': 'fetch'}, roster_stats.fetches),
+                    ({'result': 'fallback'}, roster_stats.fallbacks),
+                    ({'result': 'failure'}, roster_stats.failures),
+                ]
+            )
+            inner = inner.repo
+
+        if isinstance(inner, RestBaseRepository):
+            pool_stats = inner.pool_stats()
+            pool.extend(
+                [
+                    ({'service': inner.service, 'connection': 'reused'}, pool_stats.hits),
+                    ({'service': inner.service, 'connection': 'new'}, pool_stats.misses),
+                ]
+            )
+
+            coalescing_stats = inner.coalescing_stats()
+            coalesced.extend(
+                [
+                    ({'service': inner.service, 'result': 'executed'}, coalescing_stats.executed),
+                    ({'service': inner.service, 'result': 'shared'}, coalescing_stats.shared),
+                ]
+            )
+
+            if inner.hedger is not None:
+                hedge_stats = inner.hedger.stats()
+                hedges.extend(
+                    [
+                        ({'service': inner.service, 'result': 'eligible'}, hedge_stats.eligible),
+                        ({'service': inner.service, 'result': 'hedged'}, hedge_stats.hedged),
+                        ({'service': inner.service, 'result': 'won'}, hedge_stats.won),
+                        ({'service': inner.service, 'result': 'refused'}, hedge_stats.refused),
+                        ({'service': inner.service, 'result': 'busy'}, hedge_stats.busy),
+                    ]
+                )
+
+            if inner.breaker is not None:
+                breaker_stats = inner.breaker.stats()
+                breaker_state.extend(
+                    ({'service': inner.service, 'state': state.value}, float(state == breaker_stats.state))
+                    for state in CircuitState
+                )
+                breaker_events.extend(
+                    [
+                        ({'service': inner.service, 'event': 'rejected'}, breaker_stats.rejected),
+                        ({'service': inner.service, 'event': 'opened'}, breaker_stats.opened),
+                    ]
+                )
+
+            # The retry budget is usually shared, so it is reported once
+            if inner.retry_policy is not None:
+                retry_stats = inner.retry_policy.budget.stats()
+                retries[id(inner.retry_policy.budget)] = [
+                    ({'result': 'retried'}, retry_stats.retries),
+                    ({'result': 'exhausted'}, retry_stats.exhausted),
+                ]
+
+            if isinstance(inner.token_provider, CachingTokenProvider):
+                token_stats = inner.token_provider.stats()
+                token.extend(
+                    [
+                        ({'service': inner.service, 'result': 'hit'}, token_stats.hits),
+                        ({'service': inner.service, 'result': 'refresh'}, token_stats.refreshes),
+                        ({'service': inner.service, 'result': 'stale'}, token_stats.stale),
+                        ({'service': inner.service, 'result': 'failure'}, token_stats.failures),
+                    ]
+                )
+
+    return [
+        counter_family('registroapp_http_pool_requests_total', 'Outbound requests by connection reuse.', pool),
+        counter_family('registroapp_coalesced_requests_total', 'Outbound GET requests sent or shared.', coalesced),
+        counter_family('registroapp_hedge_total', 'Downstream reads eligible for, sent as and won by hedges.', hedges),
+        counter_family('registroapp_token_cache_total', 'Service token lookups by outcome.', token),
+        counter_family('registroapp_user_cache_total', 'User cache lookups and removals by outcome.', user_cache),
+        gauge_family('registroapp_user_cache_size', 'Users currently cached.', user_cache_size),
+        counter_family('registroapp_roster_total', 'Agent roster assignments and fetches by outcome.', roster),
+        gauge_family('registroapp_circuit_breaker_state', 'Current state of each circuit breaker.', breaker_state),
+        counter_family('registroapp_circuit_breaker_total', 'Circuit breaker rejections and openings.', breaker_events),
+        counter_family(
+            'registroapp_retries_total',
+            'Downstream retries made or refused by the retry budget.',
+            [sample for samples in retries.values() for sample in samples],
+        ),
+    ]
+
+
+def queue_families(submission_repo: SubmissionRepository | None) -> list[MetricFamily]:
+    if submission_repo is None:
+        return []
+
+    counts = submission_repo.count_by_status()
+    return [
+        gauge_family(
+            'registroapp_incident_queue',
+            'Queued incident submissions by status.',
+            [({'status': status.value}, count) for status, count in counts.items()],
+        )
+    ]
+
+
+def admission_families(limiter: AdaptiveLimiter | None) -> list[MetricFamily]:
+    if limiter is None:
+        return []
+
+    stats = limiter.stats()
+    return [
+        gauge_family('registroapp_admission_limit', 'Concurrency limit of the incident endpoints.', [({}, stats.limit)]),
+        gauge_family('registroapp_admission_in_flight', 'Incident requests currently being served.', [({}, stats.in_flight)]),
+        counter_family(
+            'registroapp_admission_total',
+            'Incident requests admitted or rejected by the concurrency limit.',
+            [({'result': 'admitted'}, stats.admitted), ({'result': 'rejected'}, stats.rejected)],
+        ),
+    ]
+
+
+def audit_families(log: AuditLog | None) -> list[MetricFamily]:
+    if log is None:
+        return []
+
+    stats = log.stats()
+    return [
+        counter_family(
+            'registroapp_audit_records_total',
+            'Audit records kept, dropped with a full buffer, written or lost to write errors.',
+            [
+                ({'result': 'recorded'}, stats.recorded),
+                ({'result': 'dropped'}, stats.dropped),
+                ({'result': 'written'}, stats.written),
+                ({'result': 'failed'}, stats.failed),
+            ],
+        ),
+        gauge_family('registroapp_audit_buffered', 'Audit records waiting to be written.', [({}, stats.buffered)]),
+    ]
+
+
+def auth_families() -> list[MetricFamily]:
+    return [
+        counter_family(
+            'registroapp_auth_rejections_total',
+            'Requests rejected by the authorization policy of their route, by reason.',
+            [({'reason': reason}, count) for reason, count in auth_rejections.counts().items()],
+        )
+    ]
+
+
+@class_route(blp, '/api/v1/metrics/registroapp')
+class Metrics(MethodView):
+    init_every_request = False
+
+    def get(
+        self,
+        user_repo: UserRepository = Provide[Container.user_repo],
+        employee_repo: EmployeeRepository = Provide[Container.employee_repo],
+        incident_repo: IncidentRepository = Provide[Container.incident_repo],
+        submission_repo: SubmissionRepository | None = Provide[Container.submission_repo],
+        admission_limiter: AdaptiveLimiter | None = Provide[Container.admission_limiter],
+    ) -> Response:
+        families = (
+            repository_families(user_repo, employee_repo, incident_repo)
+            + queue_families(submission_repo)
+            + admission_families(admission_limiter)
+            + auth_families()
+            + audit_families(audit_log())
+        )
+        body = registry.render(families)
+        return Response(body, status=200, content_type=PROMETHEUS_CONTENT_TYPE)
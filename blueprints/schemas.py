@@ -0,0 +1,62 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, TypeVar, cast
+
+import marshmallow
+import marshmallow_dataclass
+
+from util.metrics import validation_seconds
+
+T = TypeVar('T')
+
+
+# Incident validation class
+@dataclass
+class IncidentRegistrationBody:
+    email: str = field(metadata={'validate': [marshmallow.validate.Email(), marshmallow.validate.Length(min=1, max=60)]})
+    name: str = field(metadata={'validate': [marshmallow.validate.Length(min=1, max=60)]})
+    description: str = field(metadata={'validate': [marshmallow.validate.Length(min=1, max=1000)]})
+
+
+# Incident validation class for mobile
+@dataclass
+class IncidentMobileRegistrationBody:
+    name: str = field(metadata={'validate': [marshmallow.validate.Length(min=1, max=60)]})
+    description: str = field(metadata={'validate': [marshmallow.validate.Length(min=1, max=1000)]})
+
+
+# Building a schema class from a dataclass is expensive, so each one is built once and shared between requests.
+# Loading data through a schema instance does not modify it, so the instances can be used from any thread.
+class SchemaRegistry:
+    def __init__(self) -> None:
+        self._schemas: dict[type[Any], marshmallow.Schema] = {}
+        self._lock = threading.Lock()
+
+    def get(self, cls: type[Any]) -> marshmallow.Schema:
+        schema = self._schemas.get(cls)
+
+        if schema is None:
+            with self._lock:
+                schema = self._schemas.get(cls)
+                if schema is None:
+                    schema = marshmallow_dataclass.class_schema(cls)()
+                    self._schemas[cls] = schema
+
+        return schema
+
+    def load(self, cls: type[T], data: Any) -> T:  # noqa: ANN401
+        schema = self.get(cls)
+        start = time.perf_counter()
+        try:
+            return cast(T, schema.load(data))
+        finally:
+            validation_seconds.observe((cls.__name__,), time.perf_counter() - start)
+
+
+schemas = SchemaRegistry()
+
+
+def build_schemas() -> None:
+    for cls in (IncidentRegistrationBody, IncidentMobileRegistrationBody):
+        schemas.get(cls)
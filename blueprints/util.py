@@ -1,15 +1,21 @@
-import json
-from collections.abc import Callable
-from typing import Any, cast
+import math
+from collections.abc import Callable, Iterable, Iterator
+from typing import IO, Any, cast
 
-from flask import Blueprint, Request, Response, request
+from flask import Blueprint, Flask, Request, Response, request
 from flask.views import MethodView
 from marshmallow import ValidationError
 from tightwrap import wraps
 
+from models import Claims, Role
+from util import serializer
+from util.apigateway import AuthPolicy, AuthRejection, auth_rejections, decode_userinfo
+from util.breaker import CircuitOpenError
+
 
 class APIGatewayRequest(Request):
-    user_token: dict[str, Any]
+    user_token: dict[str, Any] | None
+    claims: Claims
 
 
 def class_route(blueprint: Blueprint, rule: str, **options: Any) -> Callable[[type[MethodView]], type[MethodView]]:  # noqa: ANN401
@@ -20,36 +26,72 @@ def class_route(blueprint: Blueprint, rule: str, **options: Any) -> Callable[[ty
     return decorator
 
 
-def json_response(data: dict[str, Any] | list[dict[str, Any]], status: int) -> Response:
-    return Response(json.dumps(data), status=status, mimetype='application/json')
+def json_response(data: object, status: int) -> Response:
+    return Response(serializer.dumps(data), status=status, mimetype='application/json')
 
 
 def error_response(msg: str, code: int) -> Response:
     return json_response({'message': msg, 'code': code}, code)
 
 
-def requires_token(f: Callable[..., Response]) -> Callable[..., Response]:
-    @wraps(f)
-    def decorated_function(*args, **kwargs) -> Response:  # type: ignore[no-untyped-def] # noqa: ANN002, ANN003
-        if hasattr(request, 'user_token') and cast(APIGatewayRequest, request).user_token is not None:
-            req = cast(APIGatewayRequest, request)
-            token: dict[str, Any] = req.user_token
+def read_lines(stream: IO[bytes], max_bytes: int) -> Iterator[bytes | None]:
+    # Lines of a stream read one at a time, None in place of lines longer than max_bytes, which are skipped without
+    # holding them in memory
+    while line := stream.readline(max_bytes + 1):
+        if len(line) <= max_bytes or line.endswith(b'\n'):
+            yield line
+            continue
 
-            required_fields = ['sub', 'cid', 'role', 'aud']
-            for field in required_fields:
-                if field not in token:
-                    return error_response(f'{field} is missing in token', 401)
+        while line and not line.endswith(b'\n'):
+            line = stream.readline(max_bytes + 1)
+        yield None
 
-            return f(*args, token=token, **kwargs)
 
-        return error_response('Token is missing', 401)
+def api_gateway_before_request() -> None:
+    cast(APIGatewayRequest, request).user_token = decode_userinfo(request.headers.get('X-Apigateway-Api-Userinfo'))
 
-    return decorated_function
 
+def setup_apigateway(app: Flask) -> None:
+    # Same as gcp_microservice_utils.setup_apigateway, without importing the Google Cloud client libraries at startup
+    app.before_request(api_gateway_before_request)
 
-def validation_error_response(err: ValidationError) -> Response:
+
+def requires_token(
+    roles: Iterable[Role] | None = None, *, client: bool = False, claims: Iterable[str] = ()
+) -> Callable[[Callable[..., Response]], Callable[..., Response]]:
+    # The view gets the checked claims as its claims argument, they are also kept on the request
+    policy = AuthPolicy(roles, client=client, claims=claims)
+
+    def decorator(f: Callable[..., Response]) -> Callable[..., Response]:
+        @wraps(f)
+        def decorated_function(*args, **kwargs) -> Response:  # type: ignore[no-untyped-def] # noqa: ANN002, ANN003
+            # Resolved once, every access through the request proxy costs more than the checks
+            api_request = cast(APIGatewayRequest, request._get_current_object())  # type: ignore[attr-defined] # noqa: SLF001
+            claims = policy.check(getattr(api_request, 'user_token', None))
+            if isinstance(claims, AuthRejection):
+                auth_rejections.add(claims.reason)
+                return error_response(claims.message, claims.status)
+
+            api_request.claims = claims
+            return f(*args, claims=claims, **kwargs)
+
+        return decorated_function
+
+    return decorator
+
+
+def validation_error_message(err: ValidationError) -> str:
     if isinstance(err.messages, dict):
-        msg = ' '.join([f'Invalid value for {k}: {" ".join(v)}' for k, v in err.messages.items()])
-        return error_response(msg, 400)
+        return ' '.join([f'Invalid value for {k}: {" ".join(v)}' for k, v in err.messages.items()])
 
     raise NotImplementedError('Validation error response for non-dict messages not implemented.')  # pragma: no cover
+
+
+def validation_error_response(err: ValidationError) -> Response:
+    return error_response(validation_error_message(err), 400)
+
+
+def circuit_open_response(err: CircuitOpenError) -> Response:
+    response = error_response('Service unavailable: A downstream service is not responding, try again later.', 503)
+    response.headers['Retry-After'] = str(max(math.ceil(err.retry_after), 1))
+    return response
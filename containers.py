@@ -1,27 +1,216 @@
 from dependency_injector import providers
 from dependency_injector.containers import DeclarativeContainer, WiringConfiguration
 
-from repositories.rest import RestEmployeeRepository, RestIncidentRepository, RestUserRepository
+from repositories.cached import CachedUserRepository, RosterEmployeeRepository, create_strategy
+from repositories.memory import MemoryIdempotencyRepository
+from repositories.rest import HttpOptions, RestEmployeeRepository, RestIncidentRepository, RestUserRepository
+from repositories.sqlite import SqliteIdempotencyRepository, SqliteSubmissionRepository
+from util import FanOut
+from util.admission import AdaptiveLimiter
+from util.audit import AuditFileWriter
+from util.breaker import CircuitBreaker
+from util.hedge import Hedger
+from util.retry import RetryBudget, RetryPolicy
+from util.spool import UploadSpool
+from workers import AuditLog, HealthMonitor, IncidentForwarder, Warmup
 
 
 class Container(DeclarativeContainer):
     wiring_config = WiringConfiguration(packages=['blueprints'])
     config = providers.Configuration()
 
-    user_repo = providers.ThreadSafeSingleton(
+    http_options = providers.ThreadSafeSingleton(
+        HttpOptions,
+        pool_connections=config.http.pool_connections,
+        pool_maxsize=config.http.pool_maxsize,
+        pool_block=config.http.pool_block,
+        keep_alive=config.http.keep_alive,
+        connect_timeout=config.http.connect_timeout,
+        read_timeout=config.http.read_timeout,
+    )
+
+    # Retries of all downstream services draw from the same budget
+    retry_budget = providers.ThreadSafeSingleton(
+        RetryBudget,
+        ratio=config.retry.budget_ratio,
+        min_per_second=config.retry.budget_min_per_second,
+    )
+
+    retry_policy = providers.ThreadSafeSingleton(
+        RetryPolicy,
+        budget=retry_budget,
+        max_attempts=config.retry.max_attempts,
+    )
+
+    # Each downstream service gets its own breaker
+    breaker = providers.Factory(
+        CircuitBreaker,
+        failure_threshold=config.breaker.failure_threshold,
+        reset_timeout=config.breaker.reset_timeout,
+    )
+
+    # Each downstream service whose reads are hedged gets its own latency window and hedge budget
+    hedger = providers.Factory(
+        Hedger,
+        percentile=config.hedge.percentile,
+        min_delay=config.hedge.min_delay,
+        budget_ratio=config.hedge.budget_ratio,
+        max_workers=config.hedge.max_workers,
+    )
+
+    rest_user_repo = providers.ThreadSafeSingleton(
         RestUserRepository,
         base_url=config.svc.user.url,
         token_provider=config.svc.user.token_provider,
+        http_options=http_options,
+        retry_policy=retry_policy,
+        breaker=providers.Factory(breaker, name='user'),
+    ).add_attributes(
+        hedger=providers.Selector(config.svc.user.hedge, enabled=hedger, disabled=providers.Object(None)),
+    )
+
+    # Users are cached in front of the user service unless disabled through configuration
+    user_repo = providers.Selector(
+        config.user_cache.mode,
+        cached=providers.ThreadSafeSingleton(
+            CachedUserRepository,
+            repo=rest_user_repo,
+            maxsize=config.user_cache.maxsize,
+            ttl=config.user_cache.ttl,
+            negative_ttl=config.user_cache.negative_ttl,
+        ),
+        direct=rest_user_repo,
     )
 
     incident_repo = providers.ThreadSafeSingleton(
         RestIncidentRepository,
         base_url=config.svc.incidentmodify.url,
         token_provider=config.svc.incidentmodify.token_provider,
+        http_options=http_options,
+        retry_policy=retry_policy,
+        breaker=providers.Factory(breaker, name='incidentmodify'),
+    ).add_attributes(
+        hedger=providers.Selector(config.svc.incidentmodify.hedge, enabled=hedger, disabled=providers.Object(None)),
     )
 
-    employee_repo = providers.ThreadSafeSingleton(
+    rest_employee_repo = providers.ThreadSafeSingleton(
         RestEmployeeRepository,
         base_url=config.svc.client.url,
         token_provider=config.svc.client.token_provider,
+        http_options=http_options,
+        retry_policy=retry_policy,
+        breaker=providers.Factory(breaker, name='client'),
+    ).add_attributes(
+        hedger=providers.Selector(config.svc.client.hedge, enabled=hedger, disabled=providers.Object(None)),
+    )
+
+    # Agents are assigned from an in-memory roster of each client unless disabled through configuration
+    employee_repo = providers.Selector(
+        config.roster.mode,
+        roster=providers.ThreadSafeSingleton(
+            RosterEmployeeRepository,
+            repo=rest_employee_repo,
+            strategy=providers.Factory(create_strategy, config.roster.strategy),
+            refresh_interval=config.roster.refresh_interval,
+            max_age=config.roster.max_age,
+        ),
+        direct=rest_employee_repo,
+    )
+
+    # Incidents are registered while the client waits, unless they are queued and forwarded in the background
+    submission_repo = providers.Selector(
+        config.incident_queue.mode,
+        sqlite=providers.ThreadSafeSingleton(SqliteSubmissionRepository, path=config.incident_queue.path),
+        disabled=providers.Object(None),
+    )
+
+    # Responses of registrations sent with an Idempotency-Key, replayed when the request is retried
+    idempotency_repo = providers.Selector(
+        config.idempotency.mode,
+        memory=providers.ThreadSafeSingleton(
+            MemoryIdempotencyRepository,
+            maxsize=config.idempotency.maxsize,
+            ttl=config.idempotency.ttl,
+        ),
+        sqlite=providers.ThreadSafeSingleton(
+            SqliteIdempotencyRepository,
+            path=config.idempotency.path,
+            ttl=config.idempotency.ttl,
+        ),
+        disabled=providers.Object(None),
+    )
+
+    incident_forwarder = providers.ThreadSafeSingleton(
+        IncidentForwarder,
+        submissions=submission_repo,
+        incident_repo=incident_repo,
+        workers=config.incident_queue.workers,
+        max_attempts=config.incident_queue.max_attempts,
+        retention=config.incident_queue.retention,
+    )
+
+    # Registrations written in the background to rotating files, for forensics
+    audit_log = providers.Selector(
+        config.audit.mode,
+        file=providers.ThreadSafeSingleton(
+            AuditLog,
+            writer=providers.Factory(
+                AuditFileWriter,
+                path=config.audit.path,
+                max_file_bytes=config.audit.max_file_bytes,
+                max_files=config.audit.max_files,
+            ),
+            capacity=config.audit.capacity,
+            batch_size=config.audit.batch_size,
+        ),
+        disabled=providers.Object(None),
+    )
+
+    # Connections, tokens, schemas and hot caches prepared in the background when the app starts
+    warmup = providers.Selector(
+        config.warmup.mode,
+        background=providers.ThreadSafeSingleton(
+            Warmup,
+            max_workers=config.warmup.max_workers,
+            timeout=config.warmup.timeout,
+        ),
+        disabled=providers.Object(None),
+    )
+
+    # Downstream services probed in the background, for the dependency health check
+    health_monitor = providers.Selector(
+        config.health.mode,
+        background=providers.ThreadSafeSingleton(
+            HealthMonitor,
+            interval=config.health.interval,
+            max_age=config.health.max_age,
+        ),
+        disabled=providers.Object(None),
+    )
+
+    # Concurrency limit of the incident endpoints, adapted from their latency
+    admission_limiter = providers.Selector(
+        config.admission.mode,
+        adaptive=providers.ThreadSafeSingleton(
+            AdaptiveLimiter,
+            initial_limit=config.admission.initial_limit,
+            min_limit=config.admission.min_limit,
+            max_limit=config.admission.max_limit,
+            latency_target=config.admission.latency_target,
+        ),
+        disabled=providers.Object(None),
+    )
+
+    fanout = providers.ThreadSafeSingleton(
+        FanOut,
+        max_workers=config.fanout.max_workers,
+        endpoints=config.fanout.endpoints,
+    )
+
+    # Uploads of streamed imports, read whole before they are registered
+    import_spool = providers.ThreadSafeSingleton(
+        UploadSpool,
+        path=config.imports.spool_path,
+        max_bytes=config.imports.max_bytes,
+        memory_bytes=config.imports.memory_bytes,
     )
@@ -1,21 +1,167 @@
 import os
-
-from gcp_microservice_utils import GcpAuthToken
+import tempfile
+from pathlib import Path
 
 from containers import Container
+from repositories.rest import CachingTokenProvider, StaticTokenProvider, TokenProvider
+from util.metrics import registry
+from util.serializer import create_serializer, set_serializer
+
+
+def env_flag(value: str) -> bool:
+    return value == '1'
+
+
+def env_list(value: str) -> list[str]:
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def cloud_token_provider(audience: str) -> TokenProvider:  # pragma: no cover
+    # Imported here, the Google Cloud client libraries are slow to import and only needed when deployed
+    from gcp_microservice_utils import GcpAuthToken
+
+    return GcpAuthToken(audience)
 
 
 def configure_environment_variables(container: Container) -> None:
+    # Configure outbound HTTP connection pools
+    container.config.http.pool_connections.from_env('HTTP_POOL_CONNECTIONS', as_=int, default='10')
+    container.config.http.pool_maxsize.from_env('HTTP_POOL_MAXSIZE', as_=int, default='10')
+    container.config.http.pool_block.from_env('HTTP_POOL_BLOCK', as_=env_flag, default='0')
+    container.config.http.keep_alive.from_env('HTTP_KEEP_ALIVE', as_=env_flag, default='1')
+    container.config.http.connect_timeout.from_env('HTTP_CONNECT_TIMEOUT', as_=float, default='2')
+    container.config.http.read_timeout.from_env('HTTP_READ_TIMEOUT', as_=float, default='2')
+
+    # Configure downstream retries and circuit breakers
+    container.config.retry.max_attempts.from_env('RETRY_MAX_ATTEMPTS', as_=int, default='2')
+    container.config.retry.budget_ratio.from_env('RETRY_BUDGET_RATIO', as_=float, default='0.1')
+    container.config.retry.budget_min_per_second.from_env('RETRY_BUDGET_MIN_PER_SECOND', as_=float, default='1')
+    container.config.breaker.failure_threshold.from_env('BREAKER_FAILURE_THRESHOLD', as_=int, default='5')
+    container.config.breaker.reset_timeout.from_env('BREAKER_RESET_TIMEOUT', as_=float, default='10')
+
+    # Configure latency histograms
+    registry.set_enabled(env_flag(os.getenv('METRICS_ENABLED', '1')))
+
+    # Configure admission control of the incident endpoints
+    container.config.admission.mode.from_value('adaptive' if env_flag(os.getenv('ADMISSION_ENABLED', '1')) else 'disabled')
+    container.config.admission.initial_limit.from_env('ADMISSION_INITIAL_LIMIT', as_=int, default='8')
+    container.config.admission.min_limit.from_env('ADMISSION_MIN_LIMIT', as_=int, default='2')
+    container.config.admission.max_limit.from_env('ADMISSION_MAX_LIMIT', as_=int, default='64')
+    container.config.admission.latency_target.from_env('ADMISSION_LATENCY_TARGET', as_=float, default='1')
+
+    # Configure response serialization (auto, orjson or stdlib)
+    set_serializer(create_serializer(os.getenv('JSON_SERIALIZER', 'auto')))
+
+    # Configure concurrent downstream calls
+    container.config.fanout.max_workers.from_env('FANOUT_MAX_WORKERS', as_=int, default='16')
+    container.config.fanout.endpoints.from_env(
+        'FANOUT_ENDPOINTS', as_=env_list, default='WebRegistrationIncident,BulkWebRegistrationIncident,WebImportIncident'
+    )
+
+    # Configure streamed import uploads, which are read whole before they are registered. Beyond IMPORT_MEMORY_BYTES
+    # they go to a file in IMPORT_SPOOL_PATH: the default temporary directory is in memory on Cloud Run, so imports of
+    # more than a few MiB need it on a mounted volume.
+    container.config.imports.spool_path.from_value(os.getenv('IMPORT_SPOOL_PATH') or None)
+    container.config.imports.max_bytes.from_env('IMPORT_MAX_BYTES', as_=int, default=str(512 * 1024 * 1024))
+    container.config.imports.memory_bytes.from_env('IMPORT_MEMORY_BYTES', as_=int, default=str(1024 * 1024))
+
+    # Configure user cache
+    container.config.user_cache.mode.from_value('cached' if env_flag(os.getenv('USER_CACHE_ENABLED', '1')) else 'direct')
+    container.config.user_cache.maxsize.from_env('USER_CACHE_MAXSIZE', as_=int, default='10000')
+    container.config.user_cache.ttl.from_env('USER_CACHE_TTL', as_=float, default='300')
+    container.config.user_cache.negative_ttl.from_env('USER_CACHE_NEGATIVE_TTL', as_=float, default='30')
+
+    # Configure agent roster (strategies: random, round_robin or least_recent). Off by default, it needs the agent listing
+    # endpoint of the client service.
+    container.config.roster.mode.from_value('roster' if env_flag(os.getenv('ROSTER_ENABLED', '0')) else 'direct')
+    container.config.roster.strategy.from_env('ROSTER_STRATEGY', default='least_recent')
+    container.config.roster.refresh_interval.from_env('ROSTER_REFRESH_INTERVAL', as_=float, default='60')
+    container.config.roster.max_age.from_env('ROSTER_MAX_AGE', as_=float, default='600')
+
+    # Configure queued incident registration
+    container.config.incident_queue.mode.from_value(
+        'sqlite' if env_flag(os.getenv('INCIDENT_QUEUE_ENABLED', '0')) else 'disabled'
+    )
+    container.config.incident_queue.path.from_env(
+        'INCIDENT_QUEUE_PATH',
+        default=str(Path(tempfile.gettempdir()) / 'registroapp-incidents.db'),
+    )
+    container.config.incident_queue.workers.from_env('INCIDENT_QUEUE_WORKERS', as_=int, default='2')
+    container.config.incident_queue.max_attempts.from_env('INCIDENT_QUEUE_MAX_ATTEMPTS', as_=int, default='8')
+    # Seconds registered and failed submissions are kept for status lookups before they are deleted
+    container.config.incident_queue.retention.from_env('INCIDENT_QUEUE_RETENTION', as_=float, default='86400')
+
+    # Configure Idempotency-Key support (stores: memory or sqlite)
+    container.config.idempotency.mode.from_value(
+        os.getenv('IDEMPOTENCY_STORE', 'memory') if env_flag(os.getenv('IDEMPOTENCY_ENABLED', '1')) else 'disabled'
+    )
+    container.config.idempotency.ttl.from_env('IDEMPOTENCY_TTL', as_=float, default='86400')
+    container.config.idempotency.maxsize.from_env('IDEMPOTENCY_MAXSIZE', as_=int, default='10000')
+    container.config.idempotency.path.from_env(
+        'IDEMPOTENCY_PATH',
+        default=str(Path(tempfile.gettempdir()) / 'registroapp-idempotency.db'),
+    )
+
+    configure_audit(container)
+    configure_warmup(container)
+    configure_health(container)
+    configure_hedging(container)
+    configure_downstream_services(container)
+
+
+def configure_audit(container: Container) -> None:
+    # Registrations of the web and mobile endpoints are written to an audit log
+    container.config.audit.mode.from_value('file' if env_flag(os.getenv('AUDIT_ENABLED', '0')) else 'disabled')
+    # On Cloud Run the temporary directory is in memory: the files count against the instance memory limit (up to
+    # AUDIT_MAX_FILE_BYTES * AUDIT_MAX_FILES, 4 MiB by default) and are lost with the instance. Point AUDIT_PATH at a
+    # mounted volume to keep more or to keep them across restarts.
+    container.config.audit.path.from_env('AUDIT_PATH', default=str(Path(tempfile.gettempdir()) / 'registroapp-audit'))
+    container.config.audit.capacity.from_env('AUDIT_CAPACITY', as_=int, default='10000')
+    container.config.audit.batch_size.from_env('AUDIT_BATCH_SIZE', as_=int, default='1000')
+    container.config.audit.max_file_bytes.from_env('AUDIT_MAX_FILE_BYTES', as_=int, default=str(1024 * 1024))
+    container.config.audit.max_files.from_env('AUDIT_MAX_FILES', as_=int, default='4')
+
+
+def configure_warmup(container: Container) -> None:
+    # New instances open connections, fetch tokens and load the rosters of the listed clients before they are ready
+    container.config.warmup.mode.from_value('background' if env_flag(os.getenv('WARMUP_ENABLED', '0')) else 'disabled')
+    container.config.warmup.connections.from_env('WARMUP_CONNECTIONS', as_=int, default='4')
+    container.config.warmup.clients.from_env('WARMUP_CLIENTS', as_=env_list, default='')
+    container.config.warmup.max_workers.from_env('WARMUP_MAX_WORKERS', as_=int, default='8')
+    container.config.warmup.timeout.from_env('WARMUP_TIMEOUT', as_=float, default='10')
+
+
+def configure_health(container: Container) -> None:
+    # The configured downstream services are probed in the background for the dependency health check
+    container.config.health.mode.from_value('background' if env_flag(os.getenv('HEALTH_PROBES_ENABLED', '0')) else 'disabled')
+    container.config.health.interval.from_env('HEALTH_PROBE_INTERVAL', as_=float, default='30')
+    container.config.health.max_age.from_env('HEALTH_MAX_AGE', as_=float, default='90')
+
+
+def configure_hedging(container: Container) -> None:
+    # Reads of the listed services (user, client or incidentmodify) are hedged
+    hedged_services = env_list(os.getenv('HEDGE_SERVICES', ''))
+    for service in ('user', 'client', 'incidentmodify'):
+        container.config.svc[service].hedge.from_value('enabled' if service in hedged_services else 'disabled')
+    container.config.hedge.percentile.from_env('HEDGE_PERCENTILE', as_=float, default='95')
+    container.config.hedge.min_delay.from_env('HEDGE_MIN_DELAY', as_=float, default='0.005')
+    container.config.hedge.budget_ratio.from_env('HEDGE_BUDGET_RATIO', as_=float, default='0.05')
+    container.config.hedge.max_workers.from_env('HEDGE_MAX_WORKERS', as_=int, default='16')
+
+
+def configure_downstream_services(container: Container) -> None:
     # Configure user service
     if 'USER_SVC_URL' in os.environ:  # pragma: no cover
         container.config.svc.user.url.from_env('USER_SVC_URL')
 
         if 'USER_SVC_TOKEN' in os.environ:
             container.config.svc.user.token_provider.from_value(
-                type('TokenProvider', (object,), {'get_token': lambda: os.environ['USER_SVC_TOKEN']})
+                CachingTokenProvider(StaticTokenProvider(os.environ['USER_SVC_TOKEN']))
             )
         elif 'USE_CLOUD_TOKEN_PROVIDER' in os.environ:
-            container.config.svc.user.token_provider.from_value(GcpAuthToken(os.environ['USER_SVC_URL']))
+            container.config.svc.user.token_provider.from_value(
+                CachingTokenProvider(cloud_token_provider(os.environ['USER_SVC_URL']))
+            )
 
     # Configure client service
     if 'CLIENT_SVC_URL' in os.environ:  # pragma: no cover
@@ -23,10 +169,12 @@ def configure_environment_variables(container: Container) -> None:
 
         if 'CLIENT_SVC_TOKEN' in os.environ:
             container.config.svc.client.token_provider.from_value(
-                type('TokenProvider', (object,), {'get_token': lambda: os.environ['CLIENT_SVC_TOKEN']})
+                CachingTokenProvider(StaticTokenProvider(os.environ['CLIENT_SVC_TOKEN']))
             )
         elif 'USE_CLOUD_TOKEN_PROVIDER' in os.environ:
-            container.config.svc.client.token_provider.from_value(GcpAuthToken(os.environ['CLIENT_SVC_URL']))
+            container.config.svc.client.token_provider.from_value(
+                CachingTokenProvider(cloud_token_provider(os.environ['CLIENT_SVC_URL']))
+            )
 
     # Configure incident modify service
     if 'INCIDENTMODIFY_SVC_URL' in os.environ:  # pragma: no cover
@@ -34,7 +182,9 @@ def configure_environment_variables(container: Container) -> None:
 
         if 'INCIDENTMODIFY_SVC_TOKEN' in os.environ:
             container.config.svc.incidentmodify.token_provider.from_value(
-                type('TokenProvider', (object,), {'get_token': lambda: os.environ['INCIDENTMODIFY_SVC_TOKEN']})
+                CachingTokenProvider(StaticTokenProvider(os.environ['INCIDENTMODIFY_SVC_TOKEN']))
             )
         elif 'USE_CLOUD_TOKEN_PROVIDER' in os.environ:
-            container.config.svc.incidentmodify.token_provider.from_value(GcpAuthToken(os.environ['INCIDENTMODIFY_SVC_URL']))
+            container.config.svc.incidentmodify.token_provider.from_value(
+                CachingTokenProvider(cloud_token_provider(os.environ['INCIDENTMODIFY_SVC_URL']))
+            )
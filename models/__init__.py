@@ -1,8 +1,24 @@
+from .audit_record import AuditRecord
 from .channel import Channel
+from .claims import Claims
 from .employee import Employee
 from .incident_report import Incident
 from .incident_response import IncidentResponse
 from .role import Role
+from .stored_response import StoredResponse
+from .submission import Submission, SubmissionStatus
 from .user import User
 
-__all__ = ['Channel', 'Role', 'User', 'Incident', 'IncidentResponse', 'Employee']
+__all__ = [
+    'Channel',
+    'Claims',
+    'Role',
+    'User',
+    'Incident',
+    'IncidentResponse',
+    'Employee',
+    'Submission',
+    'SubmissionStatus',
+    'StoredResponse',
+    'AuditRecord',
+]
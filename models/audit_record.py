@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+
+from .channel import Channel
+
+
+# A registration handled by the web or mobile endpoint, as kept in the audit log
+@dataclass(frozen=True, slots=True)
+class AuditRecord:
+    # Seconds since the epoch when the request was received
+    timestamp: float
+    channel: Channel
+    client_id: str | None
+    # Employee (web) or user (mobile) who sent the registration
+    user_id: str
+    assigned_to: str | None
+    # Status of the response, which reflects the outcome of the downstream calls
+    status: int
+    latency: float
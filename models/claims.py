@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+from .role import Role
+
+
+# Claims of the token forwarded by the API gateway, once checked against the authorization policy of the route. Built for
+# every request and never shared, so not frozen: the __init__ of a frozen dataclass costs more than the checks.
+@dataclass(slots=True)
+class Claims:
+    sub: str
+    cid: str | None
+    role: Role
+    aud: str
+
+    @property
+    def client_id(self) -> str:
+        # For routes whose policy requires the token to belong to a client
+        if self.cid is None:
+            raise ValueError('Token does not belong to any client')
+        return self.cid
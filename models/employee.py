@@ -4,7 +4,7 @@ from datetime import datetime
 from .role import Role
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Employee:
     id: str
     client_id: str
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from models import Channel
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Incident:
     client_id: str
     name: str
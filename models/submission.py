@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+
+from .incident_report import Incident
+from .incident_response import IncidentResponse
+
+
+class SubmissionStatus(StrEnum):
+    QUEUED = 'queued'
+    SENDING = 'sending'
+    REGISTERED = 'registered'
+    FAILED = 'failed'
+
+
+@dataclass
+class Submission:
+    id: str
+    status: SubmissionStatus
+    incident: Incident
+    attempts: int
+    response: IncidentResponse | None
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
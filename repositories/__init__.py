@@ -1,5 +1,16 @@
-from .employee import EmployeeRepository
-from .incident import IncidentRepository
-from .user import UserRepository
+from .employee import AsyncEmployeeRepository, EmployeeRepository
+from .idempotency import IdempotencyRepository
+from .incident import AsyncIncidentRepository, IncidentRepository
+from .submission import SubmissionRepository
+from .user import AsyncUserRepository, UserRepository
 
-__all__ = ['IncidentRepository', 'UserRepository', 'EmployeeRepository']
+__all__ = [
+    'IncidentRepository',
+    'UserRepository',
+    'EmployeeRepository',
+    'AsyncIncidentRepository',
+    'AsyncUserRepository',
+    'AsyncEmployeeRepository',
+    'SubmissionRepository',
+    'IdempotencyRepository',
+]
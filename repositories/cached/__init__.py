@@ -0,0 +1,14 @@
+from .assignment import AssignmentStrategy, LeastRecentlyAssigned, RandomAssignment, RoundRobinAssignment, create_strategy
+from .employee import RosterEmployeeRepository, RosterStats
+from .user import CachedUserRepository
+
+__all__ = [
+    'CachedUserRepository',
+    'RosterEmployeeRepository',
+    'RosterStats',
+    'AssignmentStrategy',
+    'RandomAssignment',
+    'RoundRobinAssignment',
+    'LeastRecentlyAssigned',
+    'create_strategy',
+]
@@ -0,0 +1,55 @@
+import itertools
+import random
+import threading
+from collections.abc import Sequence
+from typing import Protocol
+
+from models import Employee
+
+
+class AssignmentStrategy(Protocol):
+    def choose(self, client_id: str, agents: Sequence[Employee]) -> Employee: ...  # pragma: no cover
+
+
+class RandomAssignment:
+    def choose(self, client_id: str, agents: Sequence[Employee]) -> Employee:  # noqa: ARG002
+        return random.choice(agents)  # noqa: S311
+
+
+class RoundRobinAssignment:
+    def __init__(self) -> None:
+        self._counters: dict[str, itertools.count[int]] = {}
+        self._lock = threading.Lock()
+
+    def choose(self, client_id: str, agents: Sequence[Employee]) -> Employee:
+        with self._lock:
+            counter = self._counters.setdefault(client_id, itertools.count())
+            return agents[next(counter) % len(agents)]
+
+
+class LeastRecentlyAssigned:
+    def __init__(self) -> None:
+        # Sequence number of the last assignment of each agent, agents never assigned come first
+        self._assigned: dict[str, int] = {}
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def choose(self, client_id: str, agents: Sequence[Employee]) -> Employee:  # noqa: ARG002
+        with self._lock:
+            agent = min(agents, key=lambda agent: self._assigned.get(agent.id, 0))
+            self._assigned[agent.id] = next(self._sequence)
+            return agent
+
+
+STRATEGIES: dict[str, type[AssignmentStrategy]] = {
+    'random': RandomAssignment,
+    'round_robin': RoundRobinAssignment,
+    'least_recent': LeastRecentlyAssigned,
+}
+
+
+def create_strategy(name: str) -> AssignmentStrategy:
+    if name not in STRATEGIES:
+        raise ValueError(f'Unknown assignment strategy: {name}')
+
+    return STRATEGIES[name]()
@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from models import Employee
+from repositories import EmployeeRepository
+from util.singleflight import SingleFlight
+
+from .assignment import AssignmentStrategy, RandomAssignment
+
+
+@dataclass(frozen=True)
+class RosterStats:
+    # Assignments made from the in-memory roster
+    local: int
+    # Rosters fetched from the wrapped repository
+    fetches: int
+    # Assignments delegated to the wrapped repository because the roster could not be loaded
+    fallbacks: int
+    # Failed background refreshes
+    failures: int
+
+
+class RosterEmployeeRepository(EmployeeRepository):
+    def __init__(
+        self,
+        repo: EmployeeRepository,
+        strategy: AssignmentStrategy | None = None,
+        refresh_interval: float = 60,
+        max_age: float = 600,
+    ) -> None:
+        self.repo = repo
+        self.strategy = strategy or RandomAssignment()
+        # Rosters older than this are refreshed in the background while still being served
+        self.refresh_interval = refresh_interval
+        # Rosters older than this are not served, they are fetched again before assigning
+        self.max_age = max_age
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # Agents of each client and the time they were fetched, swapped as a single tuple
+        self._rosters: dict[str, tuple[tuple[Employee, ...], float]] = {}
+        self._refreshing: set[str] = set()
+        self._lock = threading.Lock()
+        self._flight: SingleFlight[str, tuple[Employee, ...]] = SingleFlight()
+        self._local = 0
+        self._fetches = 0
+        self._fallbacks = 0
+        self._failures = 0
+
+    def get_random_agent(self, client_id: str) -> Employee | None:
+        try:
+            agents = self.roster(client_id)
+        except Exception:
+            self.logger.exception('Unable to load the agent roster of client %s, falling back to a random agent', client_id)
+            agents = ()
+
+        if not agents:
+            # An empty listing (or a service without the listing endpoint) is not trusted to mean the client has no agents
+            with self._lock:
+                self._fallbacks += 1
+            return self.repo.get_random_agent(client_id)
+
+        with self._lock:
+            self._local += 1
+        return self.strategy.choose(client_id, agents)
+
+    def list_agents(self, client_id: str) -> list[Employee]:
+        return list(self.roster(client_id))
+
+    def roster(self, client_id: str) -> tuple[Employee, ...]:
+        cached = self._rosters.get(client_id)
+
+        if cached is None or time.monotonic() - cached[1] >= self.max_age:
+            # Cold roster, concurrent callers wait for a single fetch
+            return self._flight.do(client_id, lambda: self._fetch(client_id))
+
+        if time.monotonic() - cached[1] >= self.refresh_interval:
+            self._refresh_in_background(client_id)
+
+        return cached[0]
+
+    def stats(self) -> RosterStats:
+        with self._lock:
+            return RosterStats(local=self._local, fetches=self._fetches, fallbacks=self._fallbacks, failures=self._failures)
+
+    def _fetch(self, client_id: str) -> tuple[Employee, ...]:
+        with self._lock:
+            self._fetches += 1
+
+        agents = tuple(self.repo.list_agents(client_id))
+        if agents:
+            self._rosters[client_id] = (agents, time.monotonic())
+        else:
+            # Not cached, so assignments fall back to the wrapped repository until the client has agents listed
+            self._rosters.pop(client_id, None)
+        return agents
+
+    def _refresh_in_background(self, client_id: str) -> None:
+        with self._lock:
+            if client_id in self._refreshing:
+                return
+            self._refreshing.add(client_id)
+
+        threading.Thread(target=self._refresh, args=(client_id,), daemon=True).start()
+
+    def _refresh(self, client_id: str) -> None:
+        try:
+            self._fetch(client_id)
+        except Exception:
+            self.logger.exception('Background refresh of the agent roster of client %s failed', client_id)
+            with self._lock:
+                self._failures += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(client_id)
@@ -0,0 +1,48 @@
+import sys
+from collections.abc import Callable
+
+from models import User
+from repositories import UserRepository
+from util.singleflight import SingleFlight
+from util.ttlcache import CacheStats, Missing, TTLCache
+
+# Kind of lookup, client id (interned, it is shared by the keys of every user of the client) and user id or email
+CacheKey = tuple[str, str | None, str]
+
+
+class CachedUserRepository(UserRepository):
+    def __init__(self, repo: UserRepository, maxsize: int = 10000, ttl: float = 300, negative_ttl: float = 30) -> None:
+        self.repo = repo
+        self.ttl = ttl
+        # Users that were not found are remembered for a shorter time, they may be created at any moment
+        self.negative_ttl = negative_ttl
+        self.cache: TTLCache[CacheKey, User | None] = TTLCache(maxsize)
+        self.flight: SingleFlight[CacheKey, User | None] = SingleFlight()
+
+    def get(self, user_id: str, client_id: str) -> User | None:
+        return self._cached(('id', sys.intern(client_id), user_id), lambda: self.repo.get(user_id, client_id))
+
+    def find_by_email(self, email: str, client_id: str | None = None) -> User | None:
+        key = ('email', sys.intern(client_id) if client_id is not None else None, email)
+        return self._cached(key, lambda: self.repo.find_by_email(email, client_id))
+
+    def stats(self) -> CacheStats:
+        return self.cache.stats()
+
+    def _cached(self, key: CacheKey, load: Callable[[], User | None]) -> User | None:
+        user = self.cache.get(key)
+        if not isinstance(user, Missing):
+            return user
+
+        # Concurrent misses for the same key wait for a single call to the wrapped repository
+        return self.flight.do(key, lambda: self._load(key, load))
+
+    def _load(self, key: CacheKey, load: Callable[[], User | None]) -> User | None:
+        user = load()
+        self.cache.set(key, user, self.ttl if user is not None else self.negative_ttl)
+
+        # A user found by email can also be served by id
+        if user is not None and key[0] == 'email':
+            self.cache.set(('id', user.client_id, user.id), user, self.ttl)
+
+        return user
@@ -4,3 +4,11 @@ from models import Employee
 class EmployeeRepository:
     def get_random_agent(self, client_id: str) -> Employee | None:
         raise NotImplementedError  # pragma: no cover
+
+    def list_agents(self, client_id: str) -> list[Employee]:
+        raise NotImplementedError  # pragma: no cover
+
+
+class AsyncEmployeeRepository:
+    async def get_random_agent(self, client_id: str) -> Employee | None:
+        raise NotImplementedError  # pragma: no cover
@@ -0,0 +1,12 @@
+from models import StoredResponse
+
+
+class IdempotencyRepository:
+    # Stored responses are returned until ttl seconds after they were saved
+    ttl: float
+
+    def get(self, key: str) -> StoredResponse | None:
+        raise NotImplementedError  # pragma: no cover
+
+    def save(self, key: str, response: StoredResponse) -> None:
+        raise NotImplementedError  # pragma: no cover
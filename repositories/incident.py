@@ -2,5 +2,18 @@ from models import Incident, IncidentResponse
 
 
 class IncidentRepository:
-    def create(self, incident: Incident) -> IncidentResponse:
+    # With an idempotency key, the incident service creates the incident once however many times it is sent
+    def create(self, incident: Incident, idempotency_key: str | None = None) -> IncidentResponse:
+        raise NotImplementedError  # pragma: no cover
+
+    # Get ready to create incidents (e.g. fetch credentials) while other work is in progress
+    def prepare(self) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+
+class AsyncIncidentRepository:
+    async def create(self, incident: Incident) -> IncidentResponse:
+        raise NotImplementedError  # pragma: no cover
+
+    async def prepare(self) -> None:
         raise NotImplementedError  # pragma: no cover
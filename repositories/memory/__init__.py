@@ -0,0 +1,3 @@
+from .idempotency import MemoryIdempotencyRepository
+
+__all__ = ['MemoryIdempotencyRepository']
@@ -0,0 +1,17 @@
+from models import StoredResponse
+from repositories import IdempotencyRepository
+from util.ttlcache import Missing, TTLCache
+
+
+# Responses are kept in the memory of the instance, so a retry reaching another instance is not recognized
+class MemoryIdempotencyRepository(IdempotencyRepository):
+    def __init__(self, maxsize: int = 10000, ttl: float = 86400) -> None:
+        self.ttl = ttl
+        self.cache: TTLCache[str, StoredResponse] = TTLCache(maxsize)
+
+    def get(self, key: str) -> StoredResponse | None:
+        response = self.cache.get(key)
+        return None if isinstance(response, Missing) else response
+
+    def save(self, key: str, response: StoredResponse) -> None:
+        self.cache.set(key, response, self.ttl)
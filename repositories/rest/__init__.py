@@ -1,6 +1,22 @@
+from .decoder import DecodeError, compile_decoder
 from .employee import RestEmployeeRepository
 from .incident import RestIncidentRepository
+from .session import HttpOptions, PooledSession, PoolStats
+from .token import CachingTokenProvider, StaticTokenProvider, TokenStats
 from .user import RestUserRepository
 from .util import TokenProvider
 
-__all__ = ['RestIncidentRepository', 'RestUserRepository', 'TokenProvider', 'RestEmployeeRepository']
+__all__ = [
+    'RestIncidentRepository',
+    'RestUserRepository',
+    'TokenProvider',
+    'RestEmployeeRepository',
+    'HttpOptions',
+    'PooledSession',
+    'PoolStats',
+    'CachingTokenProvider',
+    'StaticTokenProvider',
+    'TokenStats',
+    'DecodeError',
+    'compile_decoder',
+]
@@ -0,0 +1,6 @@
+from .client import AsyncHttpClient
+from .employee import AsyncRestEmployeeRepository
+from .incident import AsyncRestIncidentRepository
+from .user import AsyncRestUserRepository
+
+__all__ = ['AsyncHttpClient', 'AsyncRestEmployeeRepository', 'AsyncRestIncidentRepository', 'AsyncRestUserRepository']
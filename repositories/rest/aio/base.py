@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from typing import Any, Never
+
+import aiohttp
+
+from repositories.rest.util import CachedTokenProvider, TokenProvider
+
+from .client import AsyncHttpClient
+
+
+class AsyncRestBaseRepository:
+    def __init__(self, base_url: str, token_provider: TokenProvider | None, client: AsyncHttpClient | None = None) -> None:
+        self.base_url = base_url
+        self.token_provider = token_provider
+        self.client = client or AsyncHttpClient()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def _get_headers(self) -> dict[str, str] | None:
+        if self.token_provider is None:
+            return None
+
+        id_token = self.token_provider.cached_token() if isinstance(self.token_provider, CachedTokenProvider) else None
+        if id_token is None:
+            # Fetching a token blocks (e.g. metadata server calls), keep it off the event loop
+            id_token = await asyncio.to_thread(self.token_provider.get_token)
+        return {'Authorization': f'Bearer {id_token}'}
+
+    async def authenticated_get(self, url: str) -> aiohttp.ClientResponse:
+        return await self.client.request('GET', url, headers=await self._get_headers())
+
+    async def authenticated_post(self, url: str, json: dict[str, Any]) -> aiohttp.ClientResponse:
+        return await self.client.request('POST', url, headers=await self._get_headers(), json=json)
+
+    def unexpected_error(self, resp: aiohttp.ClientResponse) -> Never:
+        resp.raise_for_status()
+
+        raise aiohttp.ClientResponseError(
+            resp.request_info,
+            resp.history,
+            status=resp.status,
+            message='Unexpected response from server',
+        )
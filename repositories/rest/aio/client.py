@@ -0,0 +1,43 @@
+from typing import Any
+
+import aiohttp
+
+from repositories.rest.session import HttpOptions
+
+
+# Shared by all async repositories, so connections are pooled and kept alive across services and requests.
+# The aiohttp session is created lazily because it must belong to the running event loop.
+class AsyncHttpClient:
+    def __init__(self, options: HttpOptions | None = None) -> None:
+        self.options = options or HttpOptions()
+        self._session: aiohttp.ClientSession | None = None
+
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=self.options.pool_maxsize if self.options.pool_block else 0,
+                force_close=not self.options.keep_alive,
+            )
+            timeout = aiohttp.ClientTimeout(sock_connect=self.options.connect_timeout, sock_read=self.options.read_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+        return self._session
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        json: dict[str, Any] | None = None,
+    ) -> aiohttp.ClientResponse:
+        async with self.session().request(method, url, headers=headers, json=json) as resp:
+            # Read the body before the connection goes back to the pool, resp.json() uses the buffered body
+            await resp.read()
+
+        return resp
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
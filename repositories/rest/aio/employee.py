@@ -0,0 +1,26 @@
+from http import HTTPStatus
+from typing import Any, cast
+
+from models import Employee
+from repositories import AsyncEmployeeRepository
+from repositories.rest.employee import employee_from_json
+from repositories.rest.util import TokenProvider
+
+from .base import AsyncRestBaseRepository
+from .client import AsyncHttpClient
+
+
+class AsyncRestEmployeeRepository(AsyncEmployeeRepository, AsyncRestBaseRepository):
+    def __init__(self, base_url: str, token_provider: TokenProvider | None, client: AsyncHttpClient | None = None) -> None:
+        AsyncRestBaseRepository.__init__(self, base_url, token_provider, client)
+
+    async def get_random_agent(self, client_id: str) -> Employee | None:
+        resp = await self.authenticated_get(f'{self.base_url}/api/v1/random/{client_id}/agent')
+
+        if resp.status == HTTPStatus.OK:
+            return employee_from_json(cast(dict[str, Any], await resp.json()))
+
+        if resp.status == HTTPStatus.NOT_FOUND:
+            return None
+
+        self.unexpected_error(resp)  # noqa: RET503
@@ -0,0 +1,25 @@
+from http import HTTPStatus
+
+from models import Incident, IncidentResponse
+from repositories import AsyncIncidentRepository
+from repositories.rest.incident import incident_response_from_json, incident_to_json
+from repositories.rest.util import TokenProvider
+
+from .base import AsyncRestBaseRepository
+from .client import AsyncHttpClient
+
+
+class AsyncRestIncidentRepository(AsyncIncidentRepository, AsyncRestBaseRepository):
+    def __init__(self, base_url: str, token_provider: TokenProvider | None, client: AsyncHttpClient | None = None) -> None:
+        AsyncRestBaseRepository.__init__(self, base_url, token_provider, client)
+
+    async def prepare(self) -> None:
+        await self._get_headers()
+
+    async def create(self, incident: Incident) -> IncidentResponse:
+        resp = await self.authenticated_post(f'{self.base_url}/api/v1/register/incident', json=incident_to_json(incident))
+
+        if resp.status == HTTPStatus.CREATED:
+            return incident_response_from_json(await resp.json())
+
+        self.unexpected_error(resp)  # noqa: RET503
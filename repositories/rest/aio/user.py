@@ -0,0 +1,39 @@
+from http import HTTPStatus
+from typing import Any, cast
+
+from models import User
+from repositories import AsyncUserRepository
+from repositories.rest.user import user_from_json
+from repositories.rest.util import TokenProvider
+
+from .base import AsyncRestBaseRepository
+from .client import AsyncHttpClient
+
+
+class AsyncRestUserRepository(AsyncUserRepository, AsyncRestBaseRepository):
+    def __init__(self, base_url: str, token_provider: TokenProvider | None, client: AsyncHttpClient | None = None) -> None:
+        AsyncRestBaseRepository.__init__(self, base_url, token_provider, client)
+
+    async def get(self, user_id: str, client_id: str) -> User | None:
+        resp = await self.authenticated_get(f'{self.base_url}/api/v1/users/{client_id}/{user_id}')
+
+        if resp.status == HTTPStatus.OK:
+            return user_from_json(cast(dict[str, Any], await resp.json()))
+
+        if resp.status == HTTPStatus.NOT_FOUND:
+            return None
+
+        self.unexpected_error(resp)  # noqa: RET503
+
+    async def find_by_email(self, email: str, client_id: str | None = None) -> User | None:
+        data = {'email': email}
+        resp = await self.authenticated_post(f'{self.base_url}/api/v1/users/detail', json=data)
+
+        if resp.status == HTTPStatus.OK:
+            user = user_from_json(cast(dict[str, Any], await resp.json()))
+            return user if client_id is None or user.client_id == client_id else None
+
+        if resp.status == HTTPStatus.NOT_FOUND:
+            return None
+
+        self.unexpected_error(resp)  # noqa: RET503
@@ -1,15 +1,53 @@
 import logging
-from typing import Any, Never
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Never
 
 import requests
 
+from util.breaker import CircuitBreaker
+from util.metrics import downstream_seconds
+from util.retry import RetryPolicy
+from util.singleflight import SingleFlight
+
+from .session import HttpOptions, PooledSession, PoolStats
 from .util import TokenProvider
 
+if TYPE_CHECKING:
+    from util.hedge import Hedger
+
+
+@dataclass(frozen=True)
+class CoalescingStats:
+    # GET requests sent to the service
+    executed: int
+    # GET requests answered with the response of an identical request already in flight
+    shared: int
+
 
 class RestBaseRepository:
-    def __init__(self, base_url: str, token_provider: TokenProvider | None) -> None:
+    # Name of the downstream service, used to label metrics
+    service = 'unknown'
+    # POST paths that only read, hedged like GET requests
+    hedged_posts: frozenset[str] = frozenset()
+
+    def __init__(
+        self,
+        base_url: str,
+        token_provider: TokenProvider | None,
+        http_options: HttpOptions | None = None,
+        retry_policy: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
         self.base_url = base_url
         self.token_provider = token_provider
+        self.session = PooledSession(http_options)
+        self.retry_policy = retry_policy
+        self.breaker = breaker
+        # Identical GET requests made at the same time share one call and its response
+        self.flight: SingleFlight[str, requests.Response] = SingleFlight()
+        # Set by the container for services whose reads are hedged
+        self.hedger: Hedger | None = None
         self.logger = logging.getLogger(self.__class__.__name__)
 
     def _get_headers(self) -> dict[str, str] | None:
@@ -21,11 +59,112 @@ class RestBaseRepository:
 
         return headers
 
-    def authenticated_get(self, url: str) -> requests.Response:
-        return requests.get(url, timeout=2, headers=self._get_headers())
+    # Paths are templates such as /api/v1/users/{client_id}, so metrics are grouped by route and not by resource
+    def authenticated_get(self, path: str, **params: str) -> requests.Response:
+        return self.flight.do(path.format(**params), lambda: self._request('GET', path, params))
+
+    # POST requests are only retried when idempotent is set, unless the connection was never established
+    def authenticated_post(
+        self,
+        path: str,
+        json: dict[str, Any],
+        *,
+        idempotent: bool = False,
+        headers: dict[str, str] | None = None,
+        **params: str,
+    ) -> requests.Response:
+        return self._request('POST', path, params, json, idempotent=idempotent, headers=headers)
+
+    def _request(  # noqa: PLR0913
+        self,
+        method: str,
+        path: str,
+        params: dict[str, str],
+        json: dict[str, Any] | None = None,
+        *,
+        idempotent: bool = True,
+        headers: dict[str, str] | None = None,
+    ) -> requests.Response:
+        url = self.base_url + path.format(**params)
+        auth_headers = self._get_headers()
+        headers = {**(auth_headers or {}), **headers} if headers else auth_headers
+        if self.retry_policy is not None:
+            self.retry_policy.budget.deposit()
+
+        attempt = 1
+        while True:
+            if self.breaker is not None:
+                self.breaker.before_call()
+
+            try:
+                if self.hedger is not None and (method == 'GET' or path in self.hedged_posts):
+                    resp = self.hedger.run(lambda: self._send(method, path, url, headers, json))
+                else:
+                    resp = self._send(method, path, url, headers, json)
+            except requests.RequestException as exc:
+                self._record_outcome(failed=True)
+                if not self._retry(attempt, retryable=idempotent or isinstance(exc, requests.ConnectTimeout)):
+                    raise
+            else:
+                self._record_outcome(failed=resp.status_code >= requests.codes.server_error)
+                if self.retry_policy is None or resp.status_code not in self.retry_policy.retry_statuses:
+                    return resp
+                if not self._retry(attempt, retryable=idempotent):
+                    return resp
+
+            attempt += 1
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        url: str,
+        headers: dict[str, str] | None,
+        json: dict[str, Any] | None,
+    ) -> requests.Response:
+        status = 'error'
+        start = time.perf_counter()
+        try:
+            resp = self.session.request(method, url, headers=headers, json=json)
+            status = str(resp.status_code)
+            return resp
+        finally:
+            downstream_seconds.observe((self.service, method, path, status), time.perf_counter() - start)
+
+    def _record_outcome(self, *, failed: bool) -> None:
+        if self.breaker is None:
+            return
+
+        if failed:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def _retry(self, attempt: int, *, retryable: bool) -> bool:
+        if self.retry_policy is None or not retryable or not self.retry_policy.should_retry(attempt):
+            return False
+
+        delay = self.retry_policy.backoff(attempt)
+        self.logger.warning('Retrying request to %s service in %.3fs (attempt %d)', self.service, delay, attempt + 1)
+        time.sleep(delay)
+        return True
+
+    # Checks the health endpoint of the service, raising when it is unreachable or unhealthy. Probes are not retried,
+    # hedged or short-circuited, so they report on the service itself.
+    def probe(self) -> None:
+        path = f'/api/v1/health/{self.service}'
+        resp = self._send('GET', path, self.base_url + path, self._get_headers(), None)
+        if resp.status_code != requests.codes.ok:
+            self.unexpected_error(resp)
+
+    def warm_connections(self, connections: int) -> int:
+        return self.session.warm(self.base_url, connections)
+
+    def pool_stats(self) -> PoolStats:
+        return self.session.stats()
 
-    def authenticated_post(self, url: str, json: dict[str, Any]) -> requests.Response:
-        return requests.post(url, json=json, timeout=2, headers=self._get_headers())
+    def coalescing_stats(self) -> CoalescingStats:
+        return CoalescingStats(executed=self.flight.executed, shared=self.flight.shared)
 
     def unexpected_error(self, resp: requests.Response) -> Never:
         resp.raise_for_status()
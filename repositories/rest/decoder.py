@@ -0,0 +1,124 @@
+import dataclasses
+import datetime
+import sys
+from collections.abc import Callable, Collection, Mapping
+from enum import Enum
+from types import NoneType, UnionType
+from typing import Any, TypeVar, Union, cast, get_args, get_origin, get_type_hints
+
+T = TypeVar('T')
+
+
+class DecodeError(ValueError):
+    pass
+
+
+def invalid(label: str, expected: str, value: object) -> DecodeError:
+    return DecodeError(f'Invalid value for {label}: expected {expected}, got {type(value).__name__}')
+
+
+def missing(label: str) -> DecodeError:
+    return DecodeError(f'Missing value for {label}')
+
+
+def unwrap_optional(tp: Any) -> tuple[bool, Any]:  # noqa: ANN401
+    if get_origin(tp) in {Union, UnionType}:
+        args = [arg for arg in get_args(tp) if arg is not NoneType]
+        if len(args) == 1 and len(get_args(tp)) == 2:  # noqa: PLR2004
+            return True, args[0]
+    return False, tp
+
+
+def conversion_lines(var: str, tp: Any, label: str, namespace: dict[str, Any], indent: int) -> list[str]:  # noqa: ANN401
+    # Statements that check the type of var and replace it with its converted value
+    pad = ' ' * indent
+    optional, tp = unwrap_optional(tp)
+    if optional:
+        return [f'{pad}if {var} is not None:', *conversion_lines(var, tp, label, namespace, indent + 4)]
+
+    if tp in {str, int, bool}:
+        # Exact type checks, bool is a subclass of int but not a valid int here
+        return [f'{pad}if type({var}) is not {tp.__name__}:', f'{pad}    raise invalid({label!r}, {tp.__name__!r}, {var})']
+
+    if tp is float:
+        return [
+            f'{pad}if type({var}) is int:',
+            f'{pad}    {var} = float({var})',
+            f'{pad}elif type({var}) is not float:',
+            f"{pad}    raise invalid({label!r}, 'float', {var})",
+        ]
+
+    name = f'{var}_type'
+    namespace[name] = tp
+
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return [
+            f'{pad}try:',
+            f'{pad}    {var} = {name}({var})',
+            f'{pad}except (TypeError, ValueError):',
+            f'{pad}    raise invalid({label!r}, {tp.__name__!r}, {var}) from None',
+        ]
+
+    if tp is datetime.datetime:
+        return [
+            f'{pad}if type({var}) is not str:',
+            f"{pad}    raise invalid({label!r}, 'ISO 8601 datetime', {var})",
+            f'{pad}try:',
+            f'{pad}    {var} = {name}.fromisoformat({var})',
+            f'{pad}except ValueError:',
+            f"{pad}    raise invalid({label!r}, 'ISO 8601 datetime', {var}) from None",
+        ]
+
+    if isinstance(tp, type) and dataclasses.is_dataclass(tp):
+        namespace[name] = compile_decoder(tp)
+        return [f'{pad}{var} = {name}({var})']
+
+    raise TypeError(f'Unsupported type {tp} for {label}')
+
+
+def compile_decoder(
+    cls: type[T],
+    aliases: Mapping[str, str] | None = None,
+    interned: Collection[str] = (),
+) -> Callable[[Any], T]:
+    # Generates a function that reads every field of the dataclass from a JSON object by its key (the field name or its
+    # alias), checks and converts its type, and calls the constructor. It is compiled once, so decoding a response does
+    # no reflection. Keys without a field are ignored. Values of the interned fields, strings repeated across many
+    # objects (like client ids), are interned so cached objects share a single copy.
+    aliases = aliases or {}
+    hints = get_type_hints(cls)
+    namespace: dict[str, Any] = {'cls': cls, 'invalid': invalid, 'missing': missing, 'intern': sys.intern}
+    lines = [
+        'def decode(data):',
+        '    if type(data) is not dict:',
+        f"        raise invalid({cls.__name__!r}, 'object', data)",
+    ]
+
+    args = []
+    for index, field in enumerate(dataclasses.fields(cast(Any, cls))):
+        if not field.init or field.default is not dataclasses.MISSING or field.default_factory is not dataclasses.MISSING:
+            raise TypeError(f'Unsupported field {cls.__name__}.{field.name}, only required init fields can be decoded')
+
+        key = aliases.get(field.name, field.name)
+        label = f'{cls.__name__}.{key}'
+        var = f'v{index}'
+        lines += [
+            '    try:',
+            f'        {var} = data[{key!r}]',
+            '    except KeyError:',
+            f'        raise missing({label!r}) from None',
+            *conversion_lines(var, hints[field.name], label, namespace, 4),
+        ]
+        if field.name in interned:
+            if hints[field.name] is not str:
+                raise TypeError(f'Unsupported interned field {cls.__name__}.{field.name}, only str fields can be interned')
+            lines.append(f'    {var} = intern({var})')
+        args.append(var)
+
+    # Positional arguments, in field order, are the cheapest way to call the generated __init__
+    lines.append(f'    return cls({", ".join(args)})')
+
+    exec(compile('\n'.join(lines), f'<decoder {cls.__qualname__}>', 'exec'), namespace)  # noqa: S102
+    decoder = namespace['decode']
+    decoder.__qualname__ = decoder.__name__ = f'decode_{cls.__name__}'
+    return cast(Callable[[Any], T], decoder)
@@ -1,36 +1,55 @@
-import datetime
-from enum import Enum
 from typing import Any, cast
 
-import dacite
 import requests
 
 from models import Employee
 from repositories import EmployeeRepository
+from util.breaker import CircuitBreaker
+from util.retry import RetryPolicy
 
 from .base import RestBaseRepository
+from .decoder import compile_decoder
+from .session import HttpOptions
 from .util import TokenProvider
 
+employee_from_json = compile_decoder(
+    Employee,
+    {'client_id': 'clientId', 'invitation_status': 'invitationStatus', 'invitation_date': 'invitationDate'},
+    interned={'client_id', 'invitation_status'},
+)
+
 
 class RestEmployeeRepository(EmployeeRepository, RestBaseRepository):
-    def __init__(self, base_url: str, token_provider: TokenProvider | None) -> None:
-        RestBaseRepository.__init__(self, base_url, token_provider)
+    service = 'client'
+
+    def __init__(
+        self,
+        base_url: str,
+        token_provider: TokenProvider | None,
+        http_options: HttpOptions | None = None,
+        retry_policy: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        RestBaseRepository.__init__(self, base_url, token_provider, http_options, retry_policy, breaker)
 
     def get_random_agent(self, client_id: str) -> Employee | None:
-        resp = self.authenticated_get(f'{self.base_url}/api/v1/random/{client_id}/agent')
+        resp = self.authenticated_get('/api/v1/random/{client_id}/agent', client_id=client_id)
 
         if resp.status_code == requests.codes.ok:
-            json = cast(dict[str, Any], resp.json())
-            json['client_id'] = json.pop('clientId')
-            json['invitation_status'] = json.pop('invitationStatus')
-            json['invitation_date'] = json.pop('invitationDate')
-            return dacite.from_dict(
-                data_class=Employee,
-                data=json,
-                config=dacite.Config(cast=[Enum], type_hooks={datetime.datetime: datetime.datetime.fromisoformat}),
-            )
+            return employee_from_json(cast(dict[str, Any], resp.json()))
 
         if resp.status_code == requests.codes.not_found:
             return None
 
         self.unexpected_error(resp)  # noqa: RET503
+
+    def list_agents(self, client_id: str) -> list[Employee]:
+        resp = self.authenticated_get('/api/v1/clients/{client_id}/agents', client_id=client_id)
+
+        if resp.status_code == requests.codes.ok:
+            return [employee_from_json(item) for item in cast(list[dict[str, Any]], resp.json())]
+
+        if resp.status_code == requests.codes.not_found:
+            return []
+
+        self.unexpected_error(resp)  # noqa: RET503
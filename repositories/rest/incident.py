@@ -1,39 +1,56 @@
+from typing import Any
+
 import requests
 
 from models import Incident, IncidentResponse
 from repositories import IncidentRepository
+from util.breaker import CircuitBreaker
+from util.retry import RetryPolicy
 
 from .base import RestBaseRepository
+from .decoder import compile_decoder
+from .session import HttpOptions
 from .util import TokenProvider
 
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+
+
+def incident_to_json(incident: Incident) -> dict[str, Any]:
+    return {
+        'client_id': incident.client_id,
+        'name': incident.name,
+        'channel': incident.channel.value,
+        'reported_by': incident.reported_by,
+        'created_by': incident.created_by,
+        'description': incident.description,
+        'assigned_to': incident.assigned_to,
+    }
+
+
+incident_response_from_json = compile_decoder(IncidentResponse, interned={'client_id', 'channel'})
+
 
 class RestIncidentRepository(IncidentRepository, RestBaseRepository):
-    def __init__(self, base_url: str, token_provider: TokenProvider | None) -> None:
-        RestBaseRepository.__init__(self, base_url, token_provider)
-
-    def create(self, incident: Incident) -> IncidentResponse:
-        data = {
-            'client_id': incident.client_id,
-            'name': incident.name,
-            'channel': incident.channel.value,
-            'reported_by': incident.reported_by,
-            'created_by': incident.created_by,
-            'description': incident.description,
-            'assigned_to': incident.assigned_to,
-        }
-
-        resp = self.authenticated_post(f'{self.base_url}/api/v1/register/incident', json=data)
+    service = 'incidentmodify'
+
+    def __init__(
+        self,
+        base_url: str,
+        token_provider: TokenProvider | None,
+        http_options: HttpOptions | None = None,
+        retry_policy: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        RestBaseRepository.__init__(self, base_url, token_provider, http_options, retry_policy, breaker)
+
+    def prepare(self) -> None:
+        self._get_headers()
+
+    def create(self, incident: Incident, idempotency_key: str | None = None) -> IncidentResponse:
+        headers = {IDEMPOTENCY_KEY_HEADER: idempotency_key} if idempotency_key is not None else None
+        resp = self.authenticated_post('/api/v1/register/incident', json=incident_to_json(incident), headers=headers)
 
         if resp.status_code == requests.codes.created:
-            response_data = resp.json()
-            return IncidentResponse(
-                id=response_data['id'],
-                client_id=response_data['client_id'],
-                name=response_data['name'],
-                channel=response_data['channel'],
-                reported_by=response_data['reported_by'],
-                created_by=response_data['created_by'],
-                assigned_to=response_data['assigned_to'],
-            )
+            return incident_response_from_json(resp.json())
 
         self.unexpected_error(resp)  # noqa: RET503
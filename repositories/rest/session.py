@@ -0,0 +1,116 @@
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool
+
+
+@dataclass(frozen=True)
+class HttpOptions:
+    # Number of per-host connection pools kept alive
+    pool_connections: int = 10
+    # Number of connections kept alive per host
+    pool_maxsize: int = 10
+    # Never open more than pool_maxsize connections per host, wait for a free one instead
+    pool_block: bool = False
+    keep_alive: bool = True
+    connect_timeout: float = 2.0
+    read_timeout: float = 2.0
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    # Requests served by an already open connection
+    hits: int
+    # Requests that had to open a new connection
+    misses: int
+
+
+# requests.Session is not thread-safe, so every thread gets its own session object. All of them are mounted on the
+# same HTTPAdapter, whose urllib3 pools are thread-safe and keep connections alive between requests.
+class PooledSession:
+    def __init__(self, options: HttpOptions | None = None) -> None:
+        self.options = options or HttpOptions()
+        self.timeout = (self.options.connect_timeout, self.options.read_timeout)
+        self.adapter = HTTPAdapter(
+            pool_connections=self.options.pool_connections,
+            pool_maxsize=self.options.pool_maxsize,
+            pool_block=self.options.pool_block,
+        )
+        self._local = threading.local()
+        # Connections opened by warm, not by a request
+        self._warmed = 0
+        self._warm_lock = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        session: requests.Session | None = getattr(self._local, 'session', None)
+
+        if session is None:
+            session = requests.Session()
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+            if not self.options.keep_alive:
+                session.headers['Connection'] = 'close'
+            self._local.session = session
+
+        return session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        json: dict[str, Any] | None = None,
+    ) -> requests.Response:
+        return self._session().request(method, url, headers=headers, json=json, timeout=self.timeout)
+
+    def warm(self, url: str, connections: int) -> int:
+        # Opens up to connections to the host of url ahead of the first requests and leaves them idle in the pool that
+        # requests to url will use. Without keep alive every request opens its own connection, so none are opened.
+        if not self.options.keep_alive:
+            return 0
+
+        # The pool is chosen from the TLS and proxy settings requests would send with, which can come from the environment
+        settings = self._session().merge_environment_settings(url, {}, None, None, None)
+        pool = self.adapter.get_connection_with_tls_context(
+            requests.Request('GET', url).prepare(), settings['verify'], settings['proxies'], settings['cert']
+        )
+        if not isinstance(pool, HTTPConnectionPool):  # pragma: no cover
+            return 0
+
+        taken = []
+        opened = 0
+        try:
+            # Taken all at once, a connection put back would be handed out again
+            for _ in range(min(connections, self.options.pool_maxsize)):
+                conn = pool._get_conn()  # noqa: SLF001
+                taken.append(conn)
+                if not conn.is_connected:
+                    conn.connect()
+                    opened += 1
+        finally:
+            for conn in taken:
+                pool._put_conn(conn)  # noqa: SLF001
+            with self._warm_lock:
+                self._warmed += opened
+
+        return opened
+
+    def stats(self) -> PoolStats:
+        total_requests = 0
+        new_connections = 0
+
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():  # noqa: SIM118
+            pool = pools.get(key)
+            if pool is not None:
+                total_requests += pool.num_requests
+                new_connections += pool.num_connections
+
+        new_connections = max(new_connections - self._warmed, 0)
+        return PoolStats(hits=max(total_requests - new_connections, 0), misses=new_connections)
+
+    def close(self) -> None:
+        self.adapter.close()  # type: ignore[no-untyped-call]
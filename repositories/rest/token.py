@@ -0,0 +1,139 @@
+import base64
+import binascii
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from .util import TokenProvider
+
+
+@dataclass(frozen=True)
+class TokenStats:
+    # Tokens served from cache while still fresh
+    hits: int
+    # Calls made to the wrapped provider
+    refreshes: int
+    # Tokens served from cache while a refresh was due or failed
+    stale: int
+    # Failed calls to the wrapped provider
+    failures: int
+
+
+class StaticTokenProvider:
+    def __init__(self, token: str) -> None:
+        self.token = token
+
+    def get_token(self) -> str:
+        return self.token
+
+    def cached_token(self) -> str | None:
+        return self.token
+
+
+def decode_expiry(token: str) -> float | None:
+    # Read the exp claim of a JWT without verifying it, the signature is checked by the receiving service
+    parts = token.split('.')
+    if len(parts) != 3:  # noqa: PLR2004
+        return None
+
+    payload = parts[1] + '=' * (-len(parts[1]) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+    exp = claims.get('exp') if isinstance(claims, dict) else None
+    if isinstance(exp, int | float) and not isinstance(exp, bool):
+        return float(exp)
+
+    return None
+
+
+class CachingTokenProvider:
+    def __init__(self, provider: TokenProvider, refresh_margin: float = 300, default_ttl: float = 3600) -> None:
+        self.provider = provider
+        # Refresh tokens this many seconds before they expire (at most halfway through their lifetime)
+        self.refresh_margin = refresh_margin
+        # Lifetime assumed for tokens without an exp claim
+        self.default_ttl = default_ttl
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # Token, refresh time and expiry, swapped as a single tuple so readers never see a mismatched set
+        self._cached: tuple[str, float, float] | None = None
+        # Held by whoever is currently calling the wrapped provider
+        self._refresh_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._refreshes = 0
+        self._stale = 0
+        self._failures = 0
+
+    def get_token(self) -> str:
+        token = self.cached_token()
+        if token is not None:
+            return token
+
+        # No usable token, wait for the refresh (or for another thread already doing it)
+        with self._refresh_lock:
+            cached = self._cached
+            if cached is not None and time.time() < cached[2]:
+                self._count_hit()
+                return cached[0]
+
+            return self._refresh()
+
+    # The cached token unless it expired, a refresh that is due runs in the background
+    def cached_token(self) -> str | None:
+        cached = self._cached
+        now = time.time()
+
+        if cached is None or now >= cached[2]:
+            return None
+
+        if now < cached[1]:
+            self._count_hit()
+        else:
+            if self._refresh_lock.acquire(blocking=False):
+                threading.Thread(target=self._refresh_in_background, daemon=True).start()
+            self._count_stale()
+
+        return cached[0]
+
+    def stats(self) -> TokenStats:
+        with self._stats_lock:
+            return TokenStats(hits=self._hits, refreshes=self._refreshes, stale=self._stale, failures=self._failures)
+
+    def _refresh(self) -> str:
+        with self._stats_lock:
+            self._refreshes += 1
+
+        try:
+            token = self.provider.get_token()
+        except Exception:
+            with self._stats_lock:
+                self._failures += 1
+            raise
+
+        now = time.time()
+        expires_at = decode_expiry(token) or now + self.default_ttl
+        refresh_at = expires_at - min(self.refresh_margin, (expires_at - now) / 2)
+        self._cached = (token, refresh_at, expires_at)
+        return token
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self._refresh()
+        except Exception:
+            self.logger.exception('Background token refresh failed, serving cached token until it expires')
+        finally:
+            self._refresh_lock.release()
+
+    def _count_hit(self) -> None:
+        with self._stats_lock:
+            self._hits += 1
+
+    def _count_stale(self) -> None:
+        with self._stats_lock:
+            self._stale += 1
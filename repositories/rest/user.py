@@ -1,41 +1,56 @@
 from typing import Any, cast
 
-import dacite
 import requests
 
 from models import User
 from repositories import UserRepository
+from util.breaker import CircuitBreaker
+from util.retry import RetryPolicy
 
 from .base import RestBaseRepository
+from .decoder import compile_decoder
+from .session import HttpOptions
 from .util import TokenProvider
 
+# Maps the json naming convention to the Python naming convention
+user_from_json = compile_decoder(User, {'client_id': 'clientId'}, interned={'client_id'})
+
 
 class RestUserRepository(UserRepository, RestBaseRepository):
-    def __init__(self, base_url: str, token_provider: TokenProvider | None) -> None:
-        RestBaseRepository.__init__(self, base_url, token_provider)
+    service = 'user'
+    hedged_posts = frozenset({'/api/v1/users/detail'})
+
+    def __init__(
+        self,
+        base_url: str,
+        token_provider: TokenProvider | None,
+        http_options: HttpOptions | None = None,
+        retry_policy: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        RestBaseRepository.__init__(self, base_url, token_provider, http_options, retry_policy, breaker)
 
     def get(self, user_id: str, client_id: str) -> User | None:
-        resp = self.authenticated_get(f'{self.base_url}/api/v1/users/{client_id}/{user_id}')
+        resp = self.authenticated_get('/api/v1/users/{client_id}/{user_id}', client_id=client_id, user_id=user_id)
 
         if resp.status_code == requests.codes.ok:
-            json = cast(dict[str, Any], resp.json())
-            # Convert from json naming convention to Python naming convention
-            json['client_id'] = json.pop('clientId')
-            return dacite.from_dict(data_class=User, data=json)
+            return user_from_json(cast(dict[str, Any], resp.json()))
 
         if resp.status_code == requests.codes.not_found:
             return None
 
         self.unexpected_error(resp)  # noqa: RET503
 
-    def find_by_email(self, email: str) -> User | None:
+    def find_by_email(self, email: str, client_id: str | None = None) -> User | None:
         data = {'email': email}
-        resp = self.authenticated_post(f'{self.base_url}/api/v1/users/detail', json=data)
+        resp = self.authenticated_post('/api/v1/users/detail', json=data, idempotent=True)
 
         if resp.status_code == requests.codes.ok:
-            json = cast(dict[str, Any], resp.json())
-            # Convert from json naming convention to Python naming convention
-            json['client_id'] = json.pop('clientId')
-            return dacite.from_dict(data_class=User, data=json)
+            user = user_from_json(cast(dict[str, Any], resp.json()))
+            return user if client_id is None or user.client_id == client_id else None
 
-        return None
+        # Only a confirmed 404 means the user does not exist, errors must not be cached as missing users
+        if resp.status_code == requests.codes.not_found:
+            return None
+
+        self.unexpected_error(resp)  # noqa: RET503
@@ -1,5 +1,11 @@
-from typing import Protocol
+from typing import Protocol, runtime_checkable
 
 
 class TokenProvider(Protocol):
     def get_token(self) -> str: ...  # pragma: no cover
+
+
+# Providers that hand out the token they hold without blocking, None when it has to be fetched with get_token
+@runtime_checkable
+class CachedTokenProvider(TokenProvider, Protocol):
+    def cached_token(self) -> str | None: ...  # pragma: no cover
@@ -0,0 +1,4 @@
+from .idempotency import SqliteIdempotencyRepository
+from .submission import SqliteSubmissionRepository
+
+__all__ = ['SqliteSubmissionRepository', 'SqliteIdempotencyRepository']
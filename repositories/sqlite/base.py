@@ -0,0 +1,26 @@
+import sqlite3
+import threading
+
+
+class SqliteBaseRepository:
+    # Statements creating the tables of the repository, run when it is created
+    schema = ''
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+
+        with self._connection() as conn:
+            conn.executescript(self.schema)
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads, so every thread opens its own
+        conn: sqlite3.Connection | None = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('PRAGMA synchronous = FULL')
+            self._local.conn = conn
+
+        return conn
@@ -0,0 +1,57 @@
+import json
+import sqlite3
+import time
+
+from models import StoredResponse
+from repositories import IdempotencyRepository
+
+from .base import SqliteBaseRepository
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    body BLOB NOT NULL,
+    headers TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idempotency_keys_expiry ON idempotency_keys (expires_at);
+"""
+
+
+def stored_response_from_row(row: sqlite3.Row) -> StoredResponse:
+    return StoredResponse(
+        fingerprint=row['fingerprint'],
+        status=row['status'],
+        body=row['body'],
+        headers=tuple((name, value) for name, value in json.loads(row['headers'])),
+    )
+
+
+# Responses survive a restart of the instance and are shared by the processes using the same file
+class SqliteIdempotencyRepository(IdempotencyRepository, SqliteBaseRepository):
+    schema = SCHEMA
+
+    def __init__(self, path: str, ttl: float = 86400) -> None:
+        SqliteBaseRepository.__init__(self, path)
+        self.ttl = ttl
+
+    def get(self, key: str) -> StoredResponse | None:
+        row = (
+            self._connection()
+            .execute('SELECT * FROM idempotency_keys WHERE key = ? AND expires_at > ?', (key, time.time()))
+            .fetchone()
+        )
+        return stored_response_from_row(row) if row is not None else None
+
+    def save(self, key: str, response: StoredResponse) -> None:
+        now = time.time()
+        with self._connection() as conn:
+            # Expired keys are dropped as new ones are saved, the index keeps this cheap
+            conn.execute('DELETE FROM idempotency_keys WHERE expires_at <= ?', (now,))
+            conn.execute(
+                'INSERT OR REPLACE INTO idempotency_keys (key, fingerprint, status, body, headers, expires_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, response.fingerprint, response.status, response.body, json.dumps(response.headers), now + self.ttl),
+            )
@@ -0,0 +1,165 @@
+import json
+import sqlite3
+import time
+import uuid
+from datetime import UTC, datetime
+from typing import Any
+
+from models import Channel, Incident, IncidentResponse, Submission, SubmissionStatus
+from repositories import SubmissionRepository
+from repositories.rest.incident import incident_response_from_json, incident_to_json
+
+from .base import SqliteBaseRepository
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    incident TEXT NOT NULL,
+    response TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    -- When the submission is next due: its retry time while queued, the end of its lease while sending
+    due_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS submissions_due ON submissions (status, due_at);
+CREATE INDEX IF NOT EXISTS submissions_settled ON submissions (status, updated_at);
+"""
+
+CLAIM = """
+UPDATE submissions
+SET status = 'sending', attempts = attempts + 1, due_at = :lease_until, updated_at = :now
+WHERE id = (
+    SELECT id FROM submissions
+    WHERE status IN ('queued', 'sending') AND due_at <= :now
+    ORDER BY due_at
+    LIMIT 1
+)
+RETURNING *
+"""
+
+
+def incident_from_json(json: dict[str, Any]) -> Incident:
+    return Incident(
+        client_id=json['client_id'],
+        name=json['name'],
+        channel=Channel(json['channel']),
+        reported_by=json['reported_by'],
+        created_by=json['created_by'],
+        description=json['description'],
+        assigned_to=json['assigned_to'],
+    )
+
+
+def incident_response_to_json(response: IncidentResponse) -> dict[str, Any]:
+    return {
+        'id': response.id,
+        'client_id': response.client_id,
+        'name': response.name,
+        'channel': response.channel,
+        'reported_by': response.reported_by,
+        'created_by': response.created_by,
+        'assigned_to': response.assigned_to,
+    }
+
+
+def submission_from_row(row: sqlite3.Row) -> Submission:
+    return Submission(
+        id=row['id'],
+        status=SubmissionStatus(row['status']),
+        incident=incident_from_json(json.loads(row['incident'])),
+        attempts=row['attempts'],
+        response=incident_response_from_json(json.loads(row['response'])) if row['response'] else None,
+        error=row['error'],
+        created_at=datetime.fromtimestamp(row['created_at'], UTC),
+        updated_at=datetime.fromtimestamp(row['updated_at'], UTC),
+    )
+
+
+# Submissions are kept in a SQLite database in WAL mode, so writers do not block readers and a submission survives
+# a restart of the process as soon as enqueue returns. Claims are atomic, so several processes can share the file.
+class SqliteSubmissionRepository(SubmissionRepository, SqliteBaseRepository):
+    schema = SCHEMA
+
+    def __init__(self, path: str) -> None:
+        SqliteBaseRepository.__init__(self, path)
+
+    def enqueue(self, incident: Incident) -> Submission:
+        now = time.time()
+        submission_id = str(uuid.uuid4())
+
+        with self._connection() as conn:
+            conn.execute(
+                'INSERT INTO submissions (id, status, incident, due_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (submission_id, SubmissionStatus.QUEUED.value, json.dumps(incident_to_json(incident)), now, now, now),
+            )
+
+        created_at = datetime.fromtimestamp(now, UTC)
+        return Submission(
+            id=submission_id,
+            status=SubmissionStatus.QUEUED,
+            incident=incident,
+            attempts=0,
+            response=None,
+            error=None,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+    def get(self, submission_id: str) -> Submission | None:
+        row = self._connection().execute('SELECT * FROM submissions WHERE id = ?', (submission_id,)).fetchone()
+        return submission_from_row(row) if row is not None else None
+
+    def claim(self, lease: float) -> Submission | None:
+        now = time.time()
+        with self._connection() as conn:
+            row = conn.execute(CLAIM, {'now': now, 'lease_until': now + lease}).fetchone()
+
+        return submission_from_row(row) if row is not None else None
+
+    def complete(self, submission_id: str, response: IncidentResponse) -> None:
+        self._update(
+            submission_id,
+            status=SubmissionStatus.REGISTERED.value,
+            response=json.dumps(incident_response_to_json(response)),
+            error=None,
+        )
+
+    def retry(self, submission_id: str, error: str, delay: float) -> None:
+        self._update(submission_id, status=SubmissionStatus.QUEUED.value, error=error, due_at=time.time() + delay)
+
+    def postpone(self, submission_id: str, error: str, delay: float) -> None:
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                'UPDATE submissions SET status = ?, error = ?, due_at = ?, attempts = MAX(attempts - 1, 0), updated_at = ? '
+                'WHERE id = ?',
+                (SubmissionStatus.QUEUED.value, error, now + delay, now, submission_id),
+            )
+
+    def fail(self, submission_id: str, error: str) -> None:
+        self._update(submission_id, status=SubmissionStatus.FAILED.value, error=error)
+
+    def count_by_status(self) -> dict[SubmissionStatus, int]:
+        rows = self._connection().execute('SELECT status, COUNT(*) FROM submissions GROUP BY status').fetchall()
+        counts: dict[SubmissionStatus, int] = dict.fromkeys(SubmissionStatus, 0)
+        for status, count in rows:
+            counts[SubmissionStatus(status)] = count
+        return counts
+
+    def purge(self, older_than: float) -> int:
+        with self._connection() as conn:
+            cursor = conn.execute(
+                'DELETE FROM submissions WHERE status IN (?, ?) AND updated_at < ?',
+                (SubmissionStatus.REGISTERED.value, SubmissionStatus.FAILED.value, time.time() - older_than),
+            )
+        return cursor.rowcount
+
+    def _update(self, submission_id: str, **values: object) -> None:
+        values['updated_at'] = time.time()
+        assignments = ', '.join(f'{column} = :{column}' for column in values)
+
+        with self._connection() as conn:
+            conn.execute(f'UPDATE submissions SET {assignments} WHERE id = :id', {**values, 'id': submission_id})  # noqa: S608
@@ -0,0 +1,33 @@
+from models import Incident, IncidentResponse, Submission, SubmissionStatus
+
+
+class SubmissionRepository:
+    def enqueue(self, incident: Incident) -> Submission:
+        raise NotImplementedError  # pragma: no cover
+
+    def get(self, submission_id: str) -> Submission | None:
+        raise NotImplementedError  # pragma: no cover
+
+    # Takes the oldest submission due for delivery, it is handed out again if not settled within lease seconds
+    def claim(self, lease: float) -> Submission | None:
+        raise NotImplementedError  # pragma: no cover
+
+    def complete(self, submission_id: str, response: IncidentResponse) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    def retry(self, submission_id: str, error: str, delay: float) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    # Like retry, for a claim that sent nothing: it does not count as an attempt
+    def postpone(self, submission_id: str, error: str, delay: float) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    def fail(self, submission_id: str, error: str) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    def count_by_status(self) -> dict[SubmissionStatus, int]:
+        raise NotImplementedError  # pragma: no cover
+
+    # Deletes registered and failed submissions last updated more than older_than seconds ago
+    def purge(self, older_than: float) -> int:
+        raise NotImplementedError  # pragma: no cover
@@ -5,5 +5,14 @@ class UserRepository:
     def get(self, user_id: str, client_id: str) -> User | None:
         raise NotImplementedError  # pragma: no cover
 
-    def find_by_email(self, email: str) -> User | None:
+    # When client_id is given, users that belong to other clients are not returned
+    def find_by_email(self, email: str, client_id: str | None = None) -> User | None:
+        raise NotImplementedError  # pragma: no cover
+
+
+class AsyncUserRepository:
+    async def get(self, user_id: str, client_id: str) -> User | None:
+        raise NotImplementedError  # pragma: no cover
+
+    async def find_by_email(self, email: str, client_id: str | None = None) -> User | None:
         raise NotImplementedError  # pragma: no cover
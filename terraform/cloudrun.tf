@@ -52,9 +52,16 @@ resource "google_cloud_run_v2_service" "default" {
         value = "https://client-${data.google_project.default.number}.${local.region}.run.app"
       }
 
+      # Opens downstream connections and fetches tokens before the instance is ready
+      env {
+        name = "WARMUP_ENABLED"
+        value = "1"
+      }
+
+      # Traffic is only sent once the warm-up finished
       startup_probe {
         http_get {
-          path = "/api/v1/health/${local.service_name}"
+          path = "/api/v1/health/${local.service_name}/ready"
         }
       }
 
@@ -0,0 +1,14 @@
+from aiohttp import web
+from aiohttp.test_utils import AioHTTPTestCase
+
+from app import create_async_app
+
+
+class TestHealth(AioHTTPTestCase):
+    async def get_application(self) -> web.Application:
+        return create_async_app()
+
+    async def test_health(self) -> None:
+        resp = await self.client.get('/api/v1/health/registroapp')
+
+        self.assertEqual(resp.status, 200)
@@ -0,0 +1,249 @@
+import base64
+import dataclasses
+import json
+from typing import Any, cast
+from unittest.mock import AsyncMock
+
+from aiohttp import web
+from aiohttp.test_utils import AioHTTPTestCase, TestClient
+from faker import Faker
+
+from aio import CONTAINER_KEY, AsyncContainer
+from app import create_async_app
+from models import Channel, Employee, IncidentResponse, Role, User
+from repositories import AsyncEmployeeRepository, AsyncIncidentRepository, AsyncUserRepository
+from tests.blueprints.util import gen_token
+from util.apigateway import auth_rejections
+
+
+class TestIncident(AioHTTPTestCase):
+    INCIDENT_API_USER_URL = '/api/v1/users/me/incidents'
+    INCIDENT_API_WEB_URL = '/api/v1/incidents/web'
+    INCIDENT_API_MOBILE_URL = '/api/v1/incidents/mobile'
+
+    client: TestClient[web.Request, web.Application]
+
+    async def get_application(self) -> web.Application:
+        self.faker = Faker()
+        return create_async_app()
+
+    def gen_token(self, role: Role, *, with_client: bool = True) -> dict[str, Any]:
+        client_id = cast(str, self.faker.uuid4()) if with_client else None
+        return gen_token(user_id=cast(str, self.faker.uuid4()), client_id=client_id, role=role, assigned=True)
+
+    @property
+    def container(self) -> AsyncContainer:
+        return self.app[CONTAINER_KEY]
+
+    async def call_api(self, url: str, token: dict[str, Any] | None, body: dict[str, Any] | None) -> tuple[int, Any]:
+        headers = {}
+        if token:
+            headers['X-Apigateway-Api-Userinfo'] = base64.urlsafe_b64encode(json.dumps(token).encode()).decode()
+
+        resp = await self.client.post(url, headers=headers, json=body)
+        return resp.status, await resp.json()
+
+    def gen_incident_response(self, token: dict[str, Any], name: str, channel: Channel, assigned_to: str) -> IncidentResponse:
+        return IncidentResponse(
+            id=cast(str, self.faker.uuid4()),
+            client_id=token['cid'],
+            name=name,
+            channel=channel.value,
+            reported_by=token['sub'],
+            created_by=token['sub'],
+            assigned_to=assigned_to,
+        )
+
+    async def test_user_incidents(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()), client_id=cast(str, self.faker.uuid4()), role=Role.USER, assigned=True
+        )
+
+        incident_repo_mock = AsyncMock(AsyncIncidentRepository)
+        with self.container.async_incident_repo.override(incident_repo_mock):
+            status, _ = await self.call_api(self.INCIDENT_API_USER_URL, token, None)
+
+        self.assertEqual(status, 201)
+        cast(AsyncMock, incident_repo_mock.create).assert_awaited_once()
+
+    async def test_user_incidents_no_client(self) -> None:
+        before = auth_rejections.counts()
+
+        status, data = await self.call_api(self.INCIDENT_API_USER_URL, self.gen_token(Role.USER, with_client=False), None)
+
+        self.assertEqual(status, 401)
+        self.assertEqual(data, {'code': 401, 'message': 'Unauthorized: You do not belong to any client.'})
+        self.assertEqual(auth_rejections.counts()['missing_client'], before['missing_client'] + 1)
+
+    async def test_web_incident_no_token(self) -> None:
+        status, data = await self.call_api(self.INCIDENT_API_WEB_URL, None, None)
+
+        self.assertEqual(status, 401)
+        self.assertEqual(data, {'code': 401, 'message': 'Token is missing'})
+
+    async def test_web_incident_token_missing_field(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()), client_id=cast(str, self.faker.uuid4()), role=Role.ADMIN, assigned=True
+        )
+        del token['aud']
+
+        status, data = await self.call_api(self.INCIDENT_API_WEB_URL, token, None)
+
+        self.assertEqual(status, 401)
+        self.assertEqual(data, {'code': 401, 'message': 'aud is missing in token'})
+
+    async def test_web_incident_invalid_role(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()), client_id=cast(str, self.faker.uuid4()), role=Role.USER, assigned=True
+        )
+
+        status, data = await self.call_api(self.INCIDENT_API_WEB_URL, token, {})
+
+        self.assertEqual(status, 403)
+        self.assertEqual(data, {'code': 403, 'message': 'Forbidden: You do not have access to this resource.'})
+
+    async def test_web_incident_no_client(self) -> None:
+        token = self.gen_token(Role.ADMIN, with_client=False)
+
+        status, data = await self.call_api(self.INCIDENT_API_WEB_URL, token, {})
+
+        self.assertEqual(status, 401)
+        self.assertEqual(data, {'code': 401, 'message': 'Unauthorized: You do not belong to any client.'})
+
+    async def test_web_incident_invalid_body(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()), client_id=cast(str, self.faker.uuid4()), role=Role.ADMIN, assigned=True
+        )
+
+        status, data = await self.call_api(self.INCIDENT_API_WEB_URL, token, {'name': 'test'})
+
+        self.assertEqual(status, 400)
+        self.assertEqual(data['code'], 400)
+
+    async def test_web_incident_not_json(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()), client_id=cast(str, self.faker.uuid4()), role=Role.ADMIN, assigned=True
+        )
+        headers = {'X-Apigateway-Api-Userinfo': base64.urlsafe_b64encode(json.dumps(token).encode()).decode()}
+
+        resp = await self.client.post(self.INCIDENT_API_WEB_URL, headers=headers, data='not json')
+
+        self.assertEqual(resp.status, 400)
+
+    async def test_web_incident_user_not_found(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()), client_id=cast(str, self.faker.uuid4()), role=Role.AGENT, assigned=True
+        )
+        body = {'email': self.faker.email(), 'name': self.faker.word(), 'description': self.faker.sentence()}
+
+        user_repo_mock = AsyncMock(AsyncUserRepository)
+        cast(AsyncMock, user_repo_mock.find_by_email).return_value = None
+
+        with (
+            self.container.async_user_repo.override(user_repo_mock),
+            self.container.async_incident_repo.override(AsyncMock(AsyncIncidentRepository)),
+        ):
+            status, data = await self.call_api(self.INCIDENT_API_WEB_URL, token, body)
+
+        self.assertEqual(status, 404)
+        self.assertEqual(data['message'], 'Invalid value for email: User does not exist.')
+
+    async def test_web_incident_success(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()), client_id=cast(str, self.faker.uuid4()), role=Role.ADMIN, assigned=True
+        )
+        user = User(id=cast(str, self.faker.uuid4()), client_id=token['cid'], name=self.faker.name(), email=self.faker.email())
+        body = {'email': user.email, 'name': self.faker.word(), 'description': self.faker.sentence()}
+
+        user_repo_mock = AsyncMock(AsyncUserRepository)
+        incident_repo_mock = AsyncMock(AsyncIncidentRepository)
+        cast(AsyncMock, user_repo_mock.find_by_email).return_value = user
+        incident_response = dataclasses.replace(
+            self.gen_incident_response(token, body['name'], Channel.WEB, token['sub']), reported_by=user.id
+        )
+        cast(AsyncMock, incident_repo_mock.create).return_value = incident_response
+
+        with (
+            self.container.async_user_repo.override(user_repo_mock),
+            self.container.async_incident_repo.override(incident_repo_mock),
+        ):
+            status, data = await self.call_api(self.INCIDENT_API_WEB_URL, token, body)
+
+        self.assertEqual(status, 201)
+        self.assertEqual(data['name'], body['name'])
+        self.assertEqual(data['channel'], Channel.WEB.value)
+        self.assertEqual(data['reported_by'], user.id)
+        cast(AsyncMock, incident_repo_mock.prepare).assert_awaited_once()
+
+    async def test_mobile_incident_invalid_role(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()), client_id=cast(str, self.faker.uuid4()), role=Role.AGENT, assigned=True
+        )
+
+        status, data = await self.call_api(self.INCIDENT_API_MOBILE_URL, token, {})
+
+        self.assertEqual(status, 403)
+        self.assertEqual(data, {'code': 403, 'message': 'Forbidden: You do not have access to this resource.'})
+
+    async def test_mobile_incident_no_client(self) -> None:
+        status, data = await self.call_api(self.INCIDENT_API_MOBILE_URL, self.gen_token(Role.USER, with_client=False), {})
+
+        self.assertEqual(status, 401)
+        self.assertEqual(data, {'code': 401, 'message': 'Unauthorized: You do not belong to any client.'})
+
+    async def test_mobile_incident_invalid_body(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()), client_id=cast(str, self.faker.uuid4()), role=Role.USER, assigned=True
+        )
+
+        status, data = await self.call_api(self.INCIDENT_API_MOBILE_URL, token, {'name': 'test'})
+
+        self.assertEqual(status, 400)
+        self.assertEqual(data['code'], 400)
+
+    async def test_mobile_incident_no_agent_available(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()), client_id=cast(str, self.faker.uuid4()), role=Role.USER, assigned=True
+        )
+        body = {'name': self.faker.word(), 'description': self.faker.sentence()}
+
+        employee_repo_mock = AsyncMock(AsyncEmployeeRepository)
+        cast(AsyncMock, employee_repo_mock.get_random_agent).return_value = None
+
+        with self.container.async_employee_repo.override(employee_repo_mock):
+            status, data = await self.call_api(self.INCIDENT_API_MOBILE_URL, token, body)
+
+        self.assertEqual(status, 404)
+        self.assertEqual(data['message'], 'No agents available to assign the incident.')
+
+    async def test_mobile_incident_success(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()), client_id=cast(str, self.faker.uuid4()), role=Role.USER, assigned=True
+        )
+        body = {'name': self.faker.word(), 'description': self.faker.sentence()}
+        employee = Employee(
+            id=cast(str, self.faker.uuid4()),
+            client_id=token['cid'],
+            name=self.faker.name(),
+            email=self.faker.email(),
+            role=Role.AGENT,
+            invitation_status='accepted',
+            invitation_date=self.faker.past_datetime(),
+        )
+
+        employee_repo_mock = AsyncMock(AsyncEmployeeRepository)
+        incident_repo_mock = AsyncMock(AsyncIncidentRepository)
+        cast(AsyncMock, employee_repo_mock.get_random_agent).return_value = employee
+        cast(AsyncMock, incident_repo_mock.create).return_value = self.gen_incident_response(
+            token, body['name'], Channel.MOBILE, employee.id
+        )
+
+        with (
+            self.container.async_employee_repo.override(employee_repo_mock),
+            self.container.async_incident_repo.override(incident_repo_mock),
+        ):
+            status, data = await self.call_api(self.INCIDENT_API_MOBILE_URL, token, body)
+
+        self.assertEqual(status, 201)
+        self.assertEqual(data['channel'], Channel.MOBILE.value)
+        self.assertEqual(data['assigned_to'], employee.id)
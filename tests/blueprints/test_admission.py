@@ -0,0 +1,66 @@
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from app import create_app
+from util.admission import AdaptiveLimiter
+
+
+class TestAdmission(ParametrizedTestCase):
+    INCIDENT_API_MOBILE_URL = '/api/v1/incidents/mobile'
+
+    def setUp(self) -> None:
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.limiter = AdaptiveLimiter(initial_limit=2, min_limit=2, max_limit=2)
+        self.app.container.admission_limiter.override(self.limiter)
+        self.addCleanup(self.app.container.reset_override)
+
+    def test_admitted_and_released(self) -> None:
+        # Unauthenticated, but it still goes through admission control
+        resp = self.client.post(self.INCIDENT_API_MOBILE_URL, json={})
+
+        self.assertEqual(resp.status_code, 401)
+        stats = self.limiter.stats()
+        self.assertEqual((stats.in_flight, stats.admitted, stats.rejected), (0, 1, 0))
+
+    def test_rejected_when_limit_reached(self) -> None:
+        self.limiter.try_acquire()
+        self.limiter.try_acquire()
+
+        resp = self.client.post(self.INCIDENT_API_MOBILE_URL, json={})
+
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp.headers['Retry-After'], '1')
+        self.assertEqual(resp.get_json(), {'code': 503, 'message': 'Service overloaded, try again later.'})
+        self.assertEqual(self.limiter.stats().rejected, 1)
+
+    def test_health_exempt(self) -> None:
+        self.limiter.try_acquire()
+        self.limiter.try_acquire()
+
+        resp = self.client.get('/api/v1/health/registroapp')
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.limiter.stats().rejected, 0)
+
+    @parametrize(
+        ('url', 'content_type'),
+        [
+            ('/api/v1/incidents/web/bulk', 'application/json'),
+            ('/api/v1/incidents/web/import', 'application/x-ndjson'),
+        ],
+    )
+    def test_long_requests_exempt(self, url: str, content_type: str) -> None:
+        self.limiter.try_acquire()
+        self.limiter.try_acquire()
+
+        resp = self.client.post(url, data=b'{}', content_type=content_type)
+
+        self.assertEqual(resp.status_code, 401)
+        self.assertEqual(self.limiter.stats().rejected, 0)
+
+    def test_disabled(self) -> None:
+        with self.app.container.admission_limiter.override(None):
+            resp = self.client.post(self.INCIDENT_API_MOBILE_URL, json={})
+
+        self.assertEqual(resp.status_code, 401)
+        self.assertEqual(self.limiter.stats().admitted, 0)
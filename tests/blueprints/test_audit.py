@@ -0,0 +1,121 @@
+import base64
+import json
+from typing import Any, cast
+from unittest.mock import Mock
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from app import create_app
+from models import AuditRecord, Channel, Employee, Incident, IncidentResponse, Role, User
+from repositories import EmployeeRepository, IncidentRepository, UserRepository
+from util.audit import AuditFileWriter
+from workers import AuditLog
+
+from .util import gen_token
+
+
+class TestAudit(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.client_id = cast(str, self.faker.uuid4())
+
+        self.audit_log = AuditLog(Mock(AuditFileWriter))
+        self.user_repo = Mock(UserRepository)
+        self.employee_repo = Mock(EmployeeRepository)
+        self.agent = Employee(
+            id=cast(str, self.faker.uuid4()),
+            client_id=self.client_id,
+            name=self.faker.name(),
+            email=self.faker.email(),
+            role=Role.AGENT,
+            invitation_status='accepted',
+            invitation_date=self.faker.past_datetime(),
+        )
+        cast(Mock, self.employee_repo.get_random_agent).return_value = self.agent
+        self.incident_repo = Mock(IncidentRepository)
+        cast(Mock, self.incident_repo.create).side_effect = self.create_incident
+
+        self.app.container.audit_log.override(self.audit_log)
+        self.app.container.user_repo.override(self.user_repo)
+        self.app.container.employee_repo.override(self.employee_repo)
+        self.app.container.incident_repo.override(self.incident_repo)
+        self.addCleanup(self.app.container.reset_override)
+
+    def create_incident(self, incident: Incident) -> IncidentResponse:
+        return IncidentResponse(
+            id=cast(str, self.faker.uuid4()),
+            client_id=incident.client_id,
+            name=incident.name,
+            channel=incident.channel.value,
+            reported_by=incident.reported_by,
+            created_by=incident.created_by,
+            assigned_to=incident.assigned_to,
+        )
+
+    def post(self, url: str, token: dict[str, Any], body: dict[str, Any]) -> int:
+        token_encoded = base64.urlsafe_b64encode(json.dumps(token).encode()).decode()
+        return self.client.post(url, headers={'X-Apigateway-Api-Userinfo': token_encoded}, json=body).status_code
+
+    def recorded(self) -> list[AuditRecord]:
+        self.audit_log.flush()
+        return [record for call in cast(Mock, self.audit_log.writer.write).call_args_list for record in call.args[0]]
+
+    def test_mobile_registration(self) -> None:
+        token = gen_token(user_id=cast(str, self.faker.uuid4()), client_id=self.client_id, role=Role.USER, assigned=True)
+
+        status = self.post('/api/v1/incidents/mobile', token, {'name': self.faker.word(), 'description': self.faker.word()})
+
+        self.assertEqual(status, 201)
+        [record] = self.recorded()
+        self.assertEqual(record.channel, Channel.MOBILE)
+        self.assertEqual((record.client_id, record.user_id), (self.client_id, token['sub']))
+        self.assertEqual((record.assigned_to, record.status), (self.agent.id, 201))
+        self.assertGreater(record.latency, 0)
+
+    def test_web_registration_failed(self) -> None:
+        token = gen_token(user_id=cast(str, self.faker.uuid4()), client_id=self.client_id, role=Role.AGENT, assigned=True)
+        cast(Mock, self.user_repo.find_by_email).return_value = None
+        body = {'email': self.faker.email(), 'name': self.faker.word(), 'description': self.faker.word()}
+
+        status = self.post('/api/v1/incidents/web', token, body)
+
+        self.assertEqual(status, 404)
+        [record] = self.recorded()
+        self.assertEqual(
+            (record.channel, record.user_id, record.assigned_to, record.status), (Channel.WEB, token['sub'], None, 404)
+        )
+
+    def test_web_registration(self) -> None:
+        token = gen_token(user_id=cast(str, self.faker.uuid4()), client_id=self.client_id, role=Role.ADMIN, assigned=True)
+        user = User(
+            id=cast(str, self.faker.uuid4()), client_id=self.client_id, name=self.faker.name(), email=self.faker.email()
+        )
+        cast(Mock, self.user_repo.find_by_email).return_value = user
+        body = {'email': user.email, 'name': self.faker.word(), 'description': self.faker.word()}
+
+        self.post('/api/v1/incidents/web', token, body)
+
+        [record] = self.recorded()
+        self.assertEqual((record.assigned_to, record.status), (token['sub'], 201))
+
+    def test_rejected_not_recorded(self) -> None:
+        token = gen_token(user_id=cast(str, self.faker.uuid4()), client_id=self.client_id, role=Role.AGENT, assigned=True)
+
+        status = self.post('/api/v1/incidents/mobile', token, {})
+
+        self.assertEqual(status, 403)
+        self.assertEqual(self.recorded(), [])
+
+    def test_disabled(self) -> None:
+        token = gen_token(user_id=cast(str, self.faker.uuid4()), client_id=self.client_id, role=Role.USER, assigned=True)
+
+        with self.app.container.audit_log.override(None):
+            status = self.post(
+                '/api/v1/incidents/mobile', token, {'name': self.faker.word(), 'description': self.faker.word()}
+            )
+
+        self.assertEqual(status, 201)
+        self.assertEqual(self.recorded(), [])
@@ -1,14 +1,165 @@
-from unittest import TestCase
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from typing import Any, cast
+from unittest import mock
+
+from unittest_parametrize import ParametrizedTestCase, parametrize
 
 from app import create_app
+from repositories.rest import PoolStats
+from repositories.rest.base import RestBaseRepository
+from tests.repositories.rest.test_session import KeepAliveHandler
+from workers import HealthMonitor, Warmup
 
 
-class TestHealth(TestCase):
+class TestHealth(ParametrizedTestCase):
     def setUp(self) -> None:
-        app = create_app()
-        self.client = app.test_client()
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.addCleanup(self.app.container.reset_override)
 
     def test_health(self) -> None:
         resp = self.client.get('/api/v1/health/registroapp')
 
         self.assertEqual(resp.status_code, 200)
+
+    def test_ready_without_warmup(self) -> None:
+        resp = self.client.get('/api/v1/health/registroapp/ready')
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json(), {'status': 'Ready'})
+
+    def test_ready_after_warmup(self) -> None:
+        warmup = Warmup()
+        release = threading.Event()
+        warmup.add('slow', release.wait)
+        self.app.container.warmup.override(warmup)
+
+        warmup.start()
+        warming = self.client.get('/api/v1/health/registroapp/ready')
+        release.set()
+        warmup.wait(5)
+        ready = self.client.get('/api/v1/health/registroapp/ready')
+
+        self.assertEqual(warming.status_code, 503)
+        body = cast(dict[str, Any], warming.get_json())
+        self.assertEqual(body['status'], 'Warming')
+        self.assertEqual(body['tasks'], {'slow': {'status': 'pending', 'duration': None, 'error': None}})
+        self.assertEqual(ready.status_code, 200)
+        body = cast(dict[str, Any], ready.get_json())
+        self.assertEqual(body['status'], 'Ready')
+        self.assertEqual(body['tasks']['slow']['status'], 'done')
+
+    def test_warmup_at_startup(self) -> None:
+        server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        env = {
+            'WARMUP_ENABLED': '1',
+            'WARMUP_CONNECTIONS': '2',
+            'USER_SVC_URL': f'http://127.0.0.1:{server.server_address[1]}',
+        }
+
+        with mock.patch.dict(os.environ, env):
+            app = create_app()
+        warmup = cast(Warmup, app.container.warmup())
+        warmup.wait(5)
+
+        tasks = {task.name: task.status for task in warmup.status().tasks}
+        self.assertEqual(tasks, {'user.connections': 'done', 'schemas': 'done'})
+        # Requests to the user service use the connections opened by the warm-up
+        repo = cast(RestBaseRepository, app.container.rest_user_repo())
+        repo.authenticated_get('/ping')
+        self.assertEqual(repo.pool_stats(), PoolStats(hits=1, misses=0))
+        self.assertEqual(app.test_client().get('/api/v1/health/registroapp/ready').status_code, 200)
+
+    def test_dependencies_without_monitor(self) -> None:
+        resp = self.client.get('/api/v1/health/registroapp/dependencies')
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json(), {'status': 'Ok', 'dependencies': {}})
+
+    def test_dependencies_healthy(self) -> None:
+        monitor = HealthMonitor()
+        monitor.add('user', lambda: None)
+        monitor.add('client', lambda: None)
+        monitor.refresh()
+        self.app.container.health_monitor.override(monitor)
+
+        resp = self.client.get('/api/v1/health/registroapp/dependencies')
+
+        self.assertEqual(resp.status_code, 200)
+        body = cast(dict[str, Any], resp.get_json())
+        self.assertEqual(body['status'], 'Ok')
+        self.assertEqual(set(body['dependencies']), {'user', 'client'})
+        user = body['dependencies']['user']
+        self.assertEqual((user['status'], user['stale'], user['error']), ('up', False, None))
+        self.assertGreaterEqual(user['latency'], 0)
+        self.assertGreaterEqual(user['age'], 0)
+
+    def test_dependency_down(self) -> None:
+        monitor = HealthMonitor()
+        monitor.add('user', lambda: None)
+
+        def fail() -> None:
+            raise RuntimeError('unavailable')
+
+        monitor.add('incidentmodify', fail)
+        with self.assertLogs('HealthMonitor', 'WARNING'):
+            monitor.refresh()
+        self.app.container.health_monitor.override(monitor)
+
+        resp = self.client.get('/api/v1/health/registroapp/dependencies')
+
+        self.assertEqual(resp.status_code, 503)
+        body = cast(dict[str, Any], resp.get_json())
+        self.assertEqual(body['status'], 'Unhealthy')
+        self.assertEqual(body['dependencies']['user']['status'], 'up')
+        self.assertEqual(body['dependencies']['incidentmodify']['status'], 'down')
+        self.assertEqual(body['dependencies']['incidentmodify']['error'], 'unavailable')
+
+    @parametrize(
+        ('refreshed', 'status'),
+        [
+            # Never probed
+            (False, 'unknown'),
+            # Probed longer than max_age ago
+            (True, 'up'),
+        ],
+    )
+    def test_dependency_not_current(self, status: str, *, refreshed: bool) -> None:
+        monitor = HealthMonitor(max_age=-1)
+        monitor.add('user', lambda: None)
+        if refreshed:
+            monitor.refresh()
+        self.app.container.health_monitor.override(monitor)
+
+        resp = self.client.get('/api/v1/health/registroapp/dependencies')
+
+        self.assertEqual(resp.status_code, 503)
+        dependency = cast(dict[str, Any], resp.get_json())['dependencies']['user']
+        self.assertEqual(dependency['status'], status)
+        self.assertEqual(dependency.get('stale', True), True)
+
+    def test_probes_at_startup(self) -> None:
+        server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        env = {'HEALTH_PROBES_ENABLED': '1', 'USER_SVC_URL': f'http://127.0.0.1:{server.server_address[1]}'}
+
+        with mock.patch.dict(os.environ, env):
+            app = create_app()
+        monitor = cast(HealthMonitor, app.container.health_monitor())
+        self.addCleanup(monitor.stop)
+        deadline = time.monotonic() + 5
+        while 'user' not in monitor.results() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # Only the configured services are probed
+        self.assertEqual(monitor.dependencies, ['user'])
+        resp = app.test_client().get('/api/v1/health/registroapp/dependencies')
+        self.assertEqual(resp.status_code, 200)
@@ -0,0 +1,191 @@
+import base64
+import json
+import threading
+import time
+from typing import Any, cast
+from unittest.mock import Mock
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase, parametrize
+from werkzeug.test import TestResponse
+
+from app import create_app
+from models import Channel, Employee, Incident, IncidentResponse, Role
+from repositories import EmployeeRepository, IncidentRepository
+from repositories.memory import MemoryIdempotencyRepository
+
+from .util import gen_token
+
+
+class TestIdempotency(ParametrizedTestCase):
+    INCIDENT_API_MOBILE_URL = '/api/v1/incidents/mobile'
+
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.USER,
+            assigned=True,
+        )
+        self.body = {'name': self.faker.word(), 'description': self.faker.sentence()}
+
+        self.employee_repo = Mock(EmployeeRepository)
+        cast(Mock, self.employee_repo.get_random_agent).return_value = Employee(
+            id=cast(str, self.faker.uuid4()),
+            client_id=self.token['cid'],
+            name=self.faker.name(),
+            email=self.faker.email(),
+            role=Role.AGENT,
+            invitation_status='accepted',
+            invitation_date=self.faker.past_datetime(),
+        )
+        self.incident_repo = Mock(IncidentRepository)
+        cast(Mock, self.incident_repo.create).side_effect = self.create_incident
+
+        self.app.container.employee_repo.override(self.employee_repo)
+        self.app.container.incident_repo.override(self.incident_repo)
+        self.app.container.idempotency_repo.override(MemoryIdempotencyRepository())
+        self.addCleanup(self.app.container.reset_override)
+
+    def create_incident(self, incident: Incident) -> IncidentResponse:
+        return IncidentResponse(
+            id=cast(str, self.faker.uuid4()),
+            client_id=incident.client_id,
+            name=incident.name,
+            channel=Channel.MOBILE,
+            reported_by=incident.reported_by,
+            created_by=incident.created_by,
+            assigned_to=incident.assigned_to,
+        )
+
+    def call_api(
+        self, key: str | None, body: dict[str, Any] | None = None, token: dict[str, Any] | None = None
+    ) -> TestResponse:
+        headers = {
+            'X-Apigateway-Api-Userinfo': base64.urlsafe_b64encode(json.dumps(token or self.token).encode()).decode(),
+        }
+        if key is not None:
+            headers['Idempotency-Key'] = key
+
+        return self.client.post(self.INCIDENT_API_MOBILE_URL, headers=headers, json=body or self.body)
+
+    def test_repeated_key_replays_response(self) -> None:
+        key = cast(str, self.faker.uuid4())
+
+        first = self.call_api(key)
+        second = self.call_api(key)
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.get_json(), first.get_json())
+        self.assertEqual(second.content_type, 'application/json')
+        self.assertNotIn('Idempotent-Replayed', first.headers)
+        self.assertEqual(second.headers['Idempotent-Replayed'], 'true')
+        self.assertEqual(cast(Mock, self.incident_repo.create).call_count, 1)
+        self.assertEqual(cast(Mock, self.employee_repo.get_random_agent).call_count, 1)
+
+    def test_without_key(self) -> None:
+        self.call_api(None)
+        self.call_api(None)
+
+        self.assertEqual(cast(Mock, self.incident_repo.create).call_count, 2)
+
+    def test_different_keys(self) -> None:
+        self.call_api(cast(str, self.faker.uuid4()))
+        self.call_api(cast(str, self.faker.uuid4()))
+
+        self.assertEqual(cast(Mock, self.incident_repo.create).call_count, 2)
+
+    def test_key_scoped_to_user(self) -> None:
+        key = cast(str, self.faker.uuid4())
+        other_token = {**self.token, 'sub': cast(str, self.faker.uuid4())}
+
+        self.call_api(key)
+        resp = self.call_api(key, token=other_token)
+
+        self.assertEqual(resp.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', resp.headers)
+        self.assertEqual(cast(Mock, self.incident_repo.create).call_count, 2)
+
+    def test_key_reused_for_different_request(self) -> None:
+        key = cast(str, self.faker.uuid4())
+
+        self.call_api(key)
+        resp = self.call_api(key, body={'name': self.faker.word(), 'description': self.faker.sentence()})
+
+        self.assertEqual(resp.status_code, 422)
+        self.assertEqual(cast(Mock, self.incident_repo.create).call_count, 1)
+
+    @parametrize(
+        ('key',),
+        [
+            ('',),
+            ('k' * 256,),
+        ],
+    )
+    def test_invalid_key(self, key: str) -> None:
+        resp = self.call_api(key)
+
+        self.assertEqual(resp.status_code, 400)
+        cast(Mock, self.incident_repo.create).assert_not_called()
+
+    def test_client_errors_replayed(self) -> None:
+        key = cast(str, self.faker.uuid4())
+        cast(Mock, self.employee_repo.get_random_agent).return_value = None
+
+        first = self.call_api(key)
+        second = self.call_api(key)
+
+        self.assertEqual(first.status_code, 404)
+        self.assertEqual(second.status_code, 404)
+        self.assertEqual(cast(Mock, self.employee_repo.get_random_agent).call_count, 1)
+
+    def test_server_errors_not_stored(self) -> None:
+        key = cast(str, self.faker.uuid4())
+        cast(Mock, self.incident_repo.create).side_effect = RuntimeError('incident service down')
+        self.app.config['PROPAGATE_EXCEPTIONS'] = False
+
+        # The first request fails with a 500, so it is run again when retried
+        with self.assertLogs(self.app.logger, 'ERROR'):
+            first = self.call_api(key)
+        cast(Mock, self.incident_repo.create).side_effect = self.create_incident
+        second = self.call_api(key)
+
+        self.assertEqual(first.status_code, 500)
+        self.assertEqual(second.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', second.headers)
+
+    def test_concurrent_requests_wait_for_first(self) -> None:
+        key = cast(str, self.faker.uuid4())
+        started = threading.Event()
+
+        def slow_create(incident: Incident) -> IncidentResponse:
+            started.set()
+            time.sleep(0.2)
+            return self.create_incident(incident)
+
+        cast(Mock, self.incident_repo.create).side_effect = slow_create
+
+        responses: list[TestResponse] = []
+        first = threading.Thread(target=lambda: responses.append(self.call_api(key)))
+        first.start()
+        started.wait()
+        second = self.call_api(key)
+        first.join()
+
+        self.assertEqual(cast(Mock, self.incident_repo.create).call_count, 1)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.get_json(), responses[0].get_json())
+        self.assertEqual(second.headers['Idempotent-Replayed'], 'true')
+
+    def test_disabled(self) -> None:
+        key = cast(str, self.faker.uuid4())
+
+        with self.app.container.idempotency_repo.override(None):
+            self.call_api(key)
+            self.call_api(key)
+
+        self.assertEqual(cast(Mock, self.incident_repo.create).call_count, 2)
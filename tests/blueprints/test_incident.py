@@ -1,6 +1,11 @@
 import base64
 import json
+import tempfile
+import threading
+import time
+from pathlib import Path
 from typing import Any, cast
+from unittest import mock
 from unittest.mock import Mock
 
 from faker import Faker
@@ -8,8 +13,12 @@ from unittest_parametrize import ParametrizedTestCase, parametrize
 from werkzeug.test import TestResponse
 
 from app import create_app
-from models import Channel, Employee, IncidentResponse, Role, User
+from models import Channel, Employee, Incident, IncidentResponse, Role, Submission, User
 from repositories import EmployeeRepository, IncidentRepository, UserRepository
+from repositories.sqlite import SqliteSubmissionRepository
+from util import FanOut
+from util.breaker import CircuitOpenError
+from util.spool import UploadSpool
 
 from .util import gen_token
 
@@ -18,6 +27,8 @@ class TestIncident(ParametrizedTestCase):
     INCIDENT_API_USER_URL = '/api/v1/users/me/incidents'
     INCIDENT_API_WEB_URL = '/api/v1/incidents/web'
     INCIDENT_API_MOBILE_URL = '/api/v1/incidents/mobile'
+    INCIDENT_API_BULK_URL = '/api/v1/incidents/web/bulk'
+    INCIDENT_API_IMPORT_URL = '/api/v1/incidents/web/import'
 
     def setUp(self) -> None:
         self.faker = Faker()
@@ -47,6 +58,42 @@ class TestIncident(ParametrizedTestCase):
 
         return self.client.post(self.INCIDENT_API_MOBILE_URL, headers=headers, json=body)
 
+    def call_bulk_incident_api(self, token: dict[str, str] | None, body: object) -> TestResponse:
+        headers = {}
+        if token:
+            token_encoded = base64.urlsafe_b64encode(json.dumps(token).encode()).decode()
+            headers['X-Apigateway-Api-Userinfo'] = token_encoded
+
+        return self.client.post(self.INCIDENT_API_BULK_URL, headers=headers, json=body)
+
+    def call_import_incident_api(
+        self, token: dict[str, str], body: bytes, content_type: str = 'application/x-ndjson'
+    ) -> list[dict[str, Any]]:
+        token_encoded = base64.urlsafe_b64encode(json.dumps(token).encode()).decode()
+        # Closed like a WSGI server closes the response once it is sent
+        with self.client.post(
+            self.INCIDENT_API_IMPORT_URL,
+            headers={'X-Apigateway-Api-Userinfo': token_encoded},
+            data=body,
+            content_type=content_type,
+        ) as resp:
+            if resp.status_code != 200:  # noqa: PLR2004
+                return [cast(dict[str, Any], resp.get_json())]
+
+            self.assertEqual(resp.mimetype, 'application/x-ndjson')
+            return [json.loads(line) for line in resp.get_data().splitlines()]
+
+    def gen_incident_response(self, incident: Incident) -> IncidentResponse:
+        return IncidentResponse(
+            id=cast(str, self.faker.uuid4()),
+            client_id=incident.client_id,
+            name=incident.name,
+            channel=incident.channel.value,
+            reported_by=incident.reported_by,
+            created_by=incident.created_by,
+            assigned_to=incident.assigned_to,
+        )
+
     def test_user_incidents_no_token(self) -> None:
         resp = self.call_incident_api_user(None)
 
@@ -245,6 +292,73 @@ class TestIncident(ParametrizedTestCase):
         self.assertEqual(resp_data['reported_by'], user.id)
         self.assertEqual(resp_data['created_by'], token['sub'])
 
+    @parametrize(
+        ('endpoints', 'parallel'),
+        [
+            (['WebRegistrationIncident'], True),
+            ([], False),
+        ],
+    )
+    def test_web_incident_fanout_latency(self, endpoints: list[str], *, parallel: bool) -> None:
+        delay = 0.2
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.AGENT,
+            assigned=True,
+        )
+        user = User(
+            id=cast(str, self.faker.uuid4()),
+            client_id=token['cid'],
+            name=self.faker.name(),
+            email=self.faker.email(),
+        )
+        body = {
+            'email': user.email,
+            'name': self.faker.word(),
+            'description': self.faker.sentence(),
+        }
+
+        def slow_find_by_email(email: str, client_id: str | None = None) -> User:  # noqa: ARG001
+            time.sleep(delay)
+            return user
+
+        def slow_prepare() -> None:
+            time.sleep(delay)
+
+        user_repo_mock = Mock(UserRepository)
+        incident_repo_mock = Mock(IncidentRepository)
+        cast(Mock, user_repo_mock.find_by_email).side_effect = slow_find_by_email
+        cast(Mock, incident_repo_mock.prepare).side_effect = slow_prepare
+        cast(Mock, incident_repo_mock.create).return_value = IncidentResponse(
+            id=cast(str, self.faker.uuid4()),
+            client_id=token['cid'],
+            name=body['name'],
+            channel=Channel.WEB.value,
+            reported_by=user.id,
+            created_by=token['sub'],
+            assigned_to=token['sub'],
+        )
+
+        fanout = FanOut(max_workers=4, endpoints=endpoints)
+        self.addCleanup(fanout.shutdown)
+
+        with (
+            self.app.container.user_repo.override(user_repo_mock),
+            self.app.container.incident_repo.override(incident_repo_mock),
+            self.app.container.fanout.override(fanout),
+        ):
+            start = time.perf_counter()
+            resp = self.call_web_incident_api(token, body)
+            elapsed = time.perf_counter() - start
+
+        self.assertEqual(resp.status_code, 201)
+        if parallel:
+            # Latency of the slowest call rather than the sum of both
+            self.assertLess(elapsed, 2 * delay)
+        else:
+            self.assertGreaterEqual(elapsed, 2 * delay)
+
     def test_mobile_incident_no_token(self) -> None:
         resp = self.call_mobile_incident_api(None, None)
         self.assertEqual(resp.status_code, 401)
@@ -357,3 +471,470 @@ class TestIncident(ParametrizedTestCase):
         self.assertEqual(resp_data['reported_by'], token['sub'])
         self.assertEqual(resp_data['created_by'], token['sub'])
         self.assertEqual(resp_data['assigned_to'], employee.id)
+
+    @parametrize(
+        ('body', 'message'),
+        [
+            ({'email': 'a@example.com'}, 'Request body must be a non-empty JSON array of incidents.'),
+            ([], 'Request body must be a non-empty JSON array of incidents.'),
+            ([{}] * 101, 'Request body must not contain more than 100 incidents.'),
+        ],
+    )
+    def test_bulk_incident_invalid_body(self, body: object, message: str) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.AGENT,
+            assigned=True,
+        )
+
+        resp = self.call_bulk_incident_api(token, body)
+
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(json.loads(resp.get_data()), {'code': 400, 'message': message})
+
+    def test_bulk_incident_forbidden(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.USER,
+            assigned=True,
+        )
+
+        resp = self.call_bulk_incident_api(token, [])
+
+        self.assertEqual(resp.status_code, 403)
+
+    def test_bulk_incident_success(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.AGENT,
+            assigned=True,
+        )
+        user = User(
+            id=cast(str, self.faker.uuid4()),
+            client_id=token['cid'],
+            name=self.faker.name(),
+            email=self.faker.email(),
+        )
+        body = [{'email': user.email, 'name': self.faker.word(), 'description': self.faker.sentence()} for _ in range(3)]
+
+        user_repo_mock = Mock(UserRepository)
+        incident_repo_mock = Mock(IncidentRepository)
+        cast(Mock, user_repo_mock.find_by_email).return_value = user
+        cast(Mock, incident_repo_mock.create).side_effect = self.gen_incident_response
+
+        with (
+            self.app.container.user_repo.override(user_repo_mock),
+            self.app.container.incident_repo.override(incident_repo_mock),
+        ):
+            resp = self.call_bulk_incident_api(token, body)
+
+        self.assertEqual(resp.status_code, 201)
+        results = json.loads(resp.get_data())['results']
+        self.assertEqual([result['index'] for result in results], [0, 1, 2])
+        self.assertEqual([result['incident']['name'] for result in results], [item['name'] for item in body])
+        self.assertTrue(all(result['incident']['reported_by'] == user.id for result in results))
+        # The same email is looked up only once
+        cast(Mock, user_repo_mock.find_by_email).assert_called_once_with(user.email, token['cid'])
+
+    def test_bulk_incident_partial_failure(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.ADMIN,
+            assigned=True,
+        )
+        user = User(
+            id=cast(str, self.faker.uuid4()),
+            client_id=token['cid'],
+            name=self.faker.name(),
+            email=self.faker.email(),
+        )
+        failing_name = self.faker.pystr()
+        body = [
+            {'email': user.email, 'name': self.faker.word(), 'description': self.faker.sentence()},
+            {'email': user.email, 'name': self.faker.word()},
+            self.faker.word(),
+            {'email': self.faker.email(), 'name': self.faker.word(), 'description': self.faker.sentence()},
+            {'email': user.email, 'name': failing_name, 'description': self.faker.sentence()},
+        ]
+
+        def create(incident: Incident) -> IncidentResponse:
+            if incident.name == failing_name:
+                raise RuntimeError('incident service unavailable')
+            return self.gen_incident_response(incident)
+
+        user_repo_mock = Mock(UserRepository)
+        incident_repo_mock = Mock(IncidentRepository)
+        cast(Mock, user_repo_mock.find_by_email).side_effect = lambda email, _: user if email == user.email else None
+        cast(Mock, incident_repo_mock.create).side_effect = create
+
+        with (
+            self.app.container.user_repo.override(user_repo_mock),
+            self.app.container.incident_repo.override(incident_repo_mock),
+            self.assertLogs('BulkWebRegistrationIncident', 'ERROR'),
+        ):
+            resp = self.call_bulk_incident_api(token, body)
+
+        self.assertEqual(resp.status_code, 207)
+        results = json.loads(resp.get_data())['results']
+        self.assertEqual([result['code'] for result in results], [201, 400, 400, 404, 502])
+        self.assertEqual(results[0]['incident']['name'], body[0]['name'])  # type: ignore[index]
+        self.assertEqual(results[1]['message'], 'Invalid value for description: Missing data for required field.')
+        self.assertEqual(results[2]['message'], 'Request body must be a JSON object.')
+        self.assertEqual(results[3]['message'], 'Invalid value for email: User does not exist.')
+        self.assertEqual(results[4]['message'], 'Unable to register the incident.')
+        self.assertEqual(cast(Mock, user_repo_mock.find_by_email).call_count, 2)
+        self.assertEqual(cast(Mock, incident_repo_mock.create).call_count, 2)
+
+    def test_bulk_incident_limit(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.AGENT,
+            assigned=True,
+        )
+        slots = threading.BoundedSemaphore(1)
+        body = [{'email': self.faker.email(), 'name': self.faker.word(), 'description': self.faker.sentence()}]
+        user_repo_mock = Mock(UserRepository)
+        cast(Mock, user_repo_mock.find_by_email).return_value = None
+
+        with (
+            mock.patch('blueprints.incident.bulk_slots', slots),
+            self.app.container.user_repo.override(user_repo_mock),
+            self.app.container.incident_repo.override(Mock(IncidentRepository)),
+        ):
+            # The slot is given back once each request is answered
+            first = self.call_bulk_incident_api(token, body)
+            second = self.call_bulk_incident_api(token, body)
+            self.assertTrue(slots.acquire(blocking=False))
+            busy = self.call_bulk_incident_api(token, body)
+
+        self.assertEqual((first.status_code, second.status_code), (207, 207))
+        self.assertEqual(busy.status_code, 503)
+        self.assertEqual(busy.headers['Retry-After'], '2')
+        self.assertEqual(
+            busy.get_json(), {'code': 503, 'message': 'Too many bulk registrations in progress, try again later.'}
+        )
+
+    def test_bulk_incident_lookup_failure(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.AGENT,
+            assigned=True,
+        )
+        user = User(
+            id=cast(str, self.faker.uuid4()),
+            client_id=token['cid'],
+            name=self.faker.name(),
+            email=self.faker.email(),
+        )
+        failing_email = self.faker.email()
+        body = [
+            {'email': user.email, 'name': self.faker.word(), 'description': self.faker.sentence()},
+            {'email': failing_email, 'name': self.faker.word(), 'description': self.faker.sentence()},
+            {'email': failing_email, 'name': self.faker.word(), 'description': self.faker.sentence()},
+        ]
+
+        def find_by_email(email: str, _: str) -> User:
+            if email == failing_email:
+                raise CircuitOpenError('user', 10)
+            return user
+
+        user_repo_mock = Mock(UserRepository)
+        incident_repo_mock = Mock(IncidentRepository)
+        cast(Mock, user_repo_mock.find_by_email).side_effect = find_by_email
+        cast(Mock, incident_repo_mock.create).side_effect = self.gen_incident_response
+
+        with (
+            self.app.container.user_repo.override(user_repo_mock),
+            self.app.container.incident_repo.override(incident_repo_mock),
+            self.assertLogs('BulkWebRegistrationIncident', 'ERROR'),
+        ):
+            resp = self.call_bulk_incident_api(token, body)
+
+        self.assertEqual(resp.status_code, 207)
+        results = json.loads(resp.get_data())['results']
+        self.assertEqual([result['code'] for result in results], [201, 502, 502])
+        self.assertEqual(results[1]['message'], 'Unable to look up the user.')
+        self.assertEqual(cast(Mock, incident_repo_mock.create).call_count, 1)
+
+    def test_import_incident_success(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.AGENT,
+            assigned=True,
+        )
+        user = User(
+            id=cast(str, self.faker.uuid4()),
+            client_id=token['cid'],
+            name=self.faker.name(),
+            email=self.faker.email(),
+        )
+        items = [{'email': user.email, 'name': self.faker.word(), 'description': self.faker.sentence()} for _ in range(40)]
+        body = b'\n'.join(json.dumps(item).encode() for item in items) + b'\n\n'
+
+        user_repo_mock = Mock(UserRepository)
+        incident_repo_mock = Mock(IncidentRepository)
+        cast(Mock, user_repo_mock.find_by_email).return_value = user
+        cast(Mock, incident_repo_mock.create).side_effect = self.gen_incident_response
+
+        with (
+            self.app.container.user_repo.override(user_repo_mock),
+            self.app.container.incident_repo.override(incident_repo_mock),
+        ):
+            results = self.call_import_incident_api(token, body)
+
+        self.assertEqual(results[-1], {'summary': {'created': 40, 'failed': 0}})
+        self.assertEqual([result['line'] for result in results[:-1]], list(range(1, 41)))
+        self.assertEqual([result['incident']['name'] for result in results[:-1]], [item['name'] for item in items])
+        self.assertTrue(all(result['incident']['reported_by'] == user.id for result in results[:-1]))
+        cast(Mock, incident_repo_mock.prepare).assert_called_once_with()
+
+    def test_import_incident_partial_failure(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.ADMIN,
+            assigned=True,
+        )
+        user = User(
+            id=cast(str, self.faker.uuid4()),
+            client_id=token['cid'],
+            name=self.faker.name(),
+            email=self.faker.email(),
+        )
+        failing_name = self.faker.pystr()
+        lines = [
+            json.dumps({'email': user.email, 'name': self.faker.word(), 'description': self.faker.sentence()}),
+            json.dumps({'email': user.email, 'name': self.faker.word()}),
+            '{"email": ',
+            '',
+            json.dumps([user.email]),
+            json.dumps({'email': self.faker.email(), 'name': self.faker.word(), 'description': self.faker.sentence()}),
+            json.dumps({'email': user.email, 'name': failing_name, 'description': self.faker.sentence()}),
+            json.dumps({'email': user.email, 'name': 'x' * 70000, 'description': self.faker.sentence()}),
+            json.dumps({'email': user.email, 'name': self.faker.word(), 'description': self.faker.sentence()}),
+        ]
+
+        def create(incident: Incident) -> IncidentResponse:
+            if incident.name == failing_name:
+                raise RuntimeError('incident service unavailable')
+            return self.gen_incident_response(incident)
+
+        user_repo_mock = Mock(UserRepository)
+        incident_repo_mock = Mock(IncidentRepository)
+        cast(Mock, user_repo_mock.find_by_email).side_effect = lambda email, _: user if email == user.email else None
+        cast(Mock, incident_repo_mock.create).side_effect = create
+
+        with (
+            self.app.container.user_repo.override(user_repo_mock),
+            self.app.container.incident_repo.override(incident_repo_mock),
+            self.assertLogs('WebImportIncident', 'ERROR'),
+        ):
+            # Without a trailing newline
+            results = self.call_import_incident_api(token, '\n'.join(lines).encode())
+
+        self.assertEqual([result['line'] for result in results[:-1]], [1, 2, 3, 5, 6, 7, 8, 9])
+        self.assertEqual([result['code'] for result in results[:-1]], [201, 400, 400, 400, 404, 502, 413, 201])
+        self.assertEqual(results[1]['message'], 'Invalid value for description: Missing data for required field.')
+        self.assertEqual(results[2]['message'], 'Request body must be a JSON object.')
+        self.assertEqual(results[5]['message'], 'Unable to register the incident.')
+        self.assertEqual(results[6]['message'], 'Line must not be longer than 65536 bytes.')
+        self.assertEqual(results[-1], {'summary': {'created': 2, 'failed': 6}})
+
+    def test_import_incident_invalid_request(self) -> None:
+        agent = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.AGENT,
+            assigned=True,
+        )
+        user = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.USER,
+            assigned=True,
+        )
+
+        self.assertEqual(self.call_import_incident_api(user, b'{}')[0]['code'], 403)
+        self.assertEqual(
+            self.call_import_incident_api(agent, b'[]', 'application/json'),
+            [{'code': 415, 'message': 'Request body must be newline-delimited JSON (application/x-ndjson).'}],
+        )
+
+    def test_import_incident_limits(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.AGENT,
+            assigned=True,
+        )
+        slots = threading.BoundedSemaphore(1)
+        line = json.dumps({'email': self.faker.email(), 'name': self.faker.word(), 'description': self.faker.sentence()})
+        user_repo_mock = Mock(UserRepository)
+        cast(Mock, user_repo_mock.find_by_email).return_value = None
+
+        with (
+            mock.patch('blueprints.incident.import_slots', slots),
+            self.app.container.import_spool.override(UploadSpool(max_bytes=1024)),
+            self.app.container.user_repo.override(user_repo_mock),
+            self.app.container.incident_repo.override(Mock(IncidentRepository)),
+        ):
+            # The slot is given back once each response is sent
+            first = self.call_import_incident_api(token, line.encode())
+            second = self.call_import_incident_api(token, line.encode())
+            too_large = self.call_import_incident_api(token, (line + '\n').encode() * 20)
+            self.assertTrue(slots.acquire(blocking=False))
+            busy = self.call_import_incident_api(token, line.encode())
+
+        self.assertEqual(first[-1], {'summary': {'created': 0, 'failed': 1}})
+        self.assertEqual(second[-1], {'summary': {'created': 0, 'failed': 1}})
+        self.assertEqual(too_large, [{'code': 413, 'message': 'Request body must not be larger than 1024 bytes.'}])
+        self.assertEqual(busy, [{'code': 503, 'message': 'Too many imports in progress, try again later.'}])
+
+    def test_web_incident_circuit_open(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.ADMIN,
+            assigned=True,
+        )
+        body = {'email': self.faker.email(), 'name': self.faker.word(), 'description': self.faker.sentence()}
+
+        user_repo_mock = Mock(UserRepository)
+        cast(Mock, user_repo_mock.find_by_email).side_effect = CircuitOpenError('user', 4.2)
+
+        with self.app.container.user_repo.override(user_repo_mock):
+            resp = self.call_web_incident_api(token, body)
+
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp.headers['Retry-After'], '5')
+        self.assertEqual(json.loads(resp.get_data())['code'], 503)
+
+    def queue_repo(self) -> SqliteSubmissionRepository:
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        return SqliteSubmissionRepository(str(Path(tmpdir.name) / 'incidents.db'))
+
+    def get_submission(self, token: dict[str, Any], location: str) -> TestResponse:
+        token_encoded = base64.urlsafe_b64encode(json.dumps(token).encode()).decode()
+        return self.client.get(location, headers={'X-Apigateway-Api-Userinfo': token_encoded})
+
+    def test_web_incident_queued(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.AGENT,
+            assigned=True,
+        )
+        user = User(id=cast(str, self.faker.uuid4()), client_id=token['cid'], name=self.faker.name(), email=self.faker.email())
+        body = {'email': user.email, 'name': self.faker.word(), 'description': self.faker.sentence()}
+
+        user_repo_mock = Mock(UserRepository)
+        incident_repo_mock = Mock(IncidentRepository)
+        cast(Mock, user_repo_mock.find_by_email).return_value = user
+        submission_repo = self.queue_repo()
+
+        with (
+            self.app.container.user_repo.override(user_repo_mock),
+            self.app.container.incident_repo.override(incident_repo_mock),
+            self.app.container.submission_repo.override(submission_repo),
+        ):
+            resp = self.call_web_incident_api(token, body)
+            status_resp = self.get_submission(token, resp.headers['Location'])
+
+        self.assertEqual(resp.status_code, 202)
+        resp_data = json.loads(resp.get_data())
+        self.assertEqual(resp.headers['Location'], f'/api/v1/incidents/submissions/{resp_data["id"]}')
+        self.assertEqual(resp_data['status'], 'queued')
+        self.assertIsNone(resp_data['incident'])
+        cast(Mock, incident_repo_mock.create).assert_not_called()
+
+        queued = submission_repo.get(resp_data['id'])
+        self.assertEqual(cast(Submission, queued).incident.reported_by, user.id)
+
+        self.assertEqual(status_resp.status_code, 200)
+        self.assertEqual(json.loads(status_resp.get_data()), resp_data)
+
+    def test_mobile_incident_queued(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.USER,
+            assigned=True,
+        )
+        body = {'name': self.faker.word(), 'description': self.faker.sentence()}
+        employee = Employee(
+            id=cast(str, self.faker.uuid4()),
+            client_id=token['cid'],
+            name=self.faker.name(),
+            email=self.faker.email(),
+            role=Role.AGENT,
+            invitation_status='accepted',
+            invitation_date=self.faker.past_datetime(),
+        )
+
+        employee_repo_mock = Mock(EmployeeRepository)
+        cast(Mock, employee_repo_mock.get_random_agent).return_value = employee
+        submission_repo = self.queue_repo()
+
+        with (
+            self.app.container.employee_repo.override(employee_repo_mock),
+            self.app.container.submission_repo.override(submission_repo),
+        ):
+            resp = self.call_mobile_incident_api(token, body)
+
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(json.loads(resp.get_data())['status'], 'queued')
+
+    @parametrize(
+        ('same_client', 'role', 'reporter'),
+        [
+            (False, Role.ADMIN, False),
+            (True, Role.USER, False),
+        ],
+    )
+    def test_submission_not_visible(self, *, same_client: bool, role: Role, reporter: bool) -> None:
+        submission_repo = self.queue_repo()
+        client_id = cast(str, self.faker.uuid4())
+        reporter_id = cast(str, self.faker.uuid4())
+        submission = submission_repo.enqueue(
+            Incident(
+                client_id=client_id,
+                name=self.faker.word(),
+                channel=Channel.MOBILE,
+                reported_by=reporter_id,
+                created_by=reporter_id,
+                description=self.faker.sentence(),
+                assigned_to=cast(str, self.faker.uuid4()),
+            )
+        )
+        token = gen_token(
+            user_id=reporter_id if reporter else cast(str, self.faker.uuid4()),
+            client_id=client_id if same_client else cast(str, self.faker.uuid4()),
+            role=role,
+            assigned=True,
+        )
+
+        with self.app.container.submission_repo.override(submission_repo):
+            resp = self.get_submission(token, f'/api/v1/incidents/submissions/{submission.id}')
+
+        self.assertEqual(resp.status_code, 404)
+
+    def test_submission_queue_disabled(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.ADMIN,
+            assigned=True,
+        )
+
+        resp = self.get_submission(token, f'/api/v1/incidents/submissions/{cast(str, self.faker.uuid4())}')
+
+        self.assertEqual(resp.status_code, 404)
+        self.assertEqual(json.loads(resp.get_data())['message'], 'Incident submission not found.')
@@ -0,0 +1,169 @@
+import base64
+import json
+import os
+import time
+from typing import cast
+from unittest import mock
+from unittest.mock import Mock
+
+import responses
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from app import create_app
+from models import AuditRecord, Role, SubmissionStatus
+from repositories import EmployeeRepository, SubmissionRepository, UserRepository
+from repositories.cached import CachedUserRepository, RosterEmployeeRepository
+from repositories.rest import CachingTokenProvider, RestUserRepository, StaticTokenProvider
+from util.admission import AdaptiveLimiter
+from util.apigateway import auth_rejections
+from util.audit import AuditFileWriter
+from util.metrics import registry
+from workers import AuditLog
+
+from .util import gen_token
+
+
+class TestMetrics(ParametrizedTestCase):
+    METRICS_API_URL = '/api/v1/metrics/registroapp'
+
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.app = create_app()
+        self.client = self.app.test_client()
+        registry.reset()
+
+    def test_request_durations(self) -> None:
+        self.client.get('/api/v1/health/registroapp')
+        self.client.get('/does/not/exist')
+
+        resp = self.client.get(self.METRICS_API_URL)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content_type, 'text/plain; version=0.0.4; charset=utf-8')
+        text = resp.get_data(as_text=True)
+        self.assertIn(
+            'registroapp_request_duration_seconds_count{route="/api/v1/health/registroapp",method="GET",status="200"} 1\n',
+            text,
+        )
+        self.assertIn('registroapp_request_duration_seconds_count{route="unmatched",method="GET",status="404"} 1\n', text)
+        self.assertIn('registroapp_serialization_duration_seconds_count', text)
+
+    def test_validation_and_downstream_durations(self) -> None:
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.ADMIN,
+            assigned=True,
+        )
+        base_url = self.faker.url().rstrip('/')
+        body = {'email': self.faker.email(), 'name': self.faker.word(), 'description': self.faker.sentence()}
+
+        with responses.RequestsMock() as rsps, self.app.container.user_repo.override(RestUserRepository(base_url, None)):
+            rsps.post(f'{base_url}/api/v1/users/detail', status=404)
+            token_encoded = base64.urlsafe_b64encode(json.dumps(token).encode()).decode()
+            self.client.post('/api/v1/incidents/web', headers={'X-Apigateway-Api-Userinfo': token_encoded}, json=body)
+
+        text = self.client.get(self.METRICS_API_URL).get_data(as_text=True)
+
+        self.assertIn('registroapp_validation_duration_seconds_count{schema="IncidentRegistrationBody"} 1\n', text)
+        self.assertIn(
+            'registroapp_downstream_duration_seconds_count'
+            '{service="user",method="POST",path="/api/v1/users/detail",status="404"} 1\n',
+            text,
+        )
+
+    def test_repository_stats(self) -> None:
+        token = f'header.{base64.urlsafe_b64encode(json.dumps({"exp": time.time() + 3600}).encode()).decode()}.sig'
+        rest_repo = RestUserRepository(self.faker.url(), CachingTokenProvider(StaticTokenProvider(token)))
+        cached_repo = CachedUserRepository(rest_repo)
+        cached_repo.cache.set(('email', None, 'a@example.com'), None, 60)
+        cached_repo.find_by_email('a@example.com')
+        rest_repo.token_provider.get_token()  # type: ignore[union-attr]
+
+        roster_repo = RosterEmployeeRepository(Mock(EmployeeRepository))
+
+        with self.app.container.user_repo.override(cached_repo), self.app.container.employee_repo.override(roster_repo):
+            text = self.client.get(self.METRICS_API_URL).get_data(as_text=True)
+
+        self.assertIn('registroapp_user_cache_total{result="hit"} 1\n', text)
+        self.assertIn('registroapp_user_cache_size 1\n', text)
+        self.assertIn('registroapp_token_cache_total{service="user",result="refresh"} 1\n', text)
+        self.assertIn('registroapp_http_pool_requests_total{service="user",connection="new"} 0\n', text)
+        self.assertIn('registroapp_roster_total{result="fetch"} 0\n', text)
+        self.assertIn('registroapp_coalesced_requests_total{service="user",result="shared"} 0\n', text)
+
+    def test_breaker_and_retry_stats(self) -> None:
+        text = self.client.get(self.METRICS_API_URL).get_data(as_text=True)
+
+        self.assertIn('registroapp_circuit_breaker_state{service="user",state="closed"} 1\n', text)
+        self.assertIn('registroapp_circuit_breaker_state{service="client",state="open"} 0\n', text)
+        self.assertIn('registroapp_circuit_breaker_total{service="incidentmodify",event="rejected"} 0\n', text)
+        self.assertEqual(text.count('registroapp_retries_total{result="retried"} 0\n'), 1)
+
+    def test_queue_depth(self) -> None:
+        submission_repo = Mock(SubmissionRepository)
+        cast(Mock, submission_repo.count_by_status).return_value = {SubmissionStatus.QUEUED: 3, SubmissionStatus.FAILED: 1}
+
+        with self.app.container.submission_repo.override(submission_repo):
+            text = self.client.get(self.METRICS_API_URL).get_data(as_text=True)
+
+        self.assertIn('registroapp_incident_queue{status="queued"} 3\n', text)
+        self.assertIn('registroapp_incident_queue{status="failed"} 1\n', text)
+
+    def test_admission(self) -> None:
+        limiter = AdaptiveLimiter(initial_limit=3)
+        limiter.try_acquire()
+
+        with self.app.container.admission_limiter.override(limiter):
+            text = self.client.get(self.METRICS_API_URL).get_data(as_text=True)
+
+        self.assertIn('registroapp_admission_limit 3\n', text)
+        self.assertIn('registroapp_admission_in_flight 1\n', text)
+        self.assertIn('registroapp_admission_total{result="admitted"} 1\n', text)
+        self.assertIn('registroapp_admission_total{result="rejected"} 0\n', text)
+
+    def test_hedge_stats(self) -> None:
+        with mock.patch.dict(os.environ, {'HEDGE_SERVICES': 'user'}):
+            app = create_app()
+
+        text = app.test_client().get(self.METRICS_API_URL).get_data(as_text=True)
+
+        self.assertIn('registroapp_hedge_total{service="user",result="eligible"} 0\n', text)
+        self.assertIn('registroapp_hedge_total{service="user",result="won"} 0\n', text)
+        self.assertNotIn('registroapp_hedge_total{service="client"', text)
+
+    def test_auth_rejections(self) -> None:
+        before = auth_rejections.counts()
+        token = gen_token(
+            user_id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            role=Role.USER,
+            assigned=True,
+        )
+        token_encoded = base64.urlsafe_b64encode(json.dumps(token).encode()).decode()
+
+        self.client.post('/api/v1/incidents/web', json={})
+        self.client.post('/api/v1/incidents/web', headers={'X-Apigateway-Api-Userinfo': token_encoded}, json={})
+        text = self.client.get(self.METRICS_API_URL).get_data(as_text=True)
+
+        self.assertIn(f'registroapp_auth_rejections_total{{reason="missing_token"}} {before["missing_token"] + 1}\n', text)
+        self.assertIn(f'registroapp_auth_rejections_total{{reason="forbidden_role"}} {before["forbidden_role"] + 1}\n', text)
+
+    def test_audit_stats(self) -> None:
+        audit_log = AuditLog(Mock(AuditFileWriter), capacity=1)
+        audit_log.record(Mock(AuditRecord))
+        audit_log.record(Mock(AuditRecord))
+
+        with self.app.container.audit_log.override(audit_log):
+            text = self.client.get(self.METRICS_API_URL).get_data(as_text=True)
+
+        self.assertIn('registroapp_audit_records_total{result="recorded"} 1\n', text)
+        self.assertIn('registroapp_audit_records_total{result="dropped"} 1\n', text)
+        self.assertIn('registroapp_audit_buffered 1\n', text)
+
+    def test_unknown_repositories(self) -> None:
+        with self.app.container.user_repo.override(Mock(UserRepository)):
+            resp = self.client.get(self.METRICS_API_URL)
+
+        self.assertEqual(resp.status_code, 200)
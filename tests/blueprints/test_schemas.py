@@ -0,0 +1,42 @@
+import threading
+
+import marshmallow
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from blueprints.schemas import IncidentMobileRegistrationBody, IncidentRegistrationBody, SchemaRegistry
+
+
+class TestSchemaRegistry(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+    def test_schema_is_built_once(self) -> None:
+        registry = SchemaRegistry()
+
+        schema = registry.get(IncidentRegistrationBody)
+
+        self.assertIs(registry.get(IncidentRegistrationBody), schema)
+        self.assertIsNot(registry.get(IncidentMobileRegistrationBody), schema)
+
+    def test_concurrent_get(self) -> None:
+        registry = SchemaRegistry()
+        results: list[marshmallow.Schema] = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get(IncidentRegistrationBody))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(schema) for schema in results}), 1)
+
+    def test_schema_is_reusable(self) -> None:
+        schema = SchemaRegistry().get(IncidentMobileRegistrationBody)
+
+        for _ in range(2):
+            body = {'name': self.faker.word(), 'description': self.faker.sentence()}
+            data = schema.load(body)
+            self.assertEqual(data, IncidentMobileRegistrationBody(**body))
+
+        with self.assertRaises(marshmallow.ValidationError):
+            schema.load({'name': ''})
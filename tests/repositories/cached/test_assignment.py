@@ -0,0 +1,71 @@
+from collections import Counter
+from typing import cast
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from repositories.cached import LeastRecentlyAssigned, RandomAssignment, RoundRobinAssignment, create_strategy
+
+from .util import gen_agents
+
+
+class TestAssignment(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.client_id = cast(str, self.faker.uuid4())
+        self.agents = gen_agents(self.faker, self.client_id, 3)
+
+    def test_random(self) -> None:
+        strategy = RandomAssignment()
+
+        for _ in range(10):
+            self.assertIn(strategy.choose(self.client_id, self.agents), self.agents)
+
+    def test_round_robin(self) -> None:
+        strategy = RoundRobinAssignment()
+
+        chosen = [strategy.choose(self.client_id, self.agents) for _ in range(6)]
+
+        self.assertEqual(chosen, self.agents * 2)
+
+    def test_round_robin_per_client(self) -> None:
+        strategy = RoundRobinAssignment()
+        other_client = cast(str, self.faker.uuid4())
+        other_agents = gen_agents(self.faker, other_client, 2)
+
+        self.assertEqual(strategy.choose(self.client_id, self.agents), self.agents[0])
+        self.assertEqual(strategy.choose(other_client, other_agents), other_agents[0])
+        self.assertEqual(strategy.choose(self.client_id, self.agents), self.agents[1])
+
+    def test_least_recently_assigned(self) -> None:
+        strategy = LeastRecentlyAssigned()
+
+        chosen = [strategy.choose(self.client_id, self.agents) for _ in range(3)]
+        self.assertEqual(chosen, self.agents)
+
+        # A new agent has never been assigned, so it goes first
+        new_agent = gen_agents(self.faker, self.client_id, 1)[0]
+        self.assertEqual(strategy.choose(self.client_id, [*self.agents, new_agent]), new_agent)
+        self.assertEqual(strategy.choose(self.client_id, [*self.agents, new_agent]), self.agents[0])
+
+    def test_least_recently_assigned_spreads_evenly(self) -> None:
+        strategy = LeastRecentlyAssigned()
+
+        counts = Counter(strategy.choose(self.client_id, self.agents).id for _ in range(30))
+
+        self.assertEqual(set(counts.values()), {10})
+
+    @parametrize(
+        ('name', 'cls'),
+        [
+            ('random', RandomAssignment),
+            ('round_robin', RoundRobinAssignment),
+            ('least_recent', LeastRecentlyAssigned),
+        ],
+    )
+    def test_create_strategy(self, name: str, cls: type) -> None:
+        self.assertIsInstance(create_strategy(name), cls)
+
+    def test_create_strategy_unknown(self) -> None:
+        with self.assertRaises(ValueError):
+            create_strategy(self.faker.word())
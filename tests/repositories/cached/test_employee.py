@@ -0,0 +1,127 @@
+import threading
+import time
+from typing import cast
+from unittest.mock import Mock
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from models import Employee
+from repositories import EmployeeRepository
+from repositories.cached import RosterEmployeeRepository, RoundRobinAssignment
+
+from .util import gen_agents
+
+
+class TestRosterEmployeeRepository(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.client_id = cast(str, self.faker.uuid4())
+        self.agents = gen_agents(self.faker, self.client_id, 3)
+        self.inner = Mock(EmployeeRepository)
+        cast(Mock, self.inner.list_agents).return_value = self.agents
+
+    def wait_for_refresh(self, repo: RosterEmployeeRepository) -> None:
+        for _ in range(100):
+            if not repo._refreshing:  # noqa: SLF001
+                return
+            time.sleep(0.01)
+
+    def test_assigns_from_roster(self) -> None:
+        repo = RosterEmployeeRepository(self.inner, RoundRobinAssignment())
+
+        chosen = [repo.get_random_agent(self.client_id) for _ in range(6)]
+
+        self.assertEqual(chosen, self.agents * 2)
+        cast(Mock, self.inner.list_agents).assert_called_once_with(self.client_id)
+        cast(Mock, self.inner.get_random_agent).assert_not_called()
+
+        stats = repo.stats()
+        self.assertEqual((stats.local, stats.fetches), (6, 1))
+
+    def test_no_agents_falls_back(self) -> None:
+        agent = self.agents[0]
+        cast(Mock, self.inner.list_agents).return_value = []
+        cast(Mock, self.inner.get_random_agent).return_value = agent
+        repo = RosterEmployeeRepository(self.inner)
+
+        self.assertEqual(repo.get_random_agent(self.client_id), agent)
+        self.assertEqual(repo.get_random_agent(self.client_id), agent)
+
+        # The empty roster is not cached
+        self.assertEqual(cast(Mock, self.inner.list_agents).call_count, 2)
+        self.assertEqual(repo.stats().fallbacks, 2)
+
+    def test_emptied_roster_dropped(self) -> None:
+        cast(Mock, self.inner.list_agents).side_effect = [self.agents, []]
+        cast(Mock, self.inner.get_random_agent).return_value = None
+        repo = RosterEmployeeRepository(self.inner, refresh_interval=0.05, max_age=0.1)
+
+        repo.get_random_agent(self.client_id)
+        time.sleep(0.15)
+
+        self.assertIsNone(repo.get_random_agent(self.client_id))
+        cast(Mock, self.inner.get_random_agent).assert_called_once_with(self.client_id)
+
+    def test_refreshes_in_background(self) -> None:
+        new_agents = gen_agents(self.faker, self.client_id, 2)
+        cast(Mock, self.inner.list_agents).side_effect = [self.agents, new_agents]
+        repo = RosterEmployeeRepository(self.inner, refresh_interval=0.1)
+
+        self.assertEqual(repo.list_agents(self.client_id), self.agents)
+        time.sleep(0.15)
+        # Due for refresh, the current roster is served while it is fetched again
+        self.assertEqual(repo.list_agents(self.client_id), self.agents)
+        self.wait_for_refresh(repo)
+        self.assertEqual(repo.list_agents(self.client_id), new_agents)
+
+    def test_background_refresh_failure_keeps_roster(self) -> None:
+        cast(Mock, self.inner.list_agents).side_effect = [self.agents, RuntimeError('client service unavailable')]
+        repo = RosterEmployeeRepository(self.inner, refresh_interval=0.1)
+        repo.list_agents(self.client_id)
+        time.sleep(0.15)
+
+        with self.assertLogs('RosterEmployeeRepository', 'ERROR'):
+            self.assertEqual(repo.list_agents(self.client_id), self.agents)
+            self.wait_for_refresh(repo)
+
+        self.assertEqual(repo.stats().failures, 1)
+
+    def test_expired_roster_fetched_again(self) -> None:
+        new_agents = gen_agents(self.faker, self.client_id, 2)
+        cast(Mock, self.inner.list_agents).side_effect = [self.agents, new_agents]
+        repo = RosterEmployeeRepository(self.inner, refresh_interval=0.05, max_age=0.1)
+
+        repo.list_agents(self.client_id)
+        time.sleep(0.15)
+
+        self.assertEqual(repo.list_agents(self.client_id), new_agents)
+
+    def test_falls_back_when_roster_unavailable(self) -> None:
+        agent = self.agents[0]
+        cast(Mock, self.inner.list_agents).side_effect = RuntimeError('client service unavailable')
+        cast(Mock, self.inner.get_random_agent).return_value = agent
+        repo = RosterEmployeeRepository(self.inner)
+
+        with self.assertLogs('RosterEmployeeRepository', 'ERROR'):
+            self.assertEqual(repo.get_random_agent(self.client_id), agent)
+
+        self.assertEqual(repo.stats().fallbacks, 1)
+
+    def test_cold_roster_fetched_once(self) -> None:
+        def slow_list_agents(client_id: str) -> list[Employee]:  # noqa: ARG001
+            time.sleep(0.1)
+            return self.agents
+
+        cast(Mock, self.inner.list_agents).side_effect = slow_list_agents
+        repo = RosterEmployeeRepository(self.inner)
+        results: list[Employee | None] = []
+        threads = [threading.Thread(target=lambda: results.append(repo.get_random_agent(self.client_id))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(agent in self.agents for agent in results))
+        cast(Mock, self.inner.list_agents).assert_called_once()
@@ -0,0 +1,128 @@
+import threading
+import time
+from typing import cast
+from unittest.mock import Mock
+
+import responses
+from faker import Faker
+from requests import HTTPError
+from unittest_parametrize import ParametrizedTestCase
+
+from models import User
+from repositories import UserRepository
+from repositories.cached import CachedUserRepository
+from repositories.rest import RestUserRepository
+
+
+class TestCachedUserRepository(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.inner = Mock(UserRepository)
+        self.repo = CachedUserRepository(self.inner, maxsize=100, ttl=60, negative_ttl=0.1)
+
+    def gen_user(self) -> User:
+        return User(
+            id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            name=self.faker.name(),
+            email=self.faker.email(),
+        )
+
+    def test_get_cached(self) -> None:
+        user = self.gen_user()
+        cast(Mock, self.inner.get).return_value = user
+
+        self.assertEqual(self.repo.get(user.id, user.client_id), user)
+        self.assertEqual(self.repo.get(user.id, user.client_id), user)
+
+        cast(Mock, self.inner.get).assert_called_once_with(user.id, user.client_id)
+        self.assertEqual(self.repo.stats().hits, 1)
+
+    def test_find_by_email_cached_per_client(self) -> None:
+        user = self.gen_user()
+        other_client = cast(str, self.faker.uuid4())
+        cast(Mock, self.inner.find_by_email).side_effect = lambda _, client_id: user if client_id == user.client_id else None
+
+        self.assertEqual(self.repo.find_by_email(user.email, user.client_id), user)
+        self.assertIsNone(self.repo.find_by_email(user.email, other_client))
+        self.assertEqual(self.repo.find_by_email(user.email, user.client_id), user)
+        self.assertIsNone(self.repo.find_by_email(user.email, other_client))
+
+        self.assertEqual(cast(Mock, self.inner.find_by_email).call_count, 2)
+
+    def test_find_by_email_populates_get(self) -> None:
+        user = self.gen_user()
+        cast(Mock, self.inner.find_by_email).return_value = user
+
+        self.repo.find_by_email(user.email, user.client_id)
+
+        self.assertEqual(self.repo.get(user.id, user.client_id), user)
+        cast(Mock, self.inner.get).assert_not_called()
+
+    def test_negative_result_expires_sooner(self) -> None:
+        user = self.gen_user()
+        cast(Mock, self.inner.find_by_email).side_effect = [None, user]
+
+        self.assertIsNone(self.repo.find_by_email(user.email))
+        self.assertIsNone(self.repo.find_by_email(user.email))
+        time.sleep(0.15)
+        self.assertEqual(self.repo.find_by_email(user.email), user)
+
+        self.assertEqual(cast(Mock, self.inner.find_by_email).call_count, 2)
+
+    def test_errors_not_cached(self) -> None:
+        user = self.gen_user()
+        cast(Mock, self.inner.get).side_effect = [RuntimeError('unavailable'), user]
+
+        with self.assertRaises(RuntimeError):
+            self.repo.get(user.id, user.client_id)
+
+        self.assertEqual(self.repo.get(user.id, user.client_id), user)
+
+    def test_server_errors_not_cached_as_missing(self) -> None:
+        user = self.gen_user()
+        base_url = self.faker.url().rstrip('/')
+        repo = CachedUserRepository(RestUserRepository(base_url, None), negative_ttl=60)
+
+        with responses.RequestsMock() as rsps:
+            rsps.post(f'{base_url}/api/v1/users/detail', status=500)
+            rsps.post(
+                f'{base_url}/api/v1/users/detail',
+                json={'id': user.id, 'clientId': user.client_id, 'name': user.name, 'email': user.email},
+            )
+
+            with self.assertRaises(HTTPError):
+                repo.find_by_email(user.email)
+            # The service recovered, the user is looked up again
+            self.assertEqual(repo.find_by_email(user.email), user)
+
+    def test_concurrent_misses_coalesced(self) -> None:
+        user = self.gen_user()
+
+        def slow_find_by_email(email: str, client_id: str | None = None) -> User:  # noqa: ARG001
+            time.sleep(0.1)
+            return user
+
+        cast(Mock, self.inner.find_by_email).side_effect = slow_find_by_email
+        results: list[User | None] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.repo.find_by_email(user.email, user.client_id)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [user] * 8)
+        self.assertEqual(cast(Mock, self.inner.find_by_email).call_count, 1)
+
+    def test_eviction(self) -> None:
+        repo = CachedUserRepository(self.inner, maxsize=1)
+        users = [self.gen_user() for _ in range(2)]
+        cast(Mock, self.inner.get).side_effect = users
+
+        for user in users:
+            repo.get(user.id, user.client_id)
+
+        self.assertEqual(repo.stats().evictions, 1)
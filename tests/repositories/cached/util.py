@@ -0,0 +1,20 @@
+from typing import cast
+
+from faker import Faker
+
+from models import Employee, Role
+
+
+def gen_agents(faker: Faker, client_id: str, count: int) -> list[Employee]:
+    return [
+        Employee(
+            id=cast(str, faker.uuid4()),
+            client_id=client_id,
+            name=faker.name(),
+            email=faker.email(),
+            role=Role.AGENT,
+            invitation_status='accepted',
+            invitation_date=faker.past_datetime(),
+        )
+        for _ in range(count)
+    ]
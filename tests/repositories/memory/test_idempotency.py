@@ -0,0 +1,49 @@
+import time
+from typing import cast
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from models import StoredResponse
+from repositories.memory import MemoryIdempotencyRepository
+
+
+class TestMemoryIdempotencyRepository(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+    def gen_response(self) -> StoredResponse:
+        return StoredResponse(
+            fingerprint=cast(str, self.faker.sha256()),
+            status=201,
+            body=self.faker.binary(length=64),
+            headers=(('Content-Type', 'application/json'),),
+        )
+
+    def test_save_and_get(self) -> None:
+        repo = MemoryIdempotencyRepository()
+        key = cast(str, self.faker.uuid4())
+        response = self.gen_response()
+
+        self.assertIsNone(repo.get(key))
+        repo.save(key, response)
+
+        self.assertEqual(repo.get(key), response)
+
+    def test_expired(self) -> None:
+        repo = MemoryIdempotencyRepository(ttl=0.05)
+        key = cast(str, self.faker.uuid4())
+        repo.save(key, self.gen_response())
+
+        time.sleep(0.1)
+
+        self.assertIsNone(repo.get(key))
+
+    def test_bounded(self) -> None:
+        repo = MemoryIdempotencyRepository(maxsize=2)
+        keys = [cast(str, self.faker.uuid4()) for _ in range(3)]
+        for key in keys:
+            repo.save(key, self.gen_response())
+
+        self.assertIsNone(repo.get(keys[0]))
+        self.assertIsNotNone(repo.get(keys[2]))
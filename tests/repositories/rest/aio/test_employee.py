@@ -0,0 +1,41 @@
+from faker import Faker
+
+from models import Employee, Role
+from repositories.rest.aio import AsyncRestEmployeeRepository
+
+from .util import StubServerTestCase
+
+
+class TestAsyncEmployee(StubServerTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.faker = Faker()
+
+    async def test_get_random_agent_success(self) -> None:
+        response_data = {
+            'id': str(self.faker.uuid4()),
+            'clientId': str(self.faker.uuid4()),
+            'name': self.faker.name(),
+            'email': self.faker.email(),
+            'role': 'agent',
+            'invitationStatus': 'accepted',
+            'invitationDate': self.faker.date_time().isoformat(),
+        }
+        base_url = await self.start_stub('GET', f'/api/v1/random/{response_data["clientId"]}/agent', 200, response_data)
+        repo = AsyncRestEmployeeRepository(base_url, None, self.http_client)
+
+        result = await repo.get_random_agent(response_data['clientId'])
+
+        self.assertIsInstance(result, Employee)
+        if result is not None:  # Necesario para que mypy no marque error
+            self.assertEqual(result.id, response_data['id'])
+            self.assertEqual(result.client_id, response_data['clientId'])
+            self.assertEqual(result.role, Role.AGENT)
+            self.assertEqual(result.invitation_date.isoformat(), response_data['invitationDate'])
+
+    async def test_get_random_agent_not_found(self) -> None:
+        client_id = str(self.faker.uuid4())
+        base_url = await self.start_stub('GET', f'/api/v1/random/{client_id}/agent', 404)
+        repo = AsyncRestEmployeeRepository(base_url, None, self.http_client)
+
+        self.assertIsNone(await repo.get_random_agent(client_id))
@@ -0,0 +1,78 @@
+import asyncio
+import time
+from typing import cast
+from unittest import mock
+from unittest.mock import Mock
+
+from aiohttp import ClientResponseError
+from faker import Faker
+
+from models import Channel, Incident, IncidentResponse
+from repositories.rest import CachingTokenProvider, TokenProvider
+from repositories.rest.aio import AsyncRestIncidentRepository
+from tests.repositories.rest.test_token import gen_jwt
+
+from .util import StubServerTestCase
+
+
+class TestAsyncIncident(StubServerTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.faker = Faker()
+        self.incident = Incident(
+            client_id=str(self.faker.uuid4()),
+            name=self.faker.name(),
+            channel=Channel.WEB,
+            reported_by=str(self.faker.uuid4()),
+            created_by=str(self.faker.uuid4()),
+            description=self.faker.sentence(),
+            assigned_to=str(self.faker.uuid4()),
+        )
+
+    async def test_create_success(self) -> None:
+        response_data = {
+            'id': str(self.faker.uuid4()),
+            'client_id': self.incident.client_id,
+            'name': self.incident.name,
+            'channel': self.incident.channel.value,
+            'reported_by': self.incident.reported_by,
+            'created_by': self.incident.created_by,
+            'assigned_to': self.incident.assigned_to,
+        }
+        base_url = await self.start_stub('POST', '/api/v1/register/incident', 201, response_data)
+        repo = AsyncRestIncidentRepository(base_url, None, self.http_client)
+
+        result = await repo.create(self.incident)
+
+        self.assertEqual(result, IncidentResponse(**response_data))
+        self.assertEqual(self.request_bodies[0]['description'], self.incident.description)
+
+    async def test_token_fetched_in_thread_only_when_not_cached(self) -> None:
+        token = gen_jwt(time.time() + 3600)
+        inner = Mock(TokenProvider)
+        cast(Mock, inner.get_token).return_value = token
+        base_url = await self.start_stub('POST', '/api/v1/register/incident', 500)
+        repo = AsyncRestIncidentRepository(base_url, CachingTokenProvider(inner), self.http_client)
+
+        with mock.patch('repositories.rest.aio.base.asyncio.to_thread', wraps=asyncio.to_thread) as to_thread:
+            for _ in range(3):
+                with self.assertRaises(ClientResponseError):
+                    await repo.create(self.incident)
+
+        self.assertEqual(to_thread.call_count, 1)
+        self.assertEqual(cast(Mock, inner.get_token).call_count, 1)
+        self.assertTrue(all(request.headers['Authorization'] == f'Bearer {token}' for request in self.requests))
+
+    async def test_create_unexpected_error(self) -> None:
+        base_url = await self.start_stub('POST', '/api/v1/register/incident', 500)
+        repo = AsyncRestIncidentRepository(base_url, None, self.http_client)
+
+        with self.assertRaises(ClientResponseError):
+            await repo.create(self.incident)
+
+    async def test_create_unexpected_success_status(self) -> None:
+        base_url = await self.start_stub('POST', '/api/v1/register/incident', 200, {})
+        repo = AsyncRestIncidentRepository(base_url, None, self.http_client)
+
+        with self.assertRaises(ClientResponseError):
+            await repo.create(self.incident)
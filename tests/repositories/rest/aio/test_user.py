@@ -0,0 +1,73 @@
+from typing import cast
+from unittest.mock import Mock
+
+from aiohttp import ClientResponseError
+from faker import Faker
+
+from models import User
+from repositories.rest import TokenProvider
+from repositories.rest.aio import AsyncRestUserRepository
+
+from .util import StubServerTestCase
+
+
+class TestAsyncUser(StubServerTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.faker = Faker()
+        self.user = User(
+            id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            name=self.faker.name(),
+            email=self.faker.email(),
+        )
+        self.user_json = {
+            'id': self.user.id,
+            'clientId': self.user.client_id,
+            'name': self.user.name,
+            'email': self.user.email,
+        }
+
+    async def test_get_existing(self) -> None:
+        base_url = await self.start_stub('GET', f'/api/v1/users/{self.user.client_id}/{self.user.id}', 200, self.user_json)
+        repo = AsyncRestUserRepository(base_url, None, self.http_client)
+
+        self.assertEqual(await repo.get(self.user.id, self.user.client_id), self.user)
+        self.assertNotIn('Authorization', self.requests[0].headers)
+
+    async def test_get_not_found(self) -> None:
+        base_url = await self.start_stub('GET', f'/api/v1/users/{self.user.client_id}/{self.user.id}', 404)
+        repo = AsyncRestUserRepository(base_url, None, self.http_client)
+
+        self.assertIsNone(await repo.get(self.user.id, self.user.client_id))
+
+    async def test_get_error(self) -> None:
+        base_url = await self.start_stub('GET', f'/api/v1/users/{self.user.client_id}/{self.user.id}', 201)
+        repo = AsyncRestUserRepository(base_url, None, self.http_client)
+
+        with self.assertRaises(ClientResponseError):
+            await repo.get(self.user.id, self.user.client_id)
+
+    async def test_find_by_email_with_token_provider(self) -> None:
+        token = self.faker.pystr()
+        token_provider = Mock(TokenProvider)
+        cast(Mock, token_provider.get_token).return_value = token
+        base_url = await self.start_stub('POST', '/api/v1/users/detail', 200, self.user_json)
+        repo = AsyncRestUserRepository(base_url, token_provider, self.http_client)
+
+        self.assertEqual(await repo.find_by_email(self.user.email), self.user)
+        self.assertEqual(self.requests[0].headers['Authorization'], f'Bearer {token}')
+        self.assertEqual(self.request_bodies[0], {'email': self.user.email})
+
+    async def test_find_by_email_not_found(self) -> None:
+        base_url = await self.start_stub('POST', '/api/v1/users/detail', 404, {'message': 'User not found', 'code': 404})
+        repo = AsyncRestUserRepository(base_url, None, self.http_client)
+
+        self.assertIsNone(await repo.find_by_email(self.user.email))
+
+    async def test_find_by_email_error(self) -> None:
+        base_url = await self.start_stub('POST', '/api/v1/users/detail', 503)
+        repo = AsyncRestUserRepository(base_url, None, self.http_client)
+
+        with self.assertRaises(ClientResponseError):
+            await repo.find_by_email(self.user.email)
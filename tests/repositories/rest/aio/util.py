@@ -0,0 +1,38 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+from unittest import IsolatedAsyncioTestCase
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from repositories.rest.aio import AsyncHttpClient
+
+
+class StubServerTestCase(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.http_client = AsyncHttpClient()
+        self.requests: list[web.Request] = []
+        self.request_bodies: list[Any] = []
+
+    async def asyncTearDown(self) -> None:
+        await self.http_client.close()
+
+    async def start_stub(self, method: str, path: str, status: int, json: dict[str, Any] | None = None) -> str:
+        async def handler(request: web.Request) -> web.Response:
+            self.requests.append(request)
+            self.request_bodies.append(await request.json() if request.can_read_body else None)
+            if json is None:
+                return web.Response(status=status)
+            return web.json_response(json, status=status)
+
+        return await self.start_stub_handler(method, path, handler)
+
+    async def start_stub_handler(
+        self, method: str, path: str, handler: Callable[[web.Request], Awaitable[web.StreamResponse]]
+    ) -> str:
+        app = web.Application()
+        app.router.add_route(method, path, handler)
+        server = TestServer(app)
+        await server.start_server()
+        self.addAsyncCleanup(server.close)
+        return str(server.make_url('')).rstrip('/')
@@ -0,0 +1,173 @@
+from dataclasses import FrozenInstanceError, dataclass, field
+from datetime import datetime
+from typing import Any
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from models import Employee, Role
+from repositories.rest import DecodeError, compile_decoder
+from repositories.rest.user import user_from_json
+
+
+@dataclass
+class Child:
+    name: str
+
+
+@dataclass
+class Sample:
+    name: str
+    count: int
+    ratio: float
+    active: bool
+    role: Role
+    created_at: datetime
+    note: str | None
+    child: Child
+
+
+@dataclass
+class WithDefault:
+    name: str = 'default'
+
+
+@dataclass
+class WithList:
+    names: list[str] = field(default_factory=list)
+
+
+class TestDecoder(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.decode = compile_decoder(Sample, {'created_at': 'createdAt'})
+
+    def gen_data(self) -> dict[str, Any]:
+        return {
+            'name': self.faker.name(),
+            'count': self.faker.pyint(),
+            'ratio': self.faker.pyfloat(),
+            'active': self.faker.pybool(),
+            'role': self.faker.random_element([role.value for role in Role]),
+            'createdAt': self.faker.date_time().isoformat(),
+            'note': None,
+            'child': {'name': self.faker.name()},
+        }
+
+    def test_decode(self) -> None:
+        data = self.gen_data()
+        data['note'] = self.faker.sentence()
+        data['unknown'] = self.faker.word()
+
+        sample = self.decode(data)
+
+        self.assertEqual(
+            sample,
+            Sample(
+                name=data['name'],
+                count=data['count'],
+                ratio=data['ratio'],
+                active=data['active'],
+                role=Role(data['role']),
+                created_at=datetime.fromisoformat(data['createdAt']),
+                note=data['note'],
+                child=Child(name=data['child']['name']),
+            ),
+        )
+        # The input is left untouched
+        self.assertIn('createdAt', data)
+
+    def test_optional_none(self) -> None:
+        self.assertIsNone(self.decode(self.gen_data()).note)
+
+    def test_int_as_float(self) -> None:
+        data = self.gen_data()
+        data['ratio'] = 2
+
+        ratio = self.decode(data).ratio
+
+        self.assertEqual(ratio, 2.0)
+        self.assertIs(type(ratio), float)
+
+    @parametrize(
+        ('key', 'value', 'message'),
+        [
+            ('name', 1, 'Invalid value for Sample.name: expected str, got int'),
+            ('count', True, 'Invalid value for Sample.count: expected int, got bool'),
+            ('count', '1', 'Invalid value for Sample.count: expected int, got str'),
+            ('ratio', '1.5', 'Invalid value for Sample.ratio: expected float, got str'),
+            ('active', 1, 'Invalid value for Sample.active: expected bool, got int'),
+            ('role', 'owner', 'Invalid value for Sample.role: expected Role, got str'),
+            ('role', ['agent'], 'Invalid value for Sample.role: expected Role, got list'),
+            ('createdAt', 'yesterday', 'Invalid value for Sample.createdAt: expected ISO 8601 datetime, got str'),
+            ('createdAt', 1, 'Invalid value for Sample.createdAt: expected ISO 8601 datetime, got int'),
+            ('note', 1, 'Invalid value for Sample.note: expected str, got int'),
+            ('child', [], 'Invalid value for Child: expected object, got list'),
+            ('child', {}, 'Missing value for Child.name'),
+        ],
+    )
+    def test_invalid_value(self, key: str, value: object, message: str) -> None:
+        data = self.gen_data()
+        data[key] = value
+
+        with self.assertRaises(DecodeError) as context:
+            self.decode(data)
+
+        self.assertEqual(str(context.exception), message)
+
+    def test_missing_aliased_key(self) -> None:
+        data = self.gen_data()
+        data['created_at'] = data.pop('createdAt')
+
+        with self.assertRaisesRegex(DecodeError, 'Missing value for Sample.createdAt'):
+            self.decode(data)
+
+    def test_not_an_object(self) -> None:
+        with self.assertRaisesRegex(DecodeError, 'expected object, got list'):
+            self.decode([])
+
+    @parametrize(
+        ('cls',),
+        [
+            (WithDefault,),
+            (WithList,),
+        ],
+    )
+    def test_unsupported_dataclass(self, cls: type[Any]) -> None:
+        with self.assertRaises(TypeError):
+            compile_decoder(cls)
+
+    def test_employee(self) -> None:
+        decode = compile_decoder(Employee, {'client_id': 'clientId'})
+
+        with self.assertRaisesRegex(DecodeError, 'Missing value for Employee.clientId'):
+            decode({'id': self.faker.uuid4(), 'client_id': self.faker.uuid4()})
+
+    def test_interned(self) -> None:
+        decode = compile_decoder(Child, interned={'name'})
+        # Built at runtime so the two strings are distinct objects
+        name = ''.join(self.faker.random_letters(length=20))
+
+        first = decode({'name': ''.join(name)})
+        second = decode({'name': ''.join(name)})
+
+        self.assertIs(first.name, second.name)
+
+    def test_interned_requires_str(self) -> None:
+        with self.assertRaises(TypeError):
+            compile_decoder(Sample, interned={'count'})
+
+    def test_models_compact(self) -> None:
+        data = {
+            'id': self.faker.uuid4(),
+            'clientId': self.faker.uuid4(),
+            'name': self.faker.name(),
+            'email': self.faker.email(),
+        }
+
+        user = user_from_json(data)
+
+        self.assertFalse(hasattr(user, '__dict__'))
+        self.assertEqual(len({user, user_from_json(dict(data))}), 1)
+        with self.assertRaises(FrozenInstanceError):
+            user.name = self.faker.name()  # type: ignore[misc]
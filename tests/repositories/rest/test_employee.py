@@ -80,3 +80,43 @@ class TestEmployee(ParametrizedTestCase):
 
             with self.assertRaises(HTTPError):
                 self.repo.get_random_agent(client_id)
+
+    def test_list_agents(self) -> None:
+        client_id = str(self.faker.uuid4())
+        agents_data = [
+            {
+                'id': str(self.faker.uuid4()),
+                'clientId': client_id,
+                'name': self.faker.name(),
+                'email': self.faker.email(),
+                'role': 'agent',
+                'invitationStatus': 'accepted',
+                'invitationDate': self.faker.date_time().isoformat(),
+            }
+            for _ in range(3)
+        ]
+
+        with responses.RequestsMock() as rsps:
+            rsps.get(f'{self.base_url}/api/v1/clients/{client_id}/agents', json=agents_data, status=200)
+
+            result = self.repo.list_agents(client_id)
+
+        self.assertEqual([agent.id for agent in result], [agent['id'] for agent in agents_data])
+        self.assertTrue(all(agent.client_id == client_id for agent in result))
+
+    def test_list_agents_not_found(self) -> None:
+        client_id = str(self.faker.uuid4())
+
+        with responses.RequestsMock() as rsps:
+            rsps.get(f'{self.base_url}/api/v1/clients/{client_id}/agents', status=404)
+
+            self.assertEqual(self.repo.list_agents(client_id), [])
+
+    def test_list_agents_unexpected_error(self) -> None:
+        client_id = str(self.faker.uuid4())
+
+        with responses.RequestsMock() as rsps:
+            rsps.get(f'{self.base_url}/api/v1/clients/{client_id}/agents', status=500)
+
+            with self.assertRaises(HTTPError):
+                self.repo.list_agents(client_id)
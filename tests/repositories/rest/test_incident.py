@@ -78,6 +78,26 @@ class TestIncident(ParametrizedTestCase):
                 },
             )
 
+    def test_create_with_idempotency_key(self) -> None:
+        incident = self.gen_random_incident()
+        key = str(self.faker.uuid4())
+        response_data = {
+            'id': str(self.faker.uuid4()),
+            'client_id': incident.client_id,
+            'name': incident.name,
+            'channel': incident.channel.value,
+            'reported_by': incident.reported_by,
+            'created_by': incident.created_by,
+            'assigned_to': incident.assigned_to,
+        }
+
+        with responses.RequestsMock() as rsps:
+            rsps.post(f'{self.base_url}/api/v1/register/incident', json=response_data, status=201)
+
+            self.repo.create(incident, idempotency_key=key)
+
+            self.assertEqual(rsps.calls[0].request.headers['Idempotency-Key'], key)
+
     @parametrize(
         'status',
         [
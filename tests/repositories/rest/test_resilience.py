@@ -0,0 +1,269 @@
+import sys
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import cast
+
+from faker import Faker
+from requests import HTTPError, ReadTimeout
+from unittest_parametrize import ParametrizedTestCase
+
+from models import Channel, Incident
+from repositories.rest import HttpOptions, RestIncidentRepository, RestUserRepository
+from util.breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from util.hedge import Hedger
+from util.retry import RetryBudget, RetryPolicy
+
+
+class FlakyService:
+    def __init__(self) -> None:
+        # Status code and delay of the next responses, the last one is repeated
+        self.script: list[tuple[int, float]] = [(200, 0)]
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def next_response(self) -> tuple[int, float]:
+        with self.lock:
+            self.calls += 1
+            return self.script.pop(0) if len(self.script) > 1 else self.script[0]
+
+
+class StubServer(ThreadingHTTPServer):
+    # Keep-alive connections of the pooled session would otherwise hold the server open on shutdown
+    daemon_threads = True
+    block_on_close = False
+
+    def handle_error(self, request: object, client_address: object) -> None:
+        # Clients that timed out disconnect before the response is written
+        if isinstance(sys.exc_info()[1], BrokenPipeError | ConnectionResetError):
+            return
+        super().handle_error(request, client_address)  # type: ignore[arg-type]
+
+
+def handler_for(service: FlakyService) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def respond(self) -> None:
+            length = int(self.headers.get('Content-Length', 0))
+            self.rfile.read(length)
+
+            status, delay = service.next_response()
+            time.sleep(delay)
+            body = (
+                b'{"id":"1","clientId":"c","name":"Reporter","email":"reporter@example.com","client_id":"c",'
+                b'"channel":"web","reported_by":"1","created_by":"1","assigned_to":"1"}'
+            )
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:  # noqa: N802
+            self.respond()
+
+        def do_POST(self) -> None:  # noqa: N802
+            self.respond()
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            pass
+
+    return Handler
+
+
+class TestResilience(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.service = FlakyService()
+        server = StubServer(('127.0.0.1', 0), handler_for(self.service))
+        threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+        self.budget = RetryBudget()
+        self.policy = RetryPolicy(self.budget, max_attempts=3, backoff_base=0.01)
+        self.options = HttpOptions(read_timeout=0.2)
+
+    def user_repo(self, breaker: CircuitBreaker | None = None) -> RestUserRepository:
+        return RestUserRepository(self.base_url, None, self.options, self.policy, breaker)
+
+    def gen_incident(self) -> Incident:
+        return Incident(
+            client_id=cast(str, self.faker.uuid4()),
+            name=self.faker.word(),
+            channel=Channel.WEB,
+            reported_by=cast(str, self.faker.uuid4()),
+            created_by=cast(str, self.faker.uuid4()),
+            description=self.faker.sentence(),
+            assigned_to=cast(str, self.faker.uuid4()),
+        )
+
+    def test_get_retried(self) -> None:
+        self.service.script = [(503, 0), (502, 0), (200, 0)]
+
+        with self.assertLogs('RestUserRepository', 'WARNING'):
+            user = self.user_repo().get('1', 'c')
+
+        self.assertIsNotNone(user)
+        self.assertEqual(self.service.calls, 3)
+        self.assertEqual(self.budget.stats().retries, 2)
+
+    def test_get_gives_up_after_max_attempts(self) -> None:
+        self.service.script = [(503, 0)]
+
+        with self.assertLogs('RestUserRepository', 'WARNING'), self.assertRaises(HTTPError):
+            self.user_repo().get('1', 'c')
+
+        self.assertEqual(self.service.calls, 3)
+
+    def test_idempotent_post_retried(self) -> None:
+        self.service.script = [(503, 0), (200, 0)]
+
+        with self.assertLogs('RestUserRepository', 'WARNING'):
+            user = self.user_repo().find_by_email('reporter@example.com')
+
+        self.assertIsNotNone(user)
+        self.assertEqual(self.service.calls, 2)
+
+    def test_timeout_retried(self) -> None:
+        self.service.script = [(200, 0.5), (200, 0)]
+
+        with self.assertLogs('RestUserRepository', 'WARNING'):
+            user = self.user_repo().get('1', 'c')
+
+        self.assertIsNotNone(user)
+        self.assertEqual(self.service.calls, 2)
+
+    def test_non_idempotent_post_not_retried(self) -> None:
+        self.service.script = [(503, 0), (201, 0)]
+        repo = RestIncidentRepository(self.base_url, None, self.options, self.policy)
+
+        with self.assertRaises(HTTPError):
+            repo.create(self.gen_incident())
+
+        self.assertEqual(self.service.calls, 1)
+
+    def test_retry_budget_exhausted(self) -> None:
+        self.service.script = [(503, 0)]
+        self.policy = RetryPolicy(RetryBudget(ratio=0, min_per_second=0, max_tokens=1), max_attempts=3, backoff_base=0.01)
+        repo = self.user_repo()
+
+        with self.assertLogs('RestUserRepository', 'WARNING'), self.assertRaises(HTTPError):
+            repo.get('1', 'c')
+        with self.assertRaises(HTTPError):
+            repo.get('1', 'c')
+
+        # One retry for the first call, none for the second
+        self.assertEqual(self.service.calls, 3)
+        self.assertEqual(self.policy.budget.stats().exhausted, 2)
+
+    def test_breaker_fails_fast(self) -> None:
+        self.service.script = [(200, 0.5)]
+        breaker = CircuitBreaker('user', failure_threshold=2, reset_timeout=0.3)
+        repo = RestUserRepository(self.base_url, None, self.options, None, breaker)
+
+        for _ in range(2):
+            with self.assertRaises(ReadTimeout):
+                repo.get('1', 'c')
+
+        start = time.perf_counter()
+        with self.assertRaises(CircuitOpenError):
+            repo.get('1', 'c')
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertEqual(self.service.calls, 2)
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+
+        # The dependency recovers, a trial call closes the circuit
+        self.service.script = [(200, 0)]
+        time.sleep(0.3)
+        self.assertIsNotNone(repo.get('1', 'c'))
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def test_breaker_ignores_client_errors(self) -> None:
+        self.service.script = [(404, 0)]
+        breaker = CircuitBreaker('user', failure_threshold=1)
+        repo = RestUserRepository(self.base_url, None, self.options, None, breaker)
+
+        self.assertIsNone(repo.get('1', 'c'))
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def run_concurrently(self, count: int, fn: Callable[[], object]) -> list[object]:
+        results: list[object] = []
+        threads = [threading.Thread(target=lambda: results.append(fn())) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_identical_gets_coalesced(self) -> None:
+        self.service.script = [(200, 0.1)]
+        repo = RestUserRepository(self.base_url, None, HttpOptions(read_timeout=1), None, None)
+
+        results = self.run_concurrently(8, lambda: repo.get('1', 'c'))
+
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(self.service.calls, 1)
+        stats = repo.coalescing_stats()
+        self.assertEqual(stats.executed, 1)
+        self.assertEqual(stats.shared, 7)
+
+    def test_different_gets_not_coalesced(self) -> None:
+        self.service.script = [(200, 0.1)]
+        repo = RestUserRepository(self.base_url, None, HttpOptions(read_timeout=1), None, None)
+
+        self.run_concurrently(1, lambda: repo.get('1', 'c'))
+        self.run_concurrently(1, lambda: repo.get('2', 'c'))
+        self.run_concurrently(1, lambda: repo.get('1', 'c'))
+
+        self.assertEqual(self.service.calls, 3)
+        self.assertEqual(repo.coalescing_stats().shared, 0)
+
+    def test_coalesced_failure_shared(self) -> None:
+        self.service.script = [(500, 0.1)]
+        repo = RestUserRepository(self.base_url, None, HttpOptions(read_timeout=1), None, None)
+
+        def get() -> object:
+            try:
+                return repo.get('1', 'c')
+            except HTTPError as exc:
+                return exc
+
+        results = self.run_concurrently(4, get)
+
+        self.assertTrue(all(isinstance(result, HTTPError) for result in results))
+        self.assertEqual(self.service.calls, 1)
+
+    def hedged(self, repo: RestUserRepository | RestIncidentRepository) -> Hedger:
+        repo.hedger = Hedger(min_delay=0.05)
+        repo.hedger.budget = RetryBudget(ratio=0, min_per_second=0, max_tokens=1)
+        for _ in range(Hedger.min_samples):
+            repo.hedger.observe(0.01)
+        return repo.hedger
+
+    def test_slow_read_hedged(self) -> None:
+        self.service.script = [(200, 0.5), (200, 0)]
+        repo = RestUserRepository(self.base_url, None, HttpOptions(read_timeout=1), None, None)
+        hedger = self.hedged(repo)
+
+        start = time.perf_counter()
+        user = repo.find_by_email('reporter@example.com')
+
+        self.assertIsNotNone(user)
+        self.assertLess(time.perf_counter() - start, 0.4)
+        self.assertEqual(self.service.calls, 2)
+        self.assertEqual(hedger.stats().won, 1)
+
+    def test_write_not_hedged(self) -> None:
+        self.service.script = [(201, 0.2)]
+        repo = RestIncidentRepository(self.base_url, None, HttpOptions(read_timeout=1), None, None)
+        hedger = self.hedged(repo)
+
+        repo.create(self.gen_incident())
+
+        self.assertEqual(self.service.calls, 1)
+        self.assertEqual(hedger.stats().eligible, 0)
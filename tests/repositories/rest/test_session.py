@@ -0,0 +1,109 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+
+import responses
+from faker import Faker
+from responses import matchers
+
+from repositories.rest import HttpOptions, PooledSession, RestUserRepository
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:  # noqa: N802
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+
+class TestPooledSession(TestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+    def start_server(self) -> str:
+        server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f'http://127.0.0.1:{server.server_address[1]}'
+
+    def test_connections_are_reused(self) -> None:
+        base_url = self.start_server()
+        session = PooledSession()
+        self.addCleanup(session.close)
+
+        for _ in range(5):
+            resp = session.request('GET', f'{base_url}/ping')
+            self.assertEqual(resp.status_code, 200)
+
+        stats = session.stats()
+        self.assertEqual(stats.misses, 1)
+        self.assertEqual(stats.hits, 4)
+
+    def test_connections_are_shared_between_threads(self) -> None:
+        base_url = self.start_server()
+        session = PooledSession(HttpOptions(pool_maxsize=1, pool_block=True))
+        self.addCleanup(session.close)
+
+        def worker() -> None:
+            for _ in range(3):
+                session.request('GET', f'{base_url}/ping')
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = session.stats()
+        self.assertEqual(stats.misses, 1)
+        self.assertEqual(stats.hits, 11)
+
+    def test_no_keep_alive(self) -> None:
+        base_url = self.faker.url().rstrip('/')
+        session = PooledSession(HttpOptions(keep_alive=False))
+
+        with responses.RequestsMock() as rsps:
+            rsps.get(base_url)
+            session.request('GET', base_url)
+            self.assertEqual(rsps.calls[0].request.headers['Connection'], 'close')
+
+    def test_repository_timeouts(self) -> None:
+        base_url = self.faker.url().rstrip('/')
+        repo = RestUserRepository(base_url, None, HttpOptions(connect_timeout=0.5, read_timeout=3))
+
+        with responses.RequestsMock() as rsps:
+            rsps.get(base_url, match=[matchers.request_kwargs_matcher({'timeout': (0.5, 3)})])
+            resp = repo.authenticated_get('')
+            self.assertEqual(resp.status_code, 200)
+
+    def test_warm(self) -> None:
+        base_url = self.start_server()
+        session = PooledSession(HttpOptions(pool_maxsize=3))
+        self.addCleanup(session.close)
+
+        # At most pool_maxsize connections are kept
+        self.assertEqual(session.warm(base_url, 5), 3)
+        self.assertEqual(session.warm(base_url, 2), 0)
+        for _ in range(3):
+            session.request('GET', f'{base_url}/ping')
+
+        stats = session.stats()
+        self.assertEqual(stats.misses, 0)
+        self.assertEqual(stats.hits, 3)
+
+    def test_warm_no_keep_alive(self) -> None:
+        base_url = self.start_server()
+        session = PooledSession(HttpOptions(keep_alive=False))
+        self.addCleanup(session.close)
+
+        self.assertEqual(session.warm(base_url, 2), 0)
@@ -0,0 +1,158 @@
+import base64
+import json
+import threading
+import time
+from typing import cast
+from unittest.mock import Mock
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from repositories.rest import CachingTokenProvider, StaticTokenProvider, TokenProvider
+from repositories.rest.token import decode_expiry
+
+
+def gen_jwt(exp: float) -> str:
+    def encode(data: dict[str, object]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip('=')
+
+    return f'{encode({"alg": "RS256"})}.{encode({"exp": exp})}.signature'
+
+
+class TestCachingTokenProvider(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+    def wait_for_refresh(self, provider: CachingTokenProvider) -> None:
+        # The background refresh releases the lock when it finishes
+        with provider._refresh_lock:  # noqa: SLF001
+            pass
+
+    def test_decode_expiry(self) -> None:
+        exp = time.time() + 3600
+        self.assertEqual(decode_expiry(gen_jwt(exp)), exp)
+
+    @parametrize(
+        'token',
+        [
+            ('opaque-token',),
+            ('a.b.c',),
+            (f'x.{base64.urlsafe_b64encode(b"[1]").decode()}.y',),
+        ],
+    )
+    def test_decode_expiry_invalid(self, token: str) -> None:
+        self.assertIsNone(decode_expiry(token))
+
+    def test_serves_cached_token(self) -> None:
+        token = gen_jwt(time.time() + 3600)
+        inner = Mock(TokenProvider)
+        cast(Mock, inner.get_token).return_value = token
+
+        provider = CachingTokenProvider(inner)
+
+        for _ in range(5):
+            self.assertEqual(provider.get_token(), token)
+
+        self.assertEqual(cast(Mock, inner.get_token).call_count, 1)
+        stats = provider.stats()
+        self.assertEqual(stats.refreshes, 1)
+        self.assertEqual(stats.hits, 4)
+
+    def test_cached_token(self) -> None:
+        token = gen_jwt(time.time() + 3600)
+        inner = Mock(TokenProvider)
+        cast(Mock, inner.get_token).return_value = token
+        provider = CachingTokenProvider(inner)
+
+        # Nothing cached yet, the caller has to fetch it
+        self.assertIsNone(provider.cached_token())
+        provider.get_token()
+
+        self.assertEqual(provider.cached_token(), token)
+        self.assertEqual(cast(Mock, inner.get_token).call_count, 1)
+
+    def test_no_cached_token_after_expiry(self) -> None:
+        inner = Mock(TokenProvider)
+        cast(Mock, inner.get_token).return_value = gen_jwt(time.time() - 1)
+        provider = CachingTokenProvider(inner)
+
+        provider.get_token()
+
+        self.assertIsNone(provider.cached_token())
+
+    def test_refreshes_expired_token(self) -> None:
+        old_token = gen_jwt(time.time() - 1)
+        new_token = gen_jwt(time.time() + 3600)
+        inner = Mock(TokenProvider)
+        cast(Mock, inner.get_token).side_effect = [old_token, new_token]
+
+        provider = CachingTokenProvider(inner)
+
+        self.assertEqual(provider.get_token(), old_token)
+        self.assertEqual(provider.get_token(), new_token)
+        self.assertEqual(provider.stats().refreshes, 2)
+
+    def test_refreshes_in_background_before_expiry(self) -> None:
+        old_token = gen_jwt(time.time() + 0.4)
+        new_token = gen_jwt(time.time() + 3600)
+        inner = Mock(TokenProvider)
+        cast(Mock, inner.get_token).side_effect = [old_token, new_token]
+
+        provider = CachingTokenProvider(inner, refresh_margin=300)
+
+        self.assertEqual(provider.get_token(), old_token)
+        # Refreshes are due halfway through the lifetime of short-lived tokens
+        time.sleep(0.25)
+        # Due for refresh, but still valid, so it is served while the refresh happens in the background
+        self.assertEqual(provider.get_token(), old_token)
+        self.wait_for_refresh(provider)
+        self.assertEqual(provider.get_token(), new_token)
+
+        stats = provider.stats()
+        self.assertEqual(stats.refreshes, 2)
+        self.assertEqual(stats.stale, 1)
+
+    def test_serves_stale_token_when_background_refresh_fails(self) -> None:
+        token = gen_jwt(time.time() + 0.4)
+        inner = Mock(TokenProvider)
+        cast(Mock, inner.get_token).side_effect = [token, RuntimeError('metadata server unavailable')]
+
+        provider = CachingTokenProvider(inner, refresh_margin=300)
+        provider.get_token()
+        time.sleep(0.25)
+
+        with self.assertLogs('CachingTokenProvider', 'ERROR'):
+            self.assertEqual(provider.get_token(), token)
+            self.wait_for_refresh(provider)
+
+        self.assertEqual(provider.stats().failures, 1)
+
+    def test_concurrent_callers_share_one_refresh(self) -> None:
+        token = gen_jwt(time.time() + 3600)
+        calls = 0
+
+        class SlowProvider:
+            def get_token(self) -> str:
+                nonlocal calls
+                calls += 1
+                time.sleep(0.05)
+                return token
+
+        provider = CachingTokenProvider(SlowProvider())
+        results: list[str] = []
+        threads = [threading.Thread(target=lambda: results.append(provider.get_token())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [token] * 8)
+        self.assertEqual(calls, 1)
+
+    def test_token_without_expiry(self) -> None:
+        token = self.faker.pystr()
+        provider = CachingTokenProvider(StaticTokenProvider(token), default_ttl=3600)
+
+        self.assertEqual(provider.get_token(), token)
+        self.assertEqual(provider.get_token(), token)
+        self.assertEqual(provider.stats().hits, 1)
@@ -21,7 +21,7 @@ class TestUser(ParametrizedTestCase):
 
         with responses.RequestsMock() as rsps:
             rsps.get(self.base_url)
-            repo.authenticated_get(self.base_url)
+            repo.authenticated_get('')
             self.assertNotIn('Authorization', rsps.calls[0].request.headers)
 
     def test_authenticated_get_with_token_provider(self) -> None:
@@ -33,9 +33,20 @@ class TestUser(ParametrizedTestCase):
 
         with responses.RequestsMock() as rsps:
             rsps.get(self.base_url)
-            repo.authenticated_get(self.base_url)
+            repo.authenticated_get('')
             self.assertEqual(rsps.calls[0].request.headers['Authorization'], f'Bearer {token}')
 
+    def test_probe(self) -> None:
+        with responses.RequestsMock() as rsps:
+            rsps.get(f'{self.base_url}/api/v1/health/user', json={'status': 'Ok'})
+            self.repo.probe()
+
+    def test_probe_unhealthy(self) -> None:
+        with responses.RequestsMock() as rsps:
+            rsps.get(f'{self.base_url}/api/v1/health/user', status=503)
+            with self.assertRaises(HTTPError):
+                self.repo.probe()
+
     def test_get_existing(self) -> None:
         user = User(
             id=cast(str, self.faker.uuid4()),
@@ -111,6 +122,29 @@ class TestUser(ParametrizedTestCase):
 
         self.assertEqual(user_repo, user)
 
+    def test_find_by_email_other_client(self) -> None:
+        user = User(
+            id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            name=self.faker.name(),
+            email=self.faker.email(),
+        )
+
+        with responses.RequestsMock() as rsps:
+            rsps.post(
+                f'{self.base_url}/api/v1/users/detail',
+                json={
+                    'id': user.id,
+                    'clientId': user.client_id,
+                    'name': user.name,
+                    'email': user.email,
+                },
+                status=200,
+            )
+
+            self.assertIsNone(self.repo.find_by_email(user.email, cast(str, self.faker.uuid4())))
+            self.assertEqual(self.repo.find_by_email(user.email, user.client_id), user)
+
     def test_find_by_email_not_found(self) -> None:
         email = self.faker.email()
 
@@ -141,8 +175,8 @@ class TestUser(ParametrizedTestCase):
         with responses.RequestsMock() as rsps:
             rsps.post(f'{self.base_url}/api/v1/users/detail', status=status)
 
-            user_repo = self.repo.find_by_email(email)
-            self.assertIsNone(user_repo)
+            with self.assertRaises(HTTPError):
+                self.repo.find_by_email(email)
 
     def test_find_by_email_with_token_provider(self) -> None:
         token = self.faker.pystr()
@@ -0,0 +1,57 @@
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import cast
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from models import StoredResponse
+from repositories.sqlite import SqliteIdempotencyRepository
+
+
+class TestSqliteIdempotencyRepository(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = str(Path(tmpdir.name) / 'idempotency.db')
+
+    def gen_response(self) -> StoredResponse:
+        return StoredResponse(
+            fingerprint=cast(str, self.faker.sha256()),
+            status=201,
+            body=self.faker.binary(length=64),
+            headers=(('Content-Type', 'application/json'), ('Location', self.faker.uri_path())),
+        )
+
+    def test_save_and_get(self) -> None:
+        repo = SqliteIdempotencyRepository(self.path)
+        key = cast(str, self.faker.uuid4())
+        response = self.gen_response()
+
+        self.assertIsNone(repo.get(key))
+        repo.save(key, response)
+
+        self.assertEqual(repo.get(key), response)
+
+    def test_survives_restart(self) -> None:
+        key = cast(str, self.faker.uuid4())
+        response = self.gen_response()
+        SqliteIdempotencyRepository(self.path).save(key, response)
+
+        self.assertEqual(SqliteIdempotencyRepository(self.path).get(key), response)
+
+    def test_expired_keys_dropped(self) -> None:
+        repo = SqliteIdempotencyRepository(self.path, ttl=0.05)
+        expired_key = cast(str, self.faker.uuid4())
+        repo.save(expired_key, self.gen_response())
+
+        time.sleep(0.1)
+        self.assertIsNone(repo.get(expired_key))
+
+        repo.save(cast(str, self.faker.uuid4()), self.gen_response())
+        with sqlite3.connect(self.path) as conn:
+            (count,) = conn.execute('SELECT COUNT(*) FROM idempotency_keys').fetchone()
+        self.assertEqual(count, 1)
@@ -0,0 +1,179 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import cast
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from models import Channel, Incident, IncidentResponse, Submission, SubmissionStatus
+from repositories.sqlite import SqliteSubmissionRepository
+
+
+class TestSqliteSubmissionRepository(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = str(Path(tmpdir.name) / 'incidents.db')
+        self.repo = SqliteSubmissionRepository(self.path)
+
+    def gen_incident(self) -> Incident:
+        return Incident(
+            client_id=cast(str, self.faker.uuid4()),
+            name=self.faker.word(),
+            channel=cast(Channel, self.faker.random_element(list(Channel))),
+            reported_by=cast(str, self.faker.uuid4()),
+            created_by=cast(str, self.faker.uuid4()),
+            description=self.faker.sentence(),
+            assigned_to=cast(str, self.faker.uuid4()),
+        )
+
+    def gen_response(self, incident: Incident) -> IncidentResponse:
+        return IncidentResponse(
+            id=cast(str, self.faker.uuid4()),
+            client_id=incident.client_id,
+            name=incident.name,
+            channel=incident.channel.value,
+            reported_by=incident.reported_by,
+            created_by=incident.created_by,
+            assigned_to=incident.assigned_to,
+        )
+
+    def test_enqueue_and_get(self) -> None:
+        incident = self.gen_incident()
+
+        submission = self.repo.enqueue(incident)
+        stored = self.repo.get(submission.id)
+
+        self.assertEqual(stored, submission)
+        self.assertEqual(submission.status, SubmissionStatus.QUEUED)
+        self.assertEqual(submission.incident, incident)
+
+    def test_get_not_found(self) -> None:
+        self.assertIsNone(self.repo.get(cast(str, self.faker.uuid4())))
+
+    def test_survives_reopening(self) -> None:
+        submission = self.repo.enqueue(self.gen_incident())
+
+        reopened = SqliteSubmissionRepository(self.path)
+
+        self.assertEqual(reopened.get(submission.id), submission)
+
+    def test_claim_in_order(self) -> None:
+        first = self.repo.enqueue(self.gen_incident())
+        second = self.repo.enqueue(self.gen_incident())
+
+        claimed = cast(Submission, self.repo.claim(60))
+        self.assertEqual(claimed.id, first.id)
+        self.assertEqual(claimed.status, SubmissionStatus.SENDING)
+        self.assertEqual(claimed.attempts, 1)
+
+        self.assertEqual(cast(Submission, self.repo.claim(60)).id, second.id)
+        self.assertIsNone(self.repo.claim(60))
+
+    def test_expired_lease_claimed_again(self) -> None:
+        submission = self.repo.enqueue(self.gen_incident())
+        self.repo.claim(0.05)
+
+        self.assertIsNone(self.repo.claim(0.05))
+        time.sleep(0.1)
+        claimed = self.repo.claim(60)
+
+        self.assertEqual(cast(Submission, claimed).id, submission.id)
+        self.assertEqual(cast(Submission, self.repo.get(submission.id)).attempts, 2)
+
+    def test_complete(self) -> None:
+        incident = self.gen_incident()
+        submission = self.repo.enqueue(incident)
+        self.repo.claim(60)
+        response = self.gen_response(incident)
+
+        self.repo.complete(submission.id, response)
+
+        stored = cast(Submission, self.repo.get(submission.id))
+        self.assertEqual(stored.status, SubmissionStatus.REGISTERED)
+        self.assertEqual(stored.response, response)
+        self.assertIsNone(self.repo.claim(60))
+
+    def test_retry(self) -> None:
+        submission = self.repo.enqueue(self.gen_incident())
+        self.repo.claim(60)
+
+        self.repo.retry(submission.id, 'HTTPError: 503', 0.05)
+
+        stored = cast(Submission, self.repo.get(submission.id))
+        self.assertEqual((stored.status, stored.error), (SubmissionStatus.QUEUED, 'HTTPError: 503'))
+        self.assertIsNone(self.repo.claim(60))
+        time.sleep(0.1)
+        self.assertEqual(cast(Submission, self.repo.claim(60)).id, submission.id)
+
+    def test_postpone(self) -> None:
+        submission = self.repo.enqueue(self.gen_incident())
+        self.repo.claim(60)
+
+        self.repo.postpone(submission.id, 'CircuitOpenError', 0.05)
+
+        stored = cast(Submission, self.repo.get(submission.id))
+        self.assertEqual((stored.status, stored.attempts), (SubmissionStatus.QUEUED, 0))
+        self.assertIsNone(self.repo.claim(60))
+        time.sleep(0.1)
+        self.assertEqual(cast(Submission, self.repo.claim(60)).attempts, 1)
+
+    def test_fail(self) -> None:
+        submission = self.repo.enqueue(self.gen_incident())
+        self.repo.claim(60)
+
+        self.repo.fail(submission.id, 'HTTPError: 400')
+
+        self.assertEqual(cast(Submission, self.repo.get(submission.id)).status, SubmissionStatus.FAILED)
+        self.assertIsNone(self.repo.claim(60))
+
+    def test_count_by_status(self) -> None:
+        for _ in range(3):
+            self.repo.enqueue(self.gen_incident())
+        self.repo.claim(60)
+
+        counts = self.repo.count_by_status()
+
+        self.assertEqual(counts[SubmissionStatus.QUEUED], 2)
+        self.assertEqual(counts[SubmissionStatus.SENDING], 1)
+        self.assertEqual(counts[SubmissionStatus.REGISTERED], 0)
+
+    def test_concurrent_claims_are_exclusive(self) -> None:
+        ids = {self.repo.enqueue(self.gen_incident()).id for _ in range(20)}
+        claimed: list[str] = []
+        lock = threading.Lock()
+
+        def worker() -> None:
+            # Separate repository objects behave like separate processes sharing the file
+            repo = SqliteSubmissionRepository(self.path)
+            while (submission := repo.claim(60)) is not None:
+                with lock:
+                    claimed.append(submission.id)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(claimed), sorted(ids))
+
+    def test_purge_settled(self) -> None:
+        registered = self.repo.enqueue(self.gen_incident())
+        self.repo.complete(registered.id, self.gen_response(registered.incident))
+        failed = self.repo.enqueue(self.gen_incident())
+        self.repo.fail(failed.id, self.faker.sentence())
+        queued = self.repo.enqueue(self.gen_incident())
+        time.sleep(0.01)
+        recent = self.repo.enqueue(self.gen_incident())
+        self.repo.fail(recent.id, self.faker.sentence())
+
+        self.assertEqual(self.repo.purge(0.005), 2)
+
+        self.assertIsNone(self.repo.get(registered.id))
+        self.assertIsNone(self.repo.get(failed.id))
+        self.assertIsNotNone(self.repo.get(queued.id))
+        self.assertIsNotNone(self.repo.get(recent.id))
@@ -0,0 +1,59 @@
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from util.admission import AdaptiveLimiter
+
+
+class TestAdaptiveLimiter(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.limiter = AdaptiveLimiter(initial_limit=4, min_limit=2, max_limit=6, latency_target=1)
+
+    def acquire(self, times: int) -> None:
+        for _ in range(times):
+            self.assertTrue(self.limiter.try_acquire())
+
+    def test_rejects_beyond_limit(self) -> None:
+        self.acquire(4)
+
+        self.assertFalse(self.limiter.try_acquire())
+
+        self.limiter.release(0.1)
+        self.assertTrue(self.limiter.try_acquire())
+        stats = self.limiter.stats()
+        self.assertEqual((stats.in_flight, stats.admitted, stats.rejected), (4, 5, 1))
+
+    def test_slow_requests_decrease_limit(self) -> None:
+        self.acquire(4)
+
+        for _ in range(4):
+            self.limiter.release(self.faker.pyfloat(min_value=1.1, max_value=10))
+
+        self.assertEqual(self.limiter.limit, 2)
+        self.assertAlmostEqual(self.limiter.stats().limit, 4 * 0.9**4)
+
+    def test_limit_not_below_minimum(self) -> None:
+        for _ in range(20):
+            self.acquire(1)
+            self.limiter.release(5)
+
+        self.assertEqual(self.limiter.stats().limit, 2)
+
+    def test_fast_requests_increase_limit(self) -> None:
+        for _ in range(20):
+            self.acquire(self.limiter.limit)
+            for _ in range(self.limiter.limit):
+                self.limiter.release(0.1)
+
+        self.assertEqual(self.limiter.limit, 6)
+
+    def test_idle_does_not_increase_limit(self) -> None:
+        for _ in range(20):
+            self.acquire(1)
+            self.limiter.release(0.1)
+
+        self.assertEqual(self.limiter.stats().limit, 4)
+
+    def test_initial_limit_within_bounds(self) -> None:
+        self.assertEqual(AdaptiveLimiter(initial_limit=100, max_limit=10).limit, 10)
+        self.assertEqual(AdaptiveLimiter(initial_limit=0, min_limit=3).limit, 3)
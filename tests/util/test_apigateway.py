@@ -0,0 +1,128 @@
+import base64
+import json
+from typing import Any, cast
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from models import Claims, Role
+from util.apigateway import AuthPolicy, AuthRejection, RejectionCounter, decode_userinfo
+
+
+class TestApiGateway(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+    def gen_token(self, role: Role = Role.AGENT) -> dict[str, Any]:
+        return {
+            'sub': cast(str, self.faker.uuid4()),
+            'cid': cast(str, self.faker.uuid4()),
+            'role': role.value,
+            'aud': role.value,
+        }
+
+    def test_decode_userinfo(self) -> None:
+        token = self.gen_token()
+        # Without padding, as forwarded by the gateway
+        userinfo = base64.urlsafe_b64encode(json.dumps(token).encode()).decode().rstrip('=')
+
+        self.assertEqual(decode_userinfo(userinfo), token)
+        self.assertIsNone(decode_userinfo(None))
+        self.assertIsNone(decode_userinfo('not a token'))
+        self.assertIsNone(decode_userinfo(base64.urlsafe_b64encode(b'[]').decode()))
+
+    def test_claims(self) -> None:
+        token = self.gen_token(Role.ADMIN)
+
+        claims = AuthPolicy().check(token)
+
+        self.assertEqual(claims, Claims(sub=token['sub'], cid=token['cid'], role=Role.ADMIN, aud=token['aud']))
+        self.assertFalse(hasattr(claims, '__dict__'))
+
+    @parametrize(
+        ('missing', 'message'),
+        [
+            (('aud',), 'aud is missing in token'),
+            (('role', 'aud'), 'role is missing in token'),
+            (('sub', 'cid'), 'sub is missing in token'),
+        ],
+    )
+    def test_missing_claim(self, missing: tuple[str, ...], message: str) -> None:
+        token = self.gen_token()
+        for claim in missing:
+            del token[claim]
+
+        rejection = AuthPolicy().check(token)
+
+        self.assertEqual(rejection, AuthRejection('missing_claim', message, 401))
+
+    def test_route_claims(self) -> None:
+        token = self.gen_token()
+        policy = AuthPolicy(claims=['email', 'sub', 'email'])
+
+        self.assertEqual(policy.claims, ('email',))
+        self.assertEqual(policy.check(token), AuthRejection('missing_claim', 'email is missing in token', 401))
+        # Claims every route requires are checked first
+        del token['aud']
+        self.assertEqual(policy.check(token), AuthRejection('missing_claim', 'aud is missing in token', 401))
+        token['aud'] = Role.AGENT.value
+        token['email'] = self.faker.email()
+        self.assertIsInstance(policy.check(token), Claims)
+
+    def test_missing_token(self) -> None:
+        self.assertEqual(AuthPolicy().check(None), AuthRejection('missing_token', 'Token is missing', 401))
+
+    @parametrize(
+        ('role', 'allowed'),
+        [
+            (Role.ADMIN, True),
+            (Role.AGENT, True),
+            (Role.ANALYST, False),
+            (Role.USER, False),
+        ],
+    )
+    def test_roles(self, role: Role, *, allowed: bool) -> None:
+        result = AuthPolicy([Role.ADMIN, Role.AGENT]).check(self.gen_token(role))
+
+        self.assertEqual(isinstance(result, Claims), allowed)
+        if not allowed:
+            self.assertEqual(cast(AuthRejection, result).reason, 'forbidden_role')
+
+    @parametrize(
+        ('role',),
+        [
+            ('owner',),
+            (['admin'],),
+            (None,),
+        ],
+    )
+    def test_unknown_role(self, role: object) -> None:
+        token = self.gen_token()
+        token['role'] = role
+
+        self.assertEqual(cast(AuthRejection, AuthPolicy().check(token)).status, 403)
+
+    def test_client_required(self) -> None:
+        token = self.gen_token(Role.USER)
+        token['cid'] = None
+
+        rejection = AuthPolicy([Role.ADMIN], client=True).check(token)
+        claims = cast(Claims, AuthPolicy().check(token))
+
+        # The missing client is reported before the role
+        self.assertEqual(rejection, AuthRejection('missing_client', 'Unauthorized: You do not belong to any client.', 401))
+        self.assertIsNone(claims.cid)
+        with self.assertRaises(ValueError):
+            _ = claims.client_id
+
+    def test_rejection_counter(self) -> None:
+        counter = RejectionCounter()
+
+        counter.add('missing_token')
+        counter.add('missing_token')
+        counter.add('forbidden_role')
+
+        self.assertEqual(
+            counter.counts(),
+            {'missing_token': 2, 'missing_claim': 0, 'missing_client': 0, 'forbidden_role': 1},
+        )
@@ -0,0 +1,117 @@
+import contextlib
+import datetime
+import io
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import cast
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from models import AuditRecord, Channel
+from util.audit import AuditFileWriter, decode_records, encode_batch, log_files, main, query, read_file
+
+
+class TestAudit(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = Path(tmpdir.name)
+
+    def gen_record(self, client_id: str | None = None, timestamp: float | None = None) -> AuditRecord:
+        return AuditRecord(
+            timestamp=time.time() if timestamp is None else timestamp,
+            channel=cast(Channel, self.faker.random_element(list(Channel))),
+            client_id=client_id or cast(str, self.faker.uuid4()),
+            user_id=cast(str, self.faker.uuid4()),
+            assigned_to=cast(str, self.faker.uuid4()),
+            status=self.faker.random_element([201, 202, 404, 502]),
+            # Stored as a 32-bit float
+            latency=0.125,
+        )
+
+    def test_encode_decode(self) -> None:
+        records = [self.gen_record() for _ in range(3)]
+        records.append(AuditRecord(time.time(), Channel.MOBILE, None, cast(str, self.faker.uuid4()), None, 404, 0.5))
+
+        batches = encode_batch(records[:2]) + encode_batch(records[2:]) + encode_batch([])
+
+        self.assertEqual(list(decode_records(io.BytesIO(batches))), records)
+
+    def test_not_a_batch(self) -> None:
+        with self.assertRaises(ValueError):
+            list(decode_records(io.BytesIO(b'\0' * 64)))
+
+    def test_write_and_read(self) -> None:
+        writer = AuditFileWriter(str(self.path))
+        first = [self.gen_record() for _ in range(5)]
+        second = [self.gen_record() for _ in range(5)]
+
+        writer.write(first)
+        writer.write(second)
+
+        files = log_files(self.path)
+        self.assertEqual(len(files), 1)
+        self.assertEqual(list(read_file(files[0])), first + second)
+
+    def test_rotation(self) -> None:
+        writer = AuditFileWriter(str(self.path), max_file_bytes=1, max_files=3)
+        batches = [[self.gen_record()] for _ in range(5)]
+
+        for batch in batches:
+            writer.write(batch)
+
+        # Every batch fills a file, only the newest files are kept
+        files = log_files(self.path)
+        self.assertEqual(len(files), 3)
+        self.assertEqual([record for file in files for record in read_file(file)], [b[0] for b in batches[2:]])
+
+    def test_truncated_batch(self) -> None:
+        writer = AuditFileWriter(str(self.path))
+        records = [self.gen_record() for _ in range(3)]
+        writer.write(records)
+        file = log_files(self.path)[0]
+        size = file.stat().st_size
+        writer.write([self.gen_record() for _ in range(3)])
+        # The second batch was cut short
+        file.write_bytes(file.read_bytes()[: size + 20])
+
+        self.assertEqual(list(read_file(file)), records)
+
+    def test_query(self) -> None:
+        client_id = cast(str, self.faker.uuid4())
+        now = time.time()
+        records = [self.gen_record(client_id, now - 3600), self.gen_record(None, now), self.gen_record(client_id, now)]
+        AuditFileWriter(str(self.path)).write(records)
+
+        self.assertEqual(list(query(self.path, client_id, None, None)), [records[0], records[2]])
+        self.assertEqual(list(query(self.path, client_id, now - 60, None)), [records[2]])
+        self.assertEqual(list(query(self.path, None, None, now - 60)), [records[0]])
+        self.assertEqual(list(query(self.path / 'missing', None, None, None)), [])
+
+    def test_cli(self) -> None:
+        record = self.gen_record(timestamp=datetime.datetime(2024, 5, 1, 12, tzinfo=datetime.UTC).timestamp())
+        AuditFileWriter(str(self.path)).write([record, self.gen_record()])
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            main(['--path', str(self.path), '--client-id', cast(str, record.client_id), '--since', '2024-05-01T11:00:00'])
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(
+            lines,
+            [
+                {
+                    'time': '2024-05-01T12:00:00+00:00',
+                    'channel': record.channel.value,
+                    'client_id': record.client_id,
+                    'user_id': record.user_id,
+                    'assigned_to': record.assigned_to,
+                    'status': record.status,
+                    'latency_ms': 125.0,
+                }
+            ],
+        )
@@ -0,0 +1,86 @@
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from util.breaker import CircuitBreaker, CircuitOpenError, CircuitState
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(self.faker.word(), failure_threshold=3, reset_timeout=10, clock=self.clock)
+
+    def record_failures(self, times: int) -> None:
+        for _ in range(times):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self) -> None:
+        self.record_failures(2)
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+        self.record_failures(1)
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+        with self.assertRaises(CircuitOpenError) as ctx:
+            self.breaker.before_call()
+
+        self.assertEqual(ctx.exception.retry_after, 10)
+        stats = self.breaker.stats()
+        self.assertEqual((stats.rejected, stats.opened), (1, 1))
+
+    def test_failures_while_open_ignored(self) -> None:
+        self.record_failures(3)
+        self.clock.now = 4
+
+        # Calls started before the circuit opened
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.stats().opened, 1)
+        with self.assertRaises(CircuitOpenError) as ctx:
+            self.breaker.before_call()
+        self.assertEqual(ctx.exception.retry_after, 6)
+        self.clock.now = 10
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+
+    def test_success_resets_failures(self) -> None:
+        self.record_failures(2)
+        self.breaker.record_success()
+        self.record_failures(2)
+
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    def test_half_open_success_closes(self) -> None:
+        self.record_failures(3)
+        self.clock.now = 10
+
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+        self.breaker.before_call()
+        # Only one trial call at a time
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    def test_half_open_failure_reopens(self) -> None:
+        self.record_failures(3)
+        self.clock.now = 10
+
+        self.record_failures(1)
+
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        self.assertEqual(self.breaker.stats().opened, 2)
+        self.clock.now = 15
+        with self.assertRaises(CircuitOpenError) as ctx:
+            self.breaker.before_call()
+        self.assertEqual(ctx.exception.retry_after, 5)
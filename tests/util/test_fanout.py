@@ -0,0 +1,146 @@
+import threading
+import time
+from collections.abc import Iterator
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from util import FanOut
+
+
+class TestFanOut(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+    def slow(self, value: str, delay: float = 0.1) -> str:
+        time.sleep(delay)
+        return value
+
+    def test_gather_enabled_runs_concurrently(self) -> None:
+        fanout = FanOut(max_workers=4, endpoints=['Endpoint'])
+        self.addCleanup(fanout.shutdown)
+
+        start = time.perf_counter()
+        result = fanout.gather('Endpoint', lambda: self.slow('a'), lambda: self.slow('b'), lambda: self.slow('c'))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(result, ('a', 'b', 'c'))
+        self.assertLess(elapsed, 0.25)
+
+    def test_gather_disabled_runs_sequentially(self) -> None:
+        fanout = FanOut(max_workers=4, endpoints=[])
+        self.addCleanup(fanout.shutdown)
+        threads: list[str] = []
+
+        def record() -> str:
+            threads.append(threading.current_thread().name)
+            return 'x'
+
+        result = fanout.gather('Endpoint', record, record)
+
+        self.assertEqual(result, ('x', 'x'))
+        self.assertEqual(threads, [threading.current_thread().name] * 2)
+
+    def test_gather_propagates_errors(self) -> None:
+        fanout = FanOut(max_workers=4, endpoints=['Endpoint'])
+        self.addCleanup(fanout.shutdown)
+
+        def fail() -> str:
+            raise ValueError(self.faker.sentence())
+
+        with self.assertRaises(ValueError):
+            fanout.gather('Endpoint', lambda: 'ok', fail)
+
+    def test_saturated_executor_runs_inline(self) -> None:
+        fanout = FanOut(max_workers=1, endpoints=['Endpoint'])
+        self.addCleanup(fanout.shutdown)
+        release = threading.Event()
+        blocker = fanout.submit(release.wait)
+
+        future = fanout.submit(threading.current_thread)
+
+        self.assertTrue(future.done())
+        self.assertIs(future.result(), threading.current_thread())
+        release.set()
+        blocker.result()
+
+    def test_saturated_executor_inline_error(self) -> None:
+        fanout = FanOut(max_workers=1, endpoints=['Endpoint'])
+        self.addCleanup(fanout.shutdown)
+        release = threading.Event()
+        blocker = fanout.submit(release.wait)
+
+        def fail() -> None:
+            raise ValueError(self.faker.sentence())
+
+        future = fanout.submit(fail)
+
+        self.assertIsInstance(future.exception(), ValueError)
+        release.set()
+        blocker.result()
+
+    def test_map_enabled_runs_concurrently(self) -> None:
+        fanout = FanOut(max_workers=4, endpoints=['Endpoint'])
+        self.addCleanup(fanout.shutdown)
+        values = [self.faker.pystr() for _ in range(4)]
+
+        start = time.perf_counter()
+        result = fanout.map('Endpoint', self.slow, values)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(result, values)
+        self.assertLess(elapsed, 0.3)
+
+    def test_map_disabled_runs_sequentially(self) -> None:
+        fanout = FanOut(max_workers=4, endpoints=[])
+        self.addCleanup(fanout.shutdown)
+        threads: list[str] = []
+
+        def record(value: int) -> int:
+            threads.append(threading.current_thread().name)
+            return value * 2
+
+        self.assertEqual(fanout.map('Endpoint', record, [1, 2, 3]), [2, 4, 6])
+        self.assertEqual(threads, [threading.current_thread().name] * 3)
+
+    def test_stream_keeps_order(self) -> None:
+        fanout = FanOut(max_workers=4, endpoints=['Endpoint'])
+        self.addCleanup(fanout.shutdown)
+        values = [self.faker.pystr() for _ in range(8)]
+        delays = [0.05, 0, 0.02, 0, 0.05, 0, 0, 0.01]
+
+        start = time.perf_counter()
+        result = list(fanout.stream('Endpoint', lambda item: self.slow(*item), zip(values, delays, strict=True), 4))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(result, values)
+        self.assertLess(elapsed, sum(delays))
+
+    def test_stream_bounds_items_taken(self) -> None:
+        fanout = FanOut(max_workers=4, endpoints=['Endpoint'])
+        self.addCleanup(fanout.shutdown)
+        taken: list[int] = []
+
+        def items() -> Iterator[int]:
+            for item in range(100):
+                taken.append(item)
+                yield item
+
+        results = fanout.stream('Endpoint', lambda item: item * 2, items(), 3)
+
+        self.assertEqual(next(results), 0)
+        # The first result is only yielded once the window is full
+        self.assertEqual(len(taken), 4)
+        self.assertEqual(list(results), [item * 2 for item in range(1, 100)])
+
+    def test_stream_disabled_runs_sequentially(self) -> None:
+        fanout = FanOut(max_workers=4, endpoints=[])
+        self.addCleanup(fanout.shutdown)
+        threads: list[str] = []
+
+        def record(value: int) -> int:
+            threads.append(threading.current_thread().name)
+            return value * 2
+
+        self.assertEqual(list(fanout.stream('Endpoint', record, [1, 2, 3], 2)), [2, 4, 6])
+        self.assertEqual(threads, [threading.current_thread().name] * 3)
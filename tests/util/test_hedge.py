@@ -0,0 +1,181 @@
+import threading
+import time
+from unittest import mock
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from util.hedge import Hedger
+from util.retry import RetryBudget
+
+
+class ScriptedCall:
+    def __init__(self, *delays: float, fail: tuple[int, ...] = ()) -> None:
+        # Delay of each call, and the calls that raise instead of returning their index
+        self.delays = delays
+        self.fail = fail
+        self.calls = 0
+        self.threads: list[threading.Thread] = []
+        self.lock = threading.Lock()
+
+    def __call__(self) -> int:
+        with self.lock:
+            index = self.calls
+            self.calls += 1
+            self.threads.append(threading.current_thread())
+
+        time.sleep(self.delays[index])
+        if index in self.fail:
+            raise RuntimeError(f'call {index} failed')
+        return index
+
+
+class TestHedger(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.hedger = Hedger(percentile=90, min_delay=0.01)
+
+    def warm_up(self, latency: float) -> None:
+        for _ in range(Hedger.min_samples):
+            self.hedger.observe(latency)
+        # One hedge allowed
+        self.hedger.budget = RetryBudget(ratio=0, min_per_second=0, max_tokens=1)
+
+    def test_not_hedged_without_latencies(self) -> None:
+        call = ScriptedCall(0.05)
+
+        self.assertEqual(self.hedger.run(call), 0)
+
+        self.assertIsNone(self.hedger.delay)
+        self.assertEqual(call.threads, [threading.current_thread()])
+        self.assertEqual(self.hedger.stats().eligible, 0)
+
+    def test_delay_from_percentile(self) -> None:
+        for latency in range(1, 101):
+            self.hedger.observe(latency / 1000)
+
+        self.assertEqual(self.hedger.delay, 0.091)
+
+    def test_delay_not_below_minimum(self) -> None:
+        self.warm_up(0.001)
+
+        self.assertEqual(self.hedger.delay, 0.01)
+
+    def test_fast_call_not_hedged(self) -> None:
+        self.warm_up(0.05)
+        call = ScriptedCall(0)
+
+        self.assertEqual(self.hedger.run(call), 0)
+
+        self.assertEqual(call.calls, 1)
+        stats = self.hedger.stats()
+        self.assertEqual((stats.eligible, stats.hedged, stats.won), (1, 0, 0))
+
+    def test_slow_call_hedged(self) -> None:
+        self.warm_up(0.01)
+        call = ScriptedCall(0.5, 0)
+
+        start = time.perf_counter()
+        result = self.hedger.run(call)
+
+        self.assertEqual(result, 1)
+        self.assertLess(time.perf_counter() - start, 0.3)
+        stats = self.hedger.stats()
+        self.assertEqual((stats.eligible, stats.hedged, stats.won), (1, 1, 1))
+
+    def test_first_call_wins(self) -> None:
+        self.warm_up(0.01)
+        call = ScriptedCall(0.05, 0.5)
+
+        self.assertEqual(self.hedger.run(call), 0)
+
+        self.assertEqual(call.calls, 2)
+        self.assertEqual(self.hedger.stats().won, 0)
+
+    def test_failed_call_waits_for_other(self) -> None:
+        self.warm_up(0.01)
+        call = ScriptedCall(0.05, 0.1, fail=(0,))
+
+        self.assertEqual(self.hedger.run(call), 1)
+        self.assertEqual(self.hedger.stats().won, 1)
+
+    def test_both_failed(self) -> None:
+        self.warm_up(0.01)
+        call = ScriptedCall(0.05, 0, fail=(0, 1))
+
+        with self.assertRaisesRegex(RuntimeError, 'call 0 failed'):
+            self.hedger.run(call)
+
+    def test_budget_starts_empty(self) -> None:
+        hedger = Hedger(percentile=90, min_delay=0.01)
+        for _ in range(Hedger.min_samples):
+            hedger.observe(0.01)
+        call = ScriptedCall(0.05)
+
+        self.assertEqual(hedger.run(call), 0)
+
+        self.assertEqual(call.threads, [threading.current_thread()])
+        stats = hedger.stats()
+        self.assertEqual((stats.eligible, stats.hedged, stats.refused), (1, 0, 1))
+
+    def test_budget_exhausted(self) -> None:
+        self.warm_up(0.01)
+        call = ScriptedCall(0.2, 0, 0)
+
+        self.assertEqual(self.hedger.run(call), 1)
+        self.assertEqual(self.hedger.run(call), 2)
+
+        # The budget was spent by the first call, the second one runs in the calling thread
+        self.assertEqual(call.calls, 3)
+        self.assertEqual(call.threads[2], threading.current_thread())
+        stats = self.hedger.stats()
+        self.assertEqual((stats.eligible, stats.hedged, stats.refused), (2, 1, 1))
+
+    def test_budget_spent_while_waiting(self) -> None:
+        self.warm_up(0.01)
+        call = ScriptedCall(0.05)
+
+        # Another call took the last token after this one started
+        with mock.patch.object(self.hedger.budget, 'try_withdraw', return_value=False):
+            self.assertEqual(self.hedger.run(call), 0)
+
+        self.assertEqual(call.calls, 1)
+
+    def test_refused_while_budget_empty(self) -> None:
+        self.warm_up(0.01)
+        self.hedger.budget = RetryBudget(ratio=0, min_per_second=0, max_tokens=1, initial_tokens=0)
+
+        for _ in range(5):
+            self.hedger.run(ScriptedCall(0))
+
+        stats = self.hedger.stats()
+        self.assertEqual((stats.eligible, stats.hedged, stats.refused), (5, 0, 5))
+
+    def test_no_free_worker(self) -> None:
+        hedger = Hedger(percentile=90, min_delay=0.01, max_workers=1)
+        for _ in range(Hedger.min_samples):
+            hedger.observe(0.01)
+        hedger.budget = RetryBudget(ratio=0, min_per_second=0, max_tokens=1)
+        call = ScriptedCall(0.05)
+
+        self.assertEqual(hedger.run(call), 0)
+
+        # The first request took the only worker, so no second one was sent
+        self.assertEqual(call.calls, 1)
+        self.assertNotEqual(call.threads, [threading.current_thread()])
+        stats = hedger.stats()
+        self.assertEqual((stats.eligible, stats.hedged, stats.busy), (1, 0, 1))
+
+    def test_runs_inline_without_free_worker(self) -> None:
+        hedger = Hedger(percentile=90, min_delay=0.01, max_workers=1)
+        for _ in range(Hedger.min_samples):
+            hedger.observe(0.01)
+        hedger.budget = RetryBudget(ratio=0, min_per_second=0, max_tokens=1)
+        call = ScriptedCall(0)
+
+        with mock.patch.object(hedger, '_slots', threading.BoundedSemaphore(1)) as slots:
+            slots.acquire()
+            self.assertEqual(hedger.run(call), 0)
+
+        self.assertEqual(call.threads, [threading.current_thread()])
+        self.assertEqual(hedger.stats().busy, 1)
@@ -0,0 +1,111 @@
+import threading
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from util.metrics import Histogram, MetricsRegistry, counter_family, render_families
+
+
+class TestHistogram(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+    def test_collect(self) -> None:
+        histogram = Histogram('test_seconds', 'Test.', ('route',), buckets=(0.1, 1.0))
+        histogram.observe(('/a',), 0.05)
+        histogram.observe(('/a',), 0.1)
+        histogram.observe(('/a',), 0.5)
+        histogram.observe(('/a',), 2)
+
+        samples = [(sample.suffix, sample.labels, sample.value) for sample in histogram.collect().samples]
+
+        self.assertEqual(
+            samples,
+            [
+                ('_bucket', {'route': '/a', 'le': '0.1'}, 2),
+                ('_bucket', {'route': '/a', 'le': '1.0'}, 3),
+                ('_bucket', {'route': '/a', 'le': '+Inf'}, 4),
+                ('_sum', {'route': '/a'}, 2.65),
+                ('_count', {'route': '/a'}, 4),
+            ],
+        )
+
+    def test_merges_threads(self) -> None:
+        histogram = Histogram('test_seconds', 'Test.', ('route',))
+
+        def observe() -> None:
+            for _ in range(100):
+                histogram.observe(('/a',), 0.01)
+
+        threads = [threading.Thread(target=observe) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        count = next(sample for sample in histogram.collect().samples if sample.suffix == '_count')
+        self.assertEqual(count.value, 400)
+
+    def test_exited_threads_retired(self) -> None:
+        histogram = Histogram('test_seconds', 'Test.', ('route',))
+        histogram.observe(('/a',), 0.01)
+
+        for _ in range(50):
+            thread = threading.Thread(target=histogram.observe, args=(('/a',), 0.01))
+            thread.start()
+            thread.join()
+
+        # Only the shard of the live thread is kept, the counts of the others are kept in the totals
+        self.assertEqual(len(histogram._shards), 1)  # noqa: SLF001
+        count = next(sample for sample in histogram.collect().samples if sample.suffix == '_count')
+        self.assertEqual(count.value, 51)
+
+        histogram.reset()
+        self.assertEqual(histogram.collect().samples, [])
+
+    def test_disabled(self) -> None:
+        histogram = Histogram('test_seconds', 'Test.', ('route',))
+        histogram.enabled = False
+        histogram.observe(('/a',), 0.01)
+
+        self.assertEqual(histogram.collect().samples, [])
+
+    def test_reset(self) -> None:
+        histogram = Histogram('test_seconds', 'Test.', ('route',))
+        histogram.observe(('/a',), 0.01)
+        histogram.reset()
+
+        self.assertEqual(histogram.collect().samples, [])
+
+
+class TestMetricsRegistry(ParametrizedTestCase):
+    def test_render(self) -> None:
+        registry = MetricsRegistry()
+        histogram = registry.histogram('test_seconds', 'Time spent.', ('route',))
+        histogram.observe(('/a"b',), 0.002)
+
+        text = registry.render([counter_family('test_total', 'Things.', [({'result': 'hit'}, 3)])])
+
+        self.assertIn('# HELP test_seconds Time spent.\n# TYPE test_seconds histogram\n', text)
+        self.assertIn('test_seconds_bucket{route="/a\\"b",le="0.001"} 0\n', text)
+        self.assertIn('test_seconds_bucket{route="/a\\"b",le="0.0025"} 1\n', text)
+        self.assertIn('test_seconds_count{route="/a\\"b"} 1\n', text)
+        self.assertIn('# TYPE test_total counter\ntest_total{result="hit"} 3\n', text)
+
+    def test_set_enabled(self) -> None:
+        registry = MetricsRegistry()
+        histogram = registry.histogram('test_seconds', 'Time spent.', ())
+        registry.set_enabled(False)
+        histogram.observe((), 1)
+        registry.set_enabled(True)
+        histogram.observe((), 1)
+
+        self.assertIn('test_seconds_count 1\n', registry.render())
+        registry.reset()
+        self.assertNotIn('test_seconds_count', registry.render())
+
+    def test_render_families_without_labels(self) -> None:
+        self.assertEqual(
+            render_families([counter_family('test_total', 'Things.', [({}, 1.5)])]),
+            '# HELP test_total Things.\n# TYPE test_total counter\ntest_total 1.5\n',
+        )
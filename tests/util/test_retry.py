@@ -0,0 +1,71 @@
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from util.retry import RetryBudget, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRetryBudget(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.clock = FakeClock()
+
+    def test_starts_full(self) -> None:
+        budget = RetryBudget(ratio=0.1, min_per_second=0, max_tokens=2, clock=self.clock)
+
+        self.assertTrue(budget.try_withdraw())
+        self.assertTrue(budget.try_withdraw())
+        self.assertFalse(budget.try_withdraw())
+
+        stats = budget.stats()
+        self.assertEqual((stats.retries, stats.exhausted), (2, 1))
+
+    def test_deposits_per_request(self) -> None:
+        budget = RetryBudget(ratio=0.25, min_per_second=0, max_tokens=1, clock=self.clock)
+        budget.try_withdraw()
+
+        for _ in range(3):
+            budget.deposit()
+        self.assertFalse(budget.try_withdraw())
+
+        budget.deposit()
+        self.assertTrue(budget.try_withdraw())
+
+    def test_refills_over_time(self) -> None:
+        budget = RetryBudget(ratio=0, min_per_second=0.5, max_tokens=1, clock=self.clock)
+        budget.try_withdraw()
+
+        self.clock.now = 1
+        self.assertFalse(budget.try_withdraw())
+        self.clock.now = 2
+        self.assertTrue(budget.try_withdraw())
+
+
+class TestRetryPolicy(ParametrizedTestCase):
+    def test_max_attempts(self) -> None:
+        policy = RetryPolicy(RetryBudget(), max_attempts=3)
+
+        self.assertTrue(policy.should_retry(1))
+        self.assertTrue(policy.should_retry(2))
+        self.assertFalse(policy.should_retry(3))
+
+    @parametrize(
+        ('attempt', 'limit'),
+        [
+            (1, 0.05),
+            (2, 0.1),
+            (5, 0.5),
+        ],
+    )
+    def test_backoff(self, attempt: int, limit: float) -> None:
+        policy = RetryPolicy(RetryBudget(), backoff_base=0.05, backoff_max=0.5)
+
+        for _ in range(20):
+            self.assertLessEqual(policy.backoff(attempt), limit)
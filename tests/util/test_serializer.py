@@ -0,0 +1,77 @@
+import json
+import sys
+from typing import cast
+from unittest.mock import patch
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from models import Channel, IncidentResponse
+from util.serializer import JsonSerializer, OrjsonSerializer, StdlibJsonSerializer, create_serializer
+
+
+class TestSerializer(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+    def gen_incident_response(self) -> IncidentResponse:
+        return IncidentResponse(
+            id=cast(str, self.faker.uuid4()),
+            client_id=cast(str, self.faker.uuid4()),
+            name=self.faker.word(),
+            channel=Channel.MOBILE,
+            reported_by=cast(str, self.faker.uuid4()),
+            created_by=cast(str, self.faker.uuid4()),
+            assigned_to=cast(str, self.faker.uuid4()),
+        )
+
+    @parametrize(
+        'serializer',
+        [
+            (StdlibJsonSerializer(),),
+            (OrjsonSerializer(),),
+        ],
+    )
+    def test_dataclass(self, serializer: JsonSerializer) -> None:
+        incident = self.gen_incident_response()
+
+        data = json.loads(serializer.dumps(incident))
+
+        self.assertEqual(list(data), ['id', 'client_id', 'name', 'channel', 'reported_by', 'created_by', 'assigned_to'])
+        self.assertEqual(data['id'], incident.id)
+        self.assertEqual(data['channel'], Channel.MOBILE.value)
+
+    @parametrize(
+        'serializer',
+        [
+            (StdlibJsonSerializer(),),
+            (OrjsonSerializer(),),
+        ],
+    )
+    def test_dict(self, serializer: JsonSerializer) -> None:
+        body = {'message': self.faker.sentence(), 'code': 400}
+
+        self.assertEqual(json.loads(serializer.dumps(body)), body)
+
+    @parametrize(
+        'serializer',
+        [
+            (StdlibJsonSerializer(),),
+            (OrjsonSerializer(),),
+        ],
+    )
+    def test_unsupported_type(self, serializer: JsonSerializer) -> None:
+        with self.assertRaises(TypeError):
+            serializer.dumps({'value': object()})
+
+    def test_create_serializer(self) -> None:
+        self.assertEqual(create_serializer().name, 'orjson')
+        self.assertEqual(create_serializer('orjson').name, 'orjson')
+        self.assertEqual(create_serializer('stdlib').name, 'stdlib')
+
+    def test_create_serializer_without_orjson(self) -> None:
+        with patch.dict(sys.modules, {'orjson': None}):
+            self.assertEqual(create_serializer().name, 'stdlib')
+
+            with self.assertRaises(ImportError):
+                create_serializer('orjson')
@@ -0,0 +1,63 @@
+import threading
+import time
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from util.singleflight import SingleFlight
+
+
+class TestSingleFlight(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+    def run_concurrently(self, target: object, count: int) -> None:
+        threads = [threading.Thread(target=target) for _ in range(count)]  # type: ignore[arg-type]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_concurrent_calls_are_shared(self) -> None:
+        flight: SingleFlight[str, str] = SingleFlight()
+        value = self.faker.pystr()
+        calls = 0
+        results: list[str] = []
+
+        def load() -> str:
+            nonlocal calls
+            calls += 1
+            time.sleep(0.1)
+            return value
+
+        self.run_concurrently(lambda: results.append(flight.do('key', load)), 8)
+
+        self.assertEqual(results, [value] * 8)
+        self.assertEqual(calls, 1)
+        self.assertEqual((flight.executed, flight.shared), (1, 7))
+
+    def test_errors_are_shared(self) -> None:
+        flight: SingleFlight[str, str] = SingleFlight()
+        errors: list[Exception] = []
+
+        def load() -> str:
+            time.sleep(0.1)
+            raise RuntimeError('unavailable')
+
+        def call() -> None:
+            try:
+                flight.do('key', load)
+            except RuntimeError as exc:
+                errors.append(exc)
+
+        self.run_concurrently(call, 4)
+
+        self.assertEqual(len(errors), 4)
+        self.assertEqual(flight.executed, 1)
+
+    def test_sequential_calls_run_again(self) -> None:
+        flight: SingleFlight[str, int] = SingleFlight()
+
+        self.assertEqual(flight.do('key', lambda: 1), 1)
+        self.assertEqual(flight.do('key', lambda: 2), 2)
+        self.assertEqual(flight.executed, 2)
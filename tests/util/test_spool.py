@@ -0,0 +1,45 @@
+import io
+import tempfile
+from pathlib import Path
+from typing import IO, cast
+from unittest import mock
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from util.spool import UploadSpool
+
+
+class TestUploadSpool(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = Path(tmpdir.name)
+
+    def test_small_upload(self) -> None:
+        data = self.faker.binary(length=100)
+        spool = UploadSpool(str(self.path), max_bytes=1000, memory_bytes=200)
+
+        body = cast(IO[bytes], spool.read(io.BytesIO(data)))
+
+        self.assertEqual(body.read(), data)
+        body.close()
+
+    def test_large_upload_written_to_path(self) -> None:
+        data = self.faker.binary(length=300 * 1024)
+        spool = UploadSpool(str(self.path), max_bytes=len(data), memory_bytes=1024)
+
+        with mock.patch('util.spool.tempfile.SpooledTemporaryFile', wraps=tempfile.SpooledTemporaryFile) as spooled:
+            body = cast(IO[bytes], spool.read(io.BytesIO(data)))
+
+        self.assertEqual(body.read(), data)
+        body.close()
+        spooled.assert_called_once_with(max_size=1024, dir=str(self.path))
+        self.assertEqual(list(self.path.iterdir()), [])
+
+    def test_too_large(self) -> None:
+        spool = UploadSpool(str(self.path), max_bytes=1000, memory_bytes=100)
+
+        self.assertIsNone(spool.read(io.BytesIO(self.faker.binary(length=1001))))
+        self.assertEqual(list(self.path.iterdir()), [])
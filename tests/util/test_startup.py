@@ -0,0 +1,69 @@
+import subprocess
+import sys
+import time
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from app import create_app
+from util.startup import Phase, StartupProfile, parse_importtime
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 | site
+import time:       200 |        200 |     flask.json
+import time:      1000 |       1200 |   flask
+import time:       300 |        300 |   blueprints
+import time:       500 |       2000 | app
+import time:       700 |        700 | late
+"""
+
+
+class TestStartup(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+    def test_phases(self) -> None:
+        profile = StartupProfile()
+        name = self.faker.word()
+
+        with profile.phase(name):
+            time.sleep(0.01)
+        with profile.phase('other'):
+            pass
+
+        self.assertEqual([phase.name for phase in profile.phases], [name, 'other'])
+        self.assertGreaterEqual(profile.seconds(name), 0.01)
+        self.assertAlmostEqual(profile.total, sum(phase.seconds for phase in profile.phases))
+
+    def test_phase_recorded_on_error(self) -> None:
+        profile = StartupProfile()
+
+        with self.assertRaises(RuntimeError), profile.phase('failing'):
+            raise RuntimeError
+
+        self.assertEqual(len(profile.phases), 1)
+
+    def test_parse_importtime(self) -> None:
+        total, modules = parse_importtime(IMPORTTIME_OUTPUT, 'app')
+
+        self.assertEqual(total, 0.002)
+        self.assertEqual(modules, [Phase('flask', 0.0012), Phase('blueprints', 0.0003)])
+
+    def test_parse_importtime_missing_module(self) -> None:
+        with self.assertRaises(ValueError):
+            parse_importtime(IMPORTTIME_OUTPUT, 'missing')
+
+    def test_create_app_phases(self) -> None:
+        app = create_app()
+
+        self.assertEqual([phase.name for phase in app.startup.phases], ['container', 'environment', 'blueprints'])
+
+    def test_app_import_skips_cloud_libraries(self) -> None:
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, '-c', 'import sys, app; print("google.cloud.logging" in sys.modules)'],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        self.assertEqual(result.stdout.strip(), 'False')
@@ -0,0 +1,79 @@
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from util.ttlcache import MISSING, TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.clock = FakeClock()
+
+    def test_get_set(self) -> None:
+        cache: TTLCache[str, str] = TTLCache(10, self.clock)
+        key = self.faker.pystr()
+        value = self.faker.pystr()
+
+        self.assertIs(cache.get(key), MISSING)
+        cache.set(key, value, 60)
+        self.assertEqual(cache.get(key), value)
+
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (1, 1, 1))
+        self.assertEqual(stats.hit_ratio, 0.5)
+
+    def test_caches_none(self) -> None:
+        cache: TTLCache[str, str | None] = TTLCache(10, self.clock)
+        cache.set('key', None, 60)
+
+        self.assertIsNone(cache.get('key'))
+
+    def test_expiration(self) -> None:
+        cache: TTLCache[str, str] = TTLCache(10, self.clock)
+        cache.set('short', 'a', 10)
+        cache.set('long', 'b', 60)
+
+        self.clock.now = 10
+        self.assertIs(cache.get('short'), MISSING)
+        self.assertEqual(cache.get('long'), 'b')
+
+        stats = cache.stats()
+        self.assertEqual((stats.expirations, stats.size), (1, 1))
+
+    def test_lru_eviction(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(2, self.clock)
+        cache.set('a', 1, 60)
+        cache.set('b', 2, 60)
+        # Using a makes b the least recently used entry
+        cache.get('a')
+        cache.set('c', 3, 60)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIs(cache.get('b'), MISSING)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats().evictions, 1)
+
+    def test_delete_and_clear(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(10, self.clock)
+        cache.set('a', 1, 60)
+        cache.set('b', 2, 60)
+
+        cache.delete('a')
+        self.assertIs(cache.get('a'), MISSING)
+        cache.clear()
+        self.assertEqual(cache.stats().size, 0)
+
+    def test_zero_ttl_not_stored(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(10, self.clock)
+        cache.set('a', 1, 0)
+
+        self.assertIs(cache.get('a'), MISSING)
+        self.assertEqual(cache.stats().hit_ratio, 0.0)
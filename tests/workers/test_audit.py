@@ -0,0 +1,83 @@
+import time
+from typing import cast
+from unittest.mock import Mock
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from models import AuditRecord, Channel
+from util.audit import AuditFileWriter
+from workers import AuditLog
+
+
+class TestAuditLog(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        self.writer = Mock(AuditFileWriter)
+        self.written: list[AuditRecord] = []
+        cast(Mock, self.writer.write).side_effect = self.written.extend
+        self.log = AuditLog(self.writer, capacity=5, batch_size=3)
+
+    def gen_record(self) -> AuditRecord:
+        return AuditRecord(
+            timestamp=time.time(),
+            channel=Channel.WEB,
+            client_id=cast(str, self.faker.uuid4()),
+            user_id=cast(str, self.faker.uuid4()),
+            assigned_to=cast(str, self.faker.uuid4()),
+            status=201,
+            latency=self.faker.pyfloat(min_value=0, max_value=1),
+        )
+
+    def test_flush(self) -> None:
+        records = [self.gen_record() for _ in range(2)]
+        for record in records:
+            self.log.record(record)
+
+        self.assertEqual(self.log.flush(), 2)
+        self.assertEqual(self.log.flush(), 0)
+
+        self.assertEqual(self.written, records)
+        stats = self.log.stats()
+        self.assertEqual((stats.recorded, stats.written, stats.buffered), (2, 2, 0))
+
+    def test_drops_when_full(self) -> None:
+        records = [self.gen_record() for _ in range(7)]
+        for record in records:
+            self.log.record(record)
+
+        self.log.flush()
+
+        self.assertEqual(self.written, records[:5])
+        stats = self.log.stats()
+        self.assertEqual((stats.recorded, stats.dropped), (5, 2))
+
+    def test_write_failure(self) -> None:
+        cast(Mock, self.writer.write).side_effect = OSError('disk full')
+        self.log.record(self.gen_record())
+
+        with self.assertLogs('AuditLog', 'ERROR'):
+            self.assertEqual(self.log.flush(), 0)
+
+        stats = self.log.stats()
+        self.assertEqual((stats.written, stats.failed, stats.buffered), (0, 1, 0))
+
+    def test_background_flush(self) -> None:
+        self.log.flush_interval = 10
+        self.log.start()
+        self.addCleanup(self.log.stop)
+        records = [self.gen_record() for _ in range(4)]
+
+        # A full batch is written without waiting for the interval
+        for record in records[:3]:
+            self.log.record(record)
+        for _ in range(100):
+            if self.written:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.written, records[:3])
+
+        # The rest is written on stop
+        self.log.record(records[3])
+        self.log.stop()
+        self.assertEqual(self.written, records)
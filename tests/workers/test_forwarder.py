@@ -0,0 +1,175 @@
+import tempfile
+import time
+from pathlib import Path
+from typing import cast
+from unittest.mock import Mock
+
+import requests
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase, parametrize
+
+from models import Channel, Incident, IncidentResponse, Submission, SubmissionStatus
+from repositories import IncidentRepository
+from repositories.sqlite import SqliteSubmissionRepository
+from util.breaker import CircuitOpenError
+from workers import IncidentForwarder
+
+
+class TestIncidentForwarder(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.submissions = SqliteSubmissionRepository(str(Path(tmpdir.name) / 'incidents.db'))
+        self.incident_repo = Mock(IncidentRepository)
+        cast(Mock, self.incident_repo.create).side_effect = lambda incident, **_: self.gen_response(incident)
+        self.forwarder = IncidentForwarder(self.submissions, self.incident_repo, workers=2, max_attempts=3)
+        self.forwarder.backoff_base = 0.01
+        self.forwarder.backoff_max = 0.01
+
+    def gen_incident(self) -> Incident:
+        return Incident(
+            client_id=cast(str, self.faker.uuid4()),
+            name=self.faker.word(),
+            channel=Channel.WEB,
+            reported_by=cast(str, self.faker.uuid4()),
+            created_by=cast(str, self.faker.uuid4()),
+            description=self.faker.sentence(),
+            assigned_to=cast(str, self.faker.uuid4()),
+        )
+
+    def gen_response(self, incident: Incident) -> IncidentResponse:
+        return IncidentResponse(
+            id=cast(str, self.faker.uuid4()),
+            client_id=incident.client_id,
+            name=incident.name,
+            channel=incident.channel.value,
+            reported_by=incident.reported_by,
+            created_by=incident.created_by,
+            assigned_to=incident.assigned_to,
+        )
+
+    def http_error(self, status: int) -> requests.HTTPError:
+        response = requests.Response()
+        response.status_code = status
+        return requests.HTTPError(f'{status} Error', response=response)
+
+    def status_of(self, submission_id: str) -> SubmissionStatus:
+        submission = cast(Submission, self.submissions.get(submission_id))
+        return submission.status
+
+    def test_forward_success(self) -> None:
+        submission = self.submissions.enqueue(self.gen_incident())
+
+        self.assertTrue(self.forwarder.forward_next())
+
+        stored = cast(Submission, self.submissions.get(submission.id))
+        self.assertEqual(stored.status, SubmissionStatus.REGISTERED)
+        self.assertEqual(cast(IncidentResponse, stored.response).name, submission.incident.name)
+        self.assertFalse(self.forwarder.forward_next())
+        cast(Mock, self.incident_repo.create).assert_called_once_with(submission.incident, idempotency_key=submission.id)
+
+    def test_transient_error_retried(self) -> None:
+        submission = self.submissions.enqueue(self.gen_incident())
+        cast(Mock, self.incident_repo.create).side_effect = [self.http_error(503), self.gen_response(submission.incident)]
+
+        with self.assertLogs('IncidentForwarder', 'WARNING'):
+            self.forwarder.forward_next()
+
+        self.assertEqual(self.status_of(submission.id), SubmissionStatus.QUEUED)
+        time.sleep(0.02)
+        self.forwarder.forward_next()
+        self.assertEqual(self.status_of(submission.id), SubmissionStatus.REGISTERED)
+
+    def test_circuit_open_waits_for_breaker(self) -> None:
+        submission = self.submissions.enqueue(self.gen_incident())
+        cast(Mock, self.incident_repo.create).side_effect = CircuitOpenError('incidentmodify', 30)
+
+        with self.assertLogs('IncidentForwarder', 'WARNING'):
+            self.forwarder.forward_next()
+
+        self.assertEqual(self.status_of(submission.id), SubmissionStatus.QUEUED)
+        self.assertIsNone(self.submissions.claim(60))
+
+    def test_circuit_open_not_counted_as_attempt(self) -> None:
+        submission = self.submissions.enqueue(self.gen_incident())
+        cast(Mock, self.incident_repo.create).side_effect = CircuitOpenError('incidentmodify', 0)
+
+        # More rejections than max_attempts
+        with self.assertLogs('IncidentForwarder', 'WARNING'):
+            for _ in range(5):
+                self.forwarder.forward_next()
+                time.sleep(0.02)
+
+        stored = cast(Submission, self.submissions.get(submission.id))
+        self.assertEqual(stored.status, SubmissionStatus.QUEUED)
+        self.assertEqual(stored.attempts, 0)
+        self.assertEqual(stored.error, 'CircuitOpenError: Circuit incidentmodify is open')
+
+    @parametrize(
+        'status',
+        [
+            (408,),
+            (429,),
+        ],
+    )
+    def test_timeout_and_throttling_retried(self, status: int) -> None:
+        submission = self.submissions.enqueue(self.gen_incident())
+        cast(Mock, self.incident_repo.create).side_effect = self.http_error(status)
+
+        with self.assertLogs('IncidentForwarder', 'WARNING'):
+            self.forwarder.forward_next()
+
+        self.assertEqual(self.status_of(submission.id), SubmissionStatus.QUEUED)
+
+    def test_permanent_error_fails(self) -> None:
+        submission = self.submissions.enqueue(self.gen_incident())
+        cast(Mock, self.incident_repo.create).side_effect = self.http_error(400)
+
+        with self.assertLogs('IncidentForwarder', 'ERROR'):
+            self.forwarder.forward_next()
+
+        stored = cast(Submission, self.submissions.get(submission.id))
+        self.assertEqual(stored.status, SubmissionStatus.FAILED)
+        self.assertEqual(stored.error, 'HTTPError: 400 Error')
+
+    def test_gives_up_after_max_attempts(self) -> None:
+        submission = self.submissions.enqueue(self.gen_incident())
+        cast(Mock, self.incident_repo.create).side_effect = self.http_error(503)
+
+        with self.assertLogs('IncidentForwarder', 'WARNING'):
+            for _ in range(3):
+                self.forwarder.forward_next()
+                time.sleep(0.02)
+
+        self.assertEqual(self.status_of(submission.id), SubmissionStatus.FAILED)
+        self.assertEqual(cast(Mock, self.incident_repo.create).call_count, 3)
+
+    def test_workers_drain_queue(self) -> None:
+        self.forwarder.poll_interval = 0.01
+        ids = [self.submissions.enqueue(self.gen_incident()).id for _ in range(10)]
+
+        self.forwarder.start()
+        self.addCleanup(self.forwarder.stop)
+        for _ in range(200):
+            if self.submissions.count_by_status()[SubmissionStatus.REGISTERED] == len(ids):
+                break
+            time.sleep(0.01)
+        self.forwarder.stop()
+
+        self.assertTrue(all(self.status_of(submission_id) == SubmissionStatus.REGISTERED for submission_id in ids))
+        self.assertEqual(cast(Mock, self.incident_repo.create).call_count, 10)
+
+    def test_settled_submissions_purged(self) -> None:
+        self.forwarder.retention = 0
+        submission = self.submissions.enqueue(self.gen_incident())
+        self.forwarder.forward_next()
+        queued = self.submissions.enqueue(self.gen_incident())
+        time.sleep(0.01)
+
+        self.assertEqual(self.forwarder.purge_settled(), 1)
+        # Not again until purge_interval elapsed
+        self.assertEqual(self.forwarder.purge_settled(), 0)
+
+        self.assertIsNone(self.submissions.get(submission.id))
+        self.assertEqual(self.status_of(queued.id), SubmissionStatus.QUEUED)
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from workers import HealthMonitor
+
+
+class TestHealthMonitor(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+    def test_probes_run_concurrently(self) -> None:
+        monitor = HealthMonitor()
+        # Each probe waits for the others, so they only succeed when run at the same time
+        barrier = threading.Barrier(3, timeout=5)
+        for name in ('user', 'client', 'incidentmodify'):
+            monitor.add(name, barrier.wait)
+
+        monitor.refresh()
+
+        results = monitor.results()
+        self.assertEqual(set(results), {'user', 'client', 'incidentmodify'})
+        self.assertTrue(all(result.healthy and result.error is None for result in results.values()))
+
+    def test_failed_probe(self) -> None:
+        monitor = HealthMonitor()
+        message = self.faker.sentence()
+
+        def fail() -> None:
+            time.sleep(0.01)
+            raise RuntimeError(message)
+
+        monitor.add('user', fail)
+
+        with self.assertLogs('HealthMonitor', 'WARNING'):
+            monitor.refresh()
+
+        result = monitor.results()['user']
+        self.assertFalse(result.healthy)
+        self.assertEqual(result.error, message)
+        self.assertGreaterEqual(result.latency, 0.01)
+        self.assertAlmostEqual(result.checked_at, time.time(), delta=1)
+
+    def test_results_are_snapshots(self) -> None:
+        monitor = HealthMonitor()
+        monitor.add('user', lambda: None)
+
+        before = monitor.results()
+        monitor.refresh()
+
+        self.assertEqual(before, {})
+        self.assertIn('user', monitor.results())
+
+    def test_background_refresh(self) -> None:
+        monitor = HealthMonitor(interval=0.01)
+        probed = threading.Semaphore(0)
+        monitor.add('user', probed.release)
+
+        monitor.start()
+        self.addCleanup(monitor.stop)
+
+        # Probed again every interval
+        self.assertTrue(probed.acquire(timeout=5))
+        self.assertTrue(probed.acquire(timeout=5))
+        monitor.stop(5)
+        self.assertIsNone(monitor._thread)  # noqa: SLF001
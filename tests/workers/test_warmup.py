@@ -0,0 +1,67 @@
+import threading
+
+from faker import Faker
+from unittest_parametrize import ParametrizedTestCase
+
+from workers import Warmup
+
+
+class TestWarmup(ParametrizedTestCase):
+    def setUp(self) -> None:
+        self.faker = Faker()
+
+    def test_tasks_run_in_parallel(self) -> None:
+        warmup = Warmup(max_workers=2)
+        # Each task waits for the other one, so they only finish when run at the same time
+        barrier = threading.Barrier(2, timeout=5)
+        warmup.add('first', barrier.wait)
+        warmup.add('second', barrier.wait)
+
+        self.assertFalse(warmup.status().ready)
+        warmup.start()
+
+        self.assertTrue(warmup.wait(5))
+        status = warmup.status()
+        self.assertTrue(status.ready)
+        self.assertEqual([(task.name, task.status) for task in status.tasks], [('first', 'done'), ('second', 'done')])
+
+    def test_failed_task(self) -> None:
+        warmup = Warmup()
+        message = self.faker.sentence()
+
+        def fail() -> None:
+            raise RuntimeError(message)
+
+        warmup.add('failing', fail)
+        warmup.add('working', lambda: None)
+
+        with self.assertLogs('Warmup', 'ERROR'):
+            warmup.start()
+            warmup.wait(5)
+
+        failing, working = warmup.status().tasks
+        self.assertEqual((failing.status, failing.error), ('failed', message))
+        self.assertEqual((working.status, working.error), ('done', None))
+        self.assertTrue(warmup.status().ready)
+
+    def test_timeout(self) -> None:
+        warmup = Warmup(timeout=0.05)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        warmup.add('slow', release.wait)
+
+        with self.assertLogs('Warmup', 'WARNING'):
+            warmup.start()
+            self.assertTrue(warmup.wait(5))
+
+        # Ready even though the task is still running
+        [task] = warmup.status().tasks
+        self.assertEqual((task.status, task.duration), ('pending', None))
+
+    def test_no_tasks(self) -> None:
+        warmup = Warmup()
+
+        warmup.start()
+
+        self.assertTrue(warmup.wait(5))
+        self.assertEqual(warmup.status().tasks, ())
@@ -0,0 +1,4 @@
+from .fanout import FanOut
+from .serializer import JsonSerializer, create_serializer
+
+__all__ = ['FanOut', 'JsonSerializer', 'create_serializer']
@@ -0,0 +1,69 @@
+import threading
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class AdmissionStats:
+    limit: float
+    in_flight: int
+    admitted: int
+    rejected: int
+
+
+# Concurrency limit adapted with AIMD from the latency of completed requests. While requests complete within the latency
+# target and the limit is in use, it grows by one per limit's worth of completions. Every slower request shrinks it by
+# backoff_ratio, so requests beyond what the instance (and its dependencies) can serve are rejected instead of queued.
+class AdaptiveLimiter:
+    backoff_ratio = 0.9
+    # Seconds a rejected client is asked to wait before retrying
+    retry_after = 1
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 2,
+        max_limit: int = 64,
+        latency_target: float = 1,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._in_flight >= int(self._limit):
+                self._rejected += 1
+                return False
+
+            self._in_flight += 1
+            self._admitted += 1
+            return True
+
+    def release(self, latency: float) -> None:
+        with self._lock:
+            # The limit only grows while it is actually being used, not while the instance is mostly idle
+            utilized = self._in_flight * 2 >= self._limit
+            self._in_flight -= 1
+
+            if latency > self.latency_target:
+                self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+            elif utilized:
+                self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+
+    def stats(self) -> AdmissionStats:
+        with self._lock:
+            return AdmissionStats(
+                limit=self._limit,
+                in_flight=self._in_flight,
+                admitted=self._admitted,
+                rejected=self._rejected,
+            )
@@ -0,0 +1,96 @@
+import base64
+import binascii
+import json
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from models import Claims, Role
+
+
+def decode_userinfo(userinfo: str | None) -> dict[str, Any] | None:
+    if not userinfo:
+        return None
+
+    userinfo = userinfo + '=' * (4 - len(userinfo) % 4)
+
+    try:
+        token = json.loads(base64.urlsafe_b64decode(userinfo))
+    except (binascii.Error, ValueError):
+        return None
+
+    return token if isinstance(token, dict) else None
+
+
+@dataclass(frozen=True)
+class AuthRejection:
+    reason: str
+    message: str
+    status: int
+
+
+TOKEN_MISSING = AuthRejection('missing_token', 'Token is missing', 401)
+CLIENT_MISSING = AuthRejection('missing_client', 'Unauthorized: You do not belong to any client.', 401)
+ROLE_FORBIDDEN = AuthRejection('forbidden_role', 'Forbidden: You do not have access to this resource.', 403)
+# Claims checked in this order, the first one missing is reported
+REQUIRED_CLAIMS = ('sub', 'cid', 'role', 'aud')
+CLAIM_MISSING = {claim: AuthRejection('missing_claim', f'{claim} is missing in token', 401) for claim in REQUIRED_CLAIMS}
+REJECTION_REASONS = ('missing_token', 'missing_claim', 'missing_client', 'forbidden_role')
+
+
+# Authorization policy of a route: the roles allowed (any by default), whether the token must belong to a client and the
+# claims it must have.
+# Everything that does not depend on the token is worked out once, when the route is defined.
+class AuthPolicy:
+    def __init__(self, roles: Iterable[Role] | None = None, *, client: bool = False, claims: Iterable[str] = ()) -> None:
+        self.roles = frozenset(Role if roles is None else roles)
+        self.client = client
+        # Claims the route requires on top of REQUIRED_CLAIMS, which every route needs to build its Claims
+        self.claims = tuple(claim for claim in dict.fromkeys(claims) if claim not in REQUIRED_CLAIMS)
+        # Looking up the role claim checks it is allowed and converts it in one step
+        self._roles = {role.value: role for role in self.roles}
+        self._missing = [(claim, AuthRejection('missing_claim', f'{claim} is missing in token', 401)) for claim in self.claims]
+
+    def check(self, token: dict[str, Any] | None) -> Claims | AuthRejection:
+        if token is None:
+            return TOKEN_MISSING
+
+        try:
+            sub = token['sub']
+            cid = token['cid']
+            role = token['role']
+            aud = token['aud']
+        except KeyError as err:
+            return CLAIM_MISSING[err.args[0]]
+
+        for claim, rejection in self._missing:
+            if claim not in token:
+                return rejection
+
+        if cid is None and self.client:
+            return CLIENT_MISSING
+
+        allowed = self._roles.get(role) if type(role) is str else None
+        if allowed is None:
+            return ROLE_FORBIDDEN
+
+        return Claims(sub, cid, allowed, aud)
+
+
+class RejectionCounter:
+    def __init__(self) -> None:
+        self._counts = dict.fromkeys(REJECTION_REASONS, 0)
+        self._lock = threading.Lock()
+
+    def add(self, reason: str) -> None:
+        with self._lock:
+            self._counts[reason] += 1
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+# Requests rejected by the policy of their route, by reason
+auth_rejections = RejectionCounter()
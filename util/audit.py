@@ -0,0 +1,181 @@
+# Audit log files: batches of registrations appended as gzip members to files that are rotated by size. Each batch is
+# a magic, a record count and the records, each a fixed header followed by its strings in UTF-8.
+#
+#   python -m util.audit --path /tmp/registroapp-audit --client-id <client id> --since 2024-01-01T00:00:00+00:00
+import argparse
+import datetime
+import gzip
+import io
+import json
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from models import AuditRecord, Channel
+
+MAGIC = b'RAU1'
+BATCH = struct.Struct('<4sI')
+# timestamp, latency, status, channel, then the byte lengths of client_id, user_id and assigned_to
+RECORD = struct.Struct('<dfHBHHH')
+NONE_LENGTH = 0xFFFF
+CHANNELS = tuple(Channel)
+CHANNEL_CODES = {channel: code for code, channel in enumerate(CHANNELS)}
+FILE_PREFIX = 'audit-'
+FILE_SUFFIX = '.bin.gz'
+DEFAULT_PATH = str(Path(tempfile.gettempdir()) / 'registroapp-audit')
+
+
+def _encode_str(value: str | None) -> bytes:
+    # Ids are far below the 64 KiB a length can describe
+    return b'' if value is None else value.encode()[: NONE_LENGTH - 1]
+
+
+def encode_batch(records: Iterable[AuditRecord]) -> bytes:
+    parts = [b'']
+    count = 0
+    for record in records:
+        client_id = _encode_str(record.client_id)
+        user_id = _encode_str(record.user_id)
+        assigned_to = _encode_str(record.assigned_to)
+        parts.append(
+            RECORD.pack(
+                record.timestamp,
+                record.latency,
+                record.status,
+                CHANNEL_CODES[record.channel],
+                NONE_LENGTH if record.client_id is None else len(client_id),
+                len(user_id),
+                NONE_LENGTH if record.assigned_to is None else len(assigned_to),
+            )
+        )
+        parts += [client_id, user_id, assigned_to]
+        count += 1
+
+    parts[0] = BATCH.pack(MAGIC, count)
+    return b''.join(parts)
+
+
+def _read_str(stream: io.BufferedIOBase, length: int) -> str | None:
+    return None if length == NONE_LENGTH else stream.read(length).decode()
+
+
+def decode_records(stream: io.BufferedIOBase) -> Iterator[AuditRecord]:
+    while header := stream.read(BATCH.size):
+        magic, count = BATCH.unpack(header)
+        if magic != MAGIC:
+            raise ValueError('Not an audit log batch')
+
+        for _ in range(count):
+            timestamp, latency, status, channel, client_id, user_id, assigned_to = RECORD.unpack(stream.read(RECORD.size))
+            yield AuditRecord(
+                timestamp=timestamp,
+                channel=CHANNELS[channel],
+                client_id=_read_str(stream, client_id),
+                user_id=_read_str(stream, user_id) or '',
+                assigned_to=_read_str(stream, assigned_to),
+                status=status,
+                latency=latency,
+            )
+
+
+def read_file(path: Path) -> Iterator[AuditRecord]:
+    # Batches are read one at a time. A batch cut short (the process died while writing it) ends the file.
+    with gzip.open(path, 'rb') as stream:
+        try:
+            yield from decode_records(stream)
+        except (EOFError, zlib.error, gzip.BadGzipFile, struct.error):
+            return
+
+
+def log_files(path: Path) -> list[Path]:
+    # Oldest first, the names start with the time the file was created
+    return sorted(path.glob(f'{FILE_PREFIX}*{FILE_SUFFIX}'))
+
+
+def file_started_at(path: Path) -> float:
+    stamp = path.name.removeprefix(FILE_PREFIX).split('-', 1)[0]
+    return datetime.datetime.strptime(stamp, '%Y%m%dT%H%M%S%f').replace(tzinfo=datetime.UTC).timestamp()
+
+
+class AuditFileWriter:
+    def __init__(self, path: str, max_file_bytes: int = 1024 * 1024, max_files: int = 4) -> None:
+        self.path = Path(path)
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self._current: Path | None = None
+
+    def write(self, records: Iterable[AuditRecord]) -> None:
+        if self._current is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            now = datetime.datetime.now(datetime.UTC)
+            self._current = self.path / f'{FILE_PREFIX}{now:%Y%m%dT%H%M%S%f}-{os.getpid()}{FILE_SUFFIX}'
+            self._remove_old_files()
+
+        # Every batch is a complete gzip member, so a file can be read while it is still being written
+        with self._current.open('ab') as file:
+            file.write(gzip.compress(encode_batch(records), compresslevel=6))
+            size = file.tell()
+
+        if size >= self.max_file_bytes:
+            self._current = None
+
+    def _remove_old_files(self) -> None:
+        # Keeps max_files, counting the one just started
+        files = log_files(self.path)
+        for old in files[: max(0, len(files) - self.max_files + 1)]:
+            old.unlink(missing_ok=True)
+
+
+def parse_time(value: str) -> float:
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.UTC)
+    return parsed.timestamp()
+
+
+def query(path: Path, client_id: str | None, since: float | None, until: float | None) -> Iterator[AuditRecord]:
+    files = log_files(path)
+    for index, file in enumerate(files):
+        # Records are written before the next file is started, so files followed by one started before the range are skipped
+        if since is not None and index + 1 < len(files) and file_started_at(files[index + 1]) < since:
+            continue
+
+        for record in read_file(file):
+            if client_id is not None and record.client_id != client_id:
+                continue
+            if (since is not None and record.timestamp < since) or (until is not None and record.timestamp > until):
+                continue
+            yield record
+
+
+def record_to_dict(record: AuditRecord) -> dict[str, object]:
+    return {
+        'time': datetime.datetime.fromtimestamp(record.timestamp, datetime.UTC).isoformat(),
+        'channel': record.channel.value,
+        'client_id': record.client_id,
+        'user_id': record.user_id,
+        'assigned_to': record.assigned_to,
+        'status': record.status,
+        'latency_ms': round(record.latency * 1e3, 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Query the registration audit log')
+    parser.add_argument('--path', default=os.getenv('AUDIT_PATH', DEFAULT_PATH), help='audit log directory')
+    parser.add_argument('--client-id', help='only registrations of this client')
+    parser.add_argument('--since', type=parse_time, help='ISO 8601 time, UTC unless given')
+    parser.add_argument('--until', type=parse_time, help='ISO 8601 time, UTC unless given')
+    args = parser.parse_args(argv)
+
+    # One JSON object per line
+    for record in query(Path(args.path), args.client_id, args.since, args.until):
+        sys.stdout.write(json.dumps(record_to_dict(record)) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import StrEnum
+
+
+class CircuitState(StrEnum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f'Circuit {name} is open')
+        self.name = name
+        # Seconds until the circuit lets a trial call through
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class BreakerStats:
+    state: CircuitState
+    # Calls rejected without reaching the downstream service
+    rejected: int
+    # Times the circuit went from closed (or half open) to open
+    opened: int
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        # Consecutive failures that open the circuit
+        self.failure_threshold = failure_threshold
+        # Time the circuit stays open before letting trial calls through
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._rejected = 0
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state()
+
+    def before_call(self) -> None:
+        with self._lock:
+            state = self._current_state()
+
+            if state == CircuitState.HALF_OPEN and self._trials < self.half_open_max_calls:
+                self._trials += 1
+                return
+
+            if state != CircuitState.CLOSED:
+                self._rejected += 1
+                retry_after = max(self._opened_at + self.reset_timeout - self.clock(), 0)
+                raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trials = 0
+            self._state = CircuitState.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            state = self._current_state()
+            self._failures += 1
+
+            # Calls that were already in flight when the circuit opened do not open it again
+            if state == CircuitState.HALF_OPEN or (state == CircuitState.CLOSED and self._failures >= self.failure_threshold):
+                self._state = CircuitState.OPEN
+                self._opened_at = self.clock()
+                self._trials = 0
+                self._opened += 1
+
+    def stats(self) -> BreakerStats:
+        with self._lock:
+            return BreakerStats(state=self._current_state(), rejected=self._rejected, opened=self._opened)
+
+    def _current_state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and self.clock() >= self._opened_at + self.reset_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._trials = 0
+
+        return self._state
@@ -0,0 +1,83 @@
+import functools
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar, overload
+
+A = TypeVar('A')
+B = TypeVar('B')
+C = TypeVar('C')
+T = TypeVar('T')
+
+
+class FanOut:
+    def __init__(self, max_workers: int, endpoints: Iterable[str]) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fanout')
+        # Endpoints (view names) whose independent calls run concurrently, the rest run them one after another
+        self.endpoints = frozenset(endpoints)
+        # Calls are never queued behind a saturated executor, they run in the caller thread instead
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def enabled(self, endpoint: str) -> bool:
+        return endpoint in self.endpoints
+
+    @overload
+    def gather(self, endpoint: str, a: Callable[[], A], b: Callable[[], B], /) -> tuple[A, B]: ...
+
+    @overload
+    def gather(self, endpoint: str, a: Callable[[], A], b: Callable[[], B], c: Callable[[], C], /) -> tuple[A, B, C]: ...
+
+    def gather(self, endpoint: str, *calls: Callable[[], Any]) -> tuple[Any, ...]:
+        if not self.enabled(endpoint):
+            return tuple(call() for call in calls)
+
+        # The first call runs in the caller thread, the others are handed to the executor
+        futures = [self.submit(call) for call in calls[1:]]
+        first = calls[0]()
+        return (first, *(future.result() for future in futures))
+
+    def map(self, endpoint: str, fn: Callable[[T], A], items: Iterable[T]) -> list[A]:
+        if not self.enabled(endpoint):
+            return [fn(item) for item in items]
+
+        # Items beyond the free executor slots run in the caller thread, so a batch never queues behind itself
+        futures = [self.submit(functools.partial(fn, item)) for item in items]
+        return [future.result() for future in futures]
+
+    def stream(self, endpoint: str, fn: Callable[[T], A], items: Iterable[T], window: int) -> Iterator[A]:
+        # Results in the order of the items, with at most window calls in flight. The next item is only taken once there is
+        # room, so items produced lazily (like lines read from a request) are read no faster than they are processed.
+        if not self.enabled(endpoint):
+            yield from map(fn, items)
+            return
+
+        pending: deque[Future[A]] = deque()
+        for item in items:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(self.submit(functools.partial(fn, item)))
+
+        while pending:
+            yield pending.popleft().result()
+
+    def submit(self, call: Callable[[], A]) -> Future[A]:
+        if not self._slots.acquire(blocking=False):
+            future: Future[A] = Future()
+            try:
+                future.set_result(call())
+            except Exception as exc:  # noqa: BLE001
+                future.set_exception(exc)
+            return future
+
+        try:
+            future = self.executor.submit(call)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
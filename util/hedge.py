@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TypeVar
+
+from .retry import RetryBudget
+
+V = TypeVar('V')
+
+
+@dataclass(frozen=True)
+class HedgeStats:
+    # Calls made once enough latencies were observed to hedge them
+    eligible: int
+    # Calls that sent a second request because the first was slower than the hedge delay
+    hedged: int
+    # Hedged calls answered by the second request
+    won: int
+    # Calls not hedged because the budget was exhausted, when they started or once the hedge delay elapsed
+    refused: int
+    # Second requests not sent because every worker was busy
+    busy: int
+
+
+# Sends a second request when the first one has not finished within a percentile of recent latencies, and uses the
+# response of whichever finishes first. Hedges draw from a budget that grows with every call, so a slow dependency
+# receives at most budget_ratio more requests. The budget starts empty, so a new instance does not hedge its first reads
+# regardless of the ratio.
+#
+# A call that cannot be hedged (too few latencies observed, budget empty or no free worker) runs in the calling thread.
+# Otherwise the first request runs on a worker so the caller can return the second one's response, and the second one
+# is only sent if another worker is free: requests never queue for a worker, like FanOut.
+class Hedger:
+    # Latencies observed before calls are hedged, and between updates of the hedge delay
+    min_samples = 20
+    update_every = 10
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        min_delay: float = 0.005,
+        budget_ratio: float = 0.05,
+        max_workers: int = 16,
+        window: int = 200,
+    ) -> None:
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.budget = RetryBudget(ratio=budget_ratio, min_per_second=0, initial_tokens=0)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedge')
+
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._pending = 0
+        self._delay: float | None = None
+        self._eligible = 0
+        self._won = 0
+        self._busy = 0
+        # Calls run without a hedge because the budget was empty when they started
+        self._refused = 0
+        self._lock = threading.Lock()
+
+    @property
+    def delay(self) -> float | None:
+        return self._delay
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self._pending += 1
+            if len(self._latencies) < self.min_samples or self._pending < self.update_every:
+                return
+
+            ordered = sorted(self._latencies)
+            index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+            self._delay = max(self.min_delay, ordered[index])
+            self._pending = 0
+
+    def run(self, fn: Callable[[], V]) -> V:
+        self.budget.deposit()
+        delay = self._delay
+        if delay is None:
+            return self._timed(fn)
+
+        with self._lock:
+            self._eligible += 1
+
+        if not self._budget_available() or not self._take_slot():
+            return self._timed(fn)
+
+        primary = self._submit(fn)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._take_slot():
+            return primary.result()
+        if not self.budget.try_withdraw():
+            self._slots.release()
+            return primary.result()
+
+        hedge = self._submit(fn)
+        pending: set[Future[V]] = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            self._won += 1
+                    return future.result()
+
+        # Both requests failed
+        return primary.result()
+
+    def _budget_available(self) -> bool:
+        if self.budget.available():
+            return True
+
+        with self._lock:
+            self._refused += 1
+        return False
+
+    def _take_slot(self) -> bool:
+        if self._slots.acquire(blocking=False):
+            return True
+
+        with self._lock:
+            self._busy += 1
+        return False
+
+    # Called with a slot acquired, which is released once the request finished
+    def _submit(self, fn: Callable[[], V]) -> Future[V]:
+        future = self.executor.submit(self._timed, fn)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _timed(self, fn: Callable[[], V]) -> V:
+        start = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def stats(self) -> HedgeStats:
+        budget_stats = self.budget.stats()
+        with self._lock:
+            return HedgeStats(
+                eligible=self._eligible,
+                hedged=budget_stats.retries,
+                won=self._won,
+                refused=budget_stats.exhausted + self._refused,
+                busy=self._busy,
+            )
@@ -0,0 +1,203 @@
+import itertools
+import threading
+import weakref
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+
+Shard = dict[tuple[str, ...], list[float]]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass(frozen=True)
+class Sample:
+    labels: dict[str, str]
+    value: float
+    # Appended to the family name, histograms report _bucket, _sum and _count samples
+    suffix: str = ''
+
+
+@dataclass(frozen=True)
+class MetricFamily:
+    name: str
+    type: str
+    help: str
+    samples: list[Sample] = field(default_factory=list)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ''
+
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class Histogram:
+    def __init__(
+        self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self.enabled = True
+
+        # Every thread records into its own shard, so observing never takes a lock. When a thread exits, its shard is
+        # folded into the retired totals, so short-lived threads do not accumulate shards.
+        self._local = threading.local()
+        self._shards: dict[int, Shard] = {}
+        self._retired: Shard = {}
+        self._shard_ids = itertools.count()
+        self._shards_lock = threading.Lock()
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        if not self.enabled:
+            return
+
+        try:
+            shard: Shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+
+        series = shard.get(labels)
+        if series is None:
+            # One counter per bucket plus +Inf, followed by the sum of the observed values
+            series = shard[labels] = [0.0] * (len(self.buckets) + 2)
+
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def collect(self) -> MetricFamily:
+        with self._shards_lock:
+            merged = {labels: list(series) for labels, series in self._retired.items()}
+            shards = list(self._shards.values())
+
+        for shard in shards:
+            self._merge(merged, shard)
+
+        family = MetricFamily(self.name, 'histogram', self.help)
+        for labels, series in sorted(merged.items()):
+            label_dict = dict(zip(self.label_names, labels, strict=True))
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, float('inf')), series, strict=False):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                family.samples.append(Sample({**label_dict, 'le': le}, cumulative, '_bucket'))
+            family.samples.append(Sample(label_dict, series[-1], '_sum'))
+            family.samples.append(Sample(label_dict, cumulative, '_count'))
+
+        return family
+
+    def reset(self) -> None:
+        with self._shards_lock:
+            for shard in self._shards.values():
+                shard.clear()
+            self._retired.clear()
+
+    def _new_shard(self) -> Shard:
+        shard: Shard = {}
+        shard_id = next(self._shard_ids)
+        # Dropped with the other attributes of the thread when it exits, which retires the shard
+        holder = _ShardHolder()
+        weakref.finalize(holder, self._retire, shard_id)
+        self._local.shard = shard
+        self._local.holder = holder
+        with self._shards_lock:
+            self._shards[shard_id] = shard
+        return shard
+
+    def _retire(self, shard_id: int) -> None:
+        with self._shards_lock:
+            shard = self._shards.pop(shard_id, None)
+            if shard is not None:
+                self._merge(self._retired, shard)
+
+    @staticmethod
+    def _merge(merged: Shard, shard: Shard) -> None:
+        for labels, series in list(shard.items()):
+            total = merged.setdefault(labels, [0.0] * len(series))
+            for i, value in enumerate(list(series)):
+                total[i] += value
+
+
+class _ShardHolder:
+    pass
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.histograms: list[Histogram] = []
+
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str]) -> Histogram:
+        histogram = Histogram(name, help_text, label_names)
+        self.histograms.append(histogram)
+        return histogram
+
+    def set_enabled(self, enabled: bool) -> None:  # noqa: FBT001
+        for histogram in self.histograms:
+            histogram.enabled = enabled
+
+    def reset(self) -> None:
+        for histogram in self.histograms:
+            histogram.reset()
+
+    def render(self, extra: Iterable[MetricFamily] = ()) -> str:
+        families = [histogram.collect() for histogram in self.histograms]
+        families.extend(extra)
+        return render_families(families)
+
+
+def render_families(families: Iterable[MetricFamily]) -> str:
+    # Prometheus text exposition format 0.0.4
+    lines: list[str] = []
+    for family in families:
+        lines.append(f'# HELP {family.name} {family.help}')
+        lines.append(f'# TYPE {family.name} {family.type}')
+        lines.extend(
+            f'{family.name}{sample.suffix}{_format_labels(sample.labels)} {_format_value(sample.value)}'
+            for sample in family.samples
+        )
+
+    return '\n'.join(lines) + '\n'
+
+
+def counter_family(name: str, help_text: str, samples: Iterable[tuple[dict[str, str], float]]) -> MetricFamily:
+    return MetricFamily(name, 'counter', help_text, [Sample(labels, value) for labels, value in samples])
+
+
+def gauge_family(name: str, help_text: str, samples: Iterable[tuple[dict[str, str], float]]) -> MetricFamily:
+    return MetricFamily(name, 'gauge', help_text, [Sample(labels, value) for labels, value in samples])
+
+
+registry = MetricsRegistry()
+
+request_seconds = registry.histogram(
+    'registroapp_request_duration_seconds',
+    'Time spent handling HTTP requests.',
+    ('route', 'method', 'status'),
+)
+downstream_seconds = registry.histogram(
+    'registroapp_downstream_duration_seconds',
+    'Time spent on calls to other services.',
+    ('service', 'method', 'path', 'status'),
+)
+validation_seconds = registry.histogram(
+    'registroapp_validation_duration_seconds',
+    'Time spent validating request bodies.',
+    ('schema',),
+)
+serialization_seconds = registry.histogram(
+    'registroapp_serialization_duration_seconds',
+    'Time spent serializing response bodies.',
+    ('backend',),
+)
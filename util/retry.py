@@ -0,0 +1,91 @@
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RetryStats:
+    retries: int
+    # Retries that were not made because the budget was exhausted
+    exhausted: int
+
+
+# Retries are allowed as a fraction of the requests made, plus a small fixed rate so that low traffic can still retry.
+# This bounds the extra load retries put on a dependency that is already struggling.
+class RetryBudget:
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        min_per_second: float = 1,
+        max_tokens: float = 10,
+        initial_tokens: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.clock = clock
+
+        # Full unless given, so retries are allowed right after startup
+        self._tokens = max_tokens if initial_tokens is None else initial_tokens
+        self._updated_at = clock()
+        self._retries = 0
+        self._exhausted = 0
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    # Whether try_withdraw would succeed, without withdrawing or counting
+    def available(self) -> bool:
+        with self._lock:
+            self._refill()
+            return self._tokens >= 1
+
+    def try_withdraw(self) -> bool:
+        with self._lock:
+            self._refill()
+
+            if self._tokens < 1:
+                self._exhausted += 1
+                return False
+
+            self._tokens -= 1
+            self._retries += 1
+            return True
+
+    def stats(self) -> RetryStats:
+        with self._lock:
+            return RetryStats(retries=self._retries, exhausted=self._exhausted)
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self._tokens = min(self._tokens + (now - self._updated_at) * self.min_per_second, self.max_tokens)
+        self._updated_at = now
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        budget: RetryBudget,
+        max_attempts: int = 2,
+        backoff_base: float = 0.05,
+        backoff_max: float = 0.5,
+        retry_statuses: Iterable[int] = (502, 503, 504),
+    ) -> None:
+        self.budget = budget
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def should_retry(self, attempt: int) -> bool:
+        return attempt < self.max_attempts and self.budget.try_withdraw()
+
+    def backoff(self, attempt: int) -> float:
+        # Full jitter, so clients that failed together do not retry together
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))  # noqa: S311
@@ -0,0 +1,82 @@
+import dataclasses
+import functools
+import json
+import time
+from typing import Any, Protocol
+
+from .metrics import serialization_seconds
+
+
+class JsonSerializer(Protocol):
+    name: str
+
+    def dumps(self, data: object) -> bytes: ...  # pragma: no cover
+
+
+@functools.cache
+def _field_names(cls: type[Any]) -> tuple[str, ...]:
+    return tuple(f.name for f in dataclasses.fields(cls))
+
+
+def _dataclass_to_dict(obj: object) -> dict[str, Any]:
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {name: getattr(obj, name) for name in _field_names(type(obj))}
+
+    raise TypeError(f'Object of type {obj.__class__.__name__} is not JSON serializable')
+
+
+class StdlibJsonSerializer:
+    name = 'stdlib'
+
+    def __init__(self) -> None:
+        # json.dumps builds a new encoder on every call when given any option, so build it once
+        self._encoder = json.JSONEncoder(separators=(',', ':'), default=_dataclass_to_dict)
+
+    def dumps(self, data: object) -> bytes:
+        return self._encoder.encode(data).encode()
+
+
+class OrjsonSerializer:
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._dumps = orjson.dumps
+
+    def dumps(self, data: object) -> bytes:
+        # orjson serializes dataclasses (and enums) natively, without building an intermediate dict
+        return self._dumps(data)
+
+
+def create_serializer(backend: str = 'auto') -> JsonSerializer:
+    if backend == 'stdlib':
+        return StdlibJsonSerializer()
+
+    try:
+        return OrjsonSerializer()
+    except ImportError:
+        if backend == 'orjson':
+            raise
+        return StdlibJsonSerializer()
+
+
+_serializer = create_serializer()
+
+
+def set_serializer(serializer: JsonSerializer) -> None:
+    global _serializer  # noqa: PLW0603
+    _serializer = serializer
+
+
+def get_serializer() -> JsonSerializer:
+    return _serializer
+
+
+def dumps(data: object) -> bytes:
+    serializer = _serializer
+    start = time.perf_counter()
+    try:
+        return serializer.dumps(data)
+    finally:
+        serialization_seconds.observe((serializer.name,), time.perf_counter() - start)
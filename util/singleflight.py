@@ -0,0 +1,52 @@
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from typing import Generic, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+# Concurrent calls with the same key share the execution (and the result or error) of the first one
+class SingleFlight(Generic[K, V]):
+    def __init__(self) -> None:
+        self._calls: dict[K, Future[V]] = {}
+        self._lock = threading.Lock()
+        self._executed = 0
+        self._shared = 0
+
+    def do(self, key: K, fn: Callable[[], V]) -> V:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if future is None:
+                future = Future()
+                self._calls[key] = future
+                self._executed += 1
+            else:
+                self._shared += 1
+
+        if not leader:
+            # Another thread is running the call, wait for its outcome
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    @property
+    def executed(self) -> int:
+        return self._executed
+
+    # Calls that did not run because they joined one already in flight
+    @property
+    def shared(self) -> int:
+        return self._shared
@@ -0,0 +1,27 @@
+import tempfile
+from typing import IO, cast
+
+CHUNK_BYTES = 64 * 1024
+
+
+# Uploads that have to be read whole before they are processed, kept in memory up to memory_bytes and in a file in path
+# beyond. The default temporary directory is in memory on Cloud Run, so large uploads need path on a mounted volume.
+class UploadSpool:
+    def __init__(self, path: str | None = None, max_bytes: int = 512 * 1024 * 1024, memory_bytes: int = 1024 * 1024) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+
+    # The whole stream, positioned at its start, or None when it is longer than max_bytes
+    def read(self, stream: IO[bytes]) -> IO[bytes] | None:
+        spool = tempfile.SpooledTemporaryFile(max_size=self.memory_bytes, dir=self.path)  # noqa: SIM115
+        total = 0
+        while chunk := stream.read(CHUNK_BYTES):
+            total += len(chunk)
+            if total > self.max_bytes:
+                spool.close()
+                return None
+            spool.write(chunk)
+
+        spool.seek(0)
+        return cast(IO[bytes], spool)
@@ -0,0 +1,120 @@
+# Startup profile of the service: import time of the app module broken down by the modules it imports, the phases of
+# create_app and the first request, each measured in a fresh interpreter.
+#
+#   python -m util.startup
+#   python -m util.startup --json
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)$')
+
+HEALTH_URL = '/api/v1/health/registroapp'
+
+
+@dataclass(frozen=True)
+class Phase:
+    name: str
+    seconds: float
+
+
+class StartupProfile:
+    def __init__(self) -> None:
+        self.phases: list[Phase] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append(Phase(name, time.perf_counter() - start))
+
+    def seconds(self, name: str) -> float:
+        return sum(phase.seconds for phase in self.phases if phase.name == name)
+
+    @property
+    def total(self) -> float:
+        return sum(phase.seconds for phase in self.phases)
+
+
+def parse_importtime(output: str, module: str) -> tuple[float, list[Phase]]:
+    # Returns the cumulative import time of the module and of each module it imports directly, slowest first.
+    # Python reports every module after the modules it imported, two spaces deeper.
+    children: list[Phase] = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+
+        seconds, depth, name = int(match[1]) / 1e6, len(match[2]), match[3]
+        if depth == 0:
+            if name == module:
+                return seconds, sorted(children, key=lambda phase: phase.seconds, reverse=True)
+            children = []
+        elif depth == 2:  # noqa: PLR2004
+            children.append(Phase(name, seconds))
+
+    raise ValueError(f'Module {module} not found in import time output')
+
+
+def profile_imports(module: str = 'app') -> tuple[float, list[Phase]]:
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr, module)
+
+
+def profile_app() -> tuple[StartupProfile, StartupProfile]:
+    # Only meaningful in a fresh interpreter, where importing the app module is not a no-op
+    profile = StartupProfile()
+    with profile.phase('import'):
+        from app import create_app
+
+    with profile.phase('create_app'):
+        app = create_app()
+
+    with profile.phase('first_response'):
+        app.test_client().get(HEALTH_URL)
+
+    return profile, app.startup
+
+
+def print_phases(phases: list[Phase], indent: int = 0) -> None:
+    for phase in phases:
+        print(f'{" " * indent}{phase.name:<{40 - indent}} {phase.seconds * 1e3:>9.1f} ms')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--json', action='store_true', help='print the startup phases as JSON, without the import breakdown')
+    parser.add_argument('--top', type=int, default=10, help='modules shown in the import breakdown')
+    args = parser.parse_args()
+
+    profile, create_app_profile = profile_app()
+
+    if args.json:
+        phases = {phase.name: phase.seconds for phase in profile.phases}
+        phases.update({f'create_app.{phase.name}': phase.seconds for phase in create_app_profile.phases})
+        print(json.dumps({**phases, 'total': profile.total}))
+        return
+
+    import_seconds, modules = profile_imports()
+    print_phases([Phase('import app', import_seconds)])
+    print_phases(modules[: args.top], indent=2)
+    print_phases([Phase('create_app', profile.seconds('create_app'))])
+    print_phases(create_app_profile.phases, indent=2)
+    print_phases([Phase('first response', profile.seconds('first_response')), Phase('time to first response', profile.total)])
+
+
+if __name__ == '__main__':
+    main()
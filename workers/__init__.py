@@ -0,0 +1,14 @@
+from .audit import AuditLog
+from .forwarder import IncidentForwarder
+from .health import DependencyHealth, HealthMonitor
+from .warmup import Warmup, WarmupStatus, WarmupTask
+
+__all__ = [
+    'AuditLog',
+    'DependencyHealth',
+    'HealthMonitor',
+    'IncidentForwarder',
+    'Warmup',
+    'WarmupStatus',
+    'WarmupTask',
+]
@@ -0,0 +1,107 @@
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+from models import AuditRecord
+from util.audit import AuditFileWriter
+
+
+@dataclass(frozen=True)
+class AuditStats:
+    recorded: int
+    # Records not kept because the buffer was full
+    dropped: int
+    written: int
+    # Records lost because their batch could not be written
+    failed: int
+    buffered: int
+
+
+# Registrations are recorded into a bounded in-memory buffer, which a background thread writes in batches. Recording
+# never waits for the disk: when the writer falls behind and the buffer is full, new records are dropped and counted.
+class AuditLog:
+    # The buffer is written at least this often, and as soon as it holds batch_size records
+    flush_interval = 1.0
+
+    def __init__(self, writer: AuditFileWriter, capacity: int = 10000, batch_size: int = 1000) -> None:
+        self.writer = writer
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._buffer: deque[AuditRecord] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._recorded = 0
+        self._dropped = 0
+        self._written = 0
+        self._failed = 0
+        self._batch_ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def record(self, record: AuditRecord) -> None:
+        with self._lock:
+            if len(self._buffer) >= self.capacity:
+                self._dropped += 1
+                return
+
+            self._buffer.append(record)
+            self._recorded += 1
+            if len(self._buffer) >= self.batch_size:
+                self._batch_ready.set()
+
+    def flush(self) -> int:
+        # Batches are written one at a time and in order, recording only waits for the buffer to be swapped
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, deque()
+
+            if not batch:
+                return 0
+
+            try:
+                self.writer.write(batch)
+            except OSError:
+                self.logger.exception('Unable to write %d audit records', len(batch))
+                with self._lock:
+                    self._failed += len(batch)
+                return 0
+
+            with self._lock:
+                self._written += len(batch)
+            return len(batch)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='audit-log', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        # Writes whatever is still buffered
+        self._stop.set()
+        self._batch_ready.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._batch_ready.wait(self.flush_interval)
+            self._batch_ready.clear()
+            self.flush()
+
+    def stats(self) -> AuditStats:
+        with self._lock:
+            return AuditStats(
+                recorded=self._recorded,
+                dropped=self._dropped,
+                written=self._written,
+                failed=self._failed,
+                buffered=len(self._buffer),
+            )
@@ -0,0 +1,126 @@
+import logging
+import random
+import threading
+import time
+
+import requests
+
+from repositories import IncidentRepository, SubmissionRepository
+from util.breaker import CircuitOpenError
+
+
+class IncidentForwarder:
+    # Idle workers check the queue this often
+    poll_interval = 0.5
+    # Submissions still sending after this long (the process died) are delivered again
+    lease = 60.0
+    backoff_base = 1.0
+    backoff_max = 60.0
+    # Client errors retried like server errors
+    transient_statuses = frozenset({requests.codes.request_timeout, requests.codes.too_many_requests})
+    # Registered and failed submissions older than the retention are deleted this often
+    purge_interval = 600.0
+
+    def __init__(
+        self,
+        submissions: SubmissionRepository,
+        incident_repo: IncidentRepository,
+        workers: int = 2,
+        max_attempts: int = 8,
+        retention: float = 86400,
+    ) -> None:
+        self.submissions = submissions
+        self.incident_repo = incident_repo
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retention = retention
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._purge_lock = threading.Lock()
+        self._purged_at: float | None = None
+
+    def start(self) -> None:
+        if self._threads:
+            return
+
+        self._stop.clear()
+        self._threads = [threading.Thread(target=self._run, name=f'forwarder-{i}', daemon=True) for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def forward_next(self) -> bool:
+        submission = self.submissions.claim(self.lease)
+        if submission is None:
+            return False
+
+        # Delivery is at least once: a submission whose create timed out or failed with a server error is sent again,
+        # and one claimed again after its lease expired may be sent twice. The submission id is sent as idempotency key,
+        # so the incident service creates the incident only once.
+        try:
+            response = self.incident_repo.create(submission.incident, idempotency_key=submission.id)
+        except CircuitOpenError as exc:
+            # Nothing was sent, so however long the incident service is down this is not counted as an attempt
+            delay = max(self.backoff(submission.attempts), exc.retry_after)
+            self.logger.warning('Incident service unavailable, submission %s postponed by %.1fs', submission.id, delay)
+            self.submissions.postpone(submission.id, f'{exc.__class__.__name__}: {exc}', delay)
+        except Exception as exc:
+            error = f'{exc.__class__.__name__}: {exc}'
+
+            if self._is_permanent(exc) or submission.attempts >= self.max_attempts:
+                self.logger.exception('Giving up on incident submission %s', submission.id)
+                self.submissions.fail(submission.id, error)
+            else:
+                delay = self.backoff(submission.attempts)
+                self.logger.warning('Incident submission %s failed, retrying in %.1fs: %s', submission.id, delay, error)
+                self.submissions.retry(submission.id, error, delay)
+        else:
+            self.submissions.complete(submission.id, response)
+
+        return True
+
+    # Runs on one worker at a time, at most once per purge_interval
+    def purge_settled(self) -> int:
+        now = time.monotonic()
+        with self._purge_lock:
+            if self._purged_at is not None and now - self._purged_at < self.purge_interval:
+                return 0
+            self._purged_at = now
+
+        purged = self.submissions.purge(self.retention)
+        if purged:
+            self.logger.info('Deleted %d settled incident submissions', purged)
+        return purged
+
+    def backoff(self, attempts: int) -> float:
+        # Exponential with jitter, so a recovering service is not hit by every queued submission at once
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return random.uniform(delay / 2, delay)  # noqa: S311
+
+    def _is_permanent(self, exc: Exception) -> bool:
+        # Requests rejected by the incident service will be rejected again, unless it timed out or was throttled
+        return (
+            isinstance(exc, requests.HTTPError)
+            and exc.response is not None
+            and exc.response.status_code < requests.codes.server_error
+            and exc.response.status_code not in self.transient_statuses
+        )
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.purge_settled()
+                forwarded = self.forward_next()
+            except Exception:
+                self.logger.exception('Unable to forward queued incidents')
+                forwarded = False
+
+            if not forwarded:
+                self._stop.wait(self.poll_interval)
@@ -0,0 +1,88 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class DependencyHealth:
+    healthy: bool
+    # Seconds the last probe took
+    latency: float
+    # Wall clock time the last probe finished
+    checked_at: float
+    error: str | None
+
+
+# Downstream dependencies are probed concurrently by a background thread every interval, and health checks only read
+# the last results. A health check never waits for the network and never adds load to the dependencies, however often
+# it is called.
+class HealthMonitor:
+    def __init__(self, interval: float = 30, max_age: float = 90) -> None:
+        self.interval = interval
+        # Results older than this (the refresher is stuck) no longer count as healthy
+        self.max_age = max_age
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._probes: dict[str, Callable[[], object]] = {}
+        # Replaced as a whole on every update, so readers get a consistent snapshot without locking
+        self._results: dict[str, DependencyHealth] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(self, name: str, probe: Callable[[], object]) -> None:
+        self._probes[name] = probe
+
+    @property
+    def dependencies(self) -> list[str]:
+        return list(self._probes)
+
+    def results(self) -> dict[str, DependencyHealth]:
+        return self._results
+
+    def refresh(self) -> None:
+        # Probes are bounded by the HTTP timeouts of each service, a round takes as long as the slowest one
+        if not self._probes:
+            return
+
+        with ThreadPoolExecutor(max_workers=len(self._probes), thread_name_prefix='health') as executor:
+            for name, probe in self._probes.items():
+                executor.submit(self._probe, name, probe)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='health', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            self.refresh()
+            if self._stop.wait(self.interval):
+                return
+
+    def _probe(self, name: str, probe: Callable[[], object]) -> None:
+        start = time.perf_counter()
+        error = None
+        try:
+            probe()
+        except Exception as exc:  # noqa: BLE001
+            error = str(exc) or exc.__class__.__name__
+            self.logger.warning('Health probe of %s failed: %s', name, error)
+
+        result = DependencyHealth(
+            healthy=error is None, latency=time.perf_counter() - start, checked_at=time.time(), error=error
+        )
+        with self._lock:
+            self._results = {**self._results, name: result}
@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class WarmupTask:
+    name: str
+    # pending, done or failed
+    status: str
+    # Seconds the task took, None while pending
+    duration: float | None
+    error: str | None
+
+
+@dataclass(frozen=True)
+class WarmupStatus:
+    ready: bool
+    # Seconds since the warm-up started, until it was ready
+    elapsed: float
+    tasks: tuple[WarmupTask, ...]
+
+
+# The work the first requests of a new instance would otherwise do themselves (opening connections, fetching tokens,
+# building schemas, loading caches) runs in parallel on background threads when the app starts. The instance is ready
+# once every task finished or timeout elapsed: warm-up is best effort, after a failed task the first request that needs
+# it does the work as before.
+class Warmup:
+    def __init__(self, max_workers: int = 8, timeout: float = 10) -> None:
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._tasks: dict[str, Callable[[], object]] = {}
+        self._results: dict[str, WarmupTask] = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._started_at: float | None = None
+        self._ready_at: float | None = None
+        self._thread: threading.Thread | None = None
+
+    def add(self, name: str, task: Callable[[], object]) -> None:
+        self._tasks[name] = task
+        self._results[name] = WarmupTask(name=name, status='pending', duration=None, error=None)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='warmup', daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def status(self) -> WarmupStatus:
+        ready = self._ready.is_set()
+        started_at = self._started_at
+        end = self._ready_at if ready and self._ready_at is not None else time.monotonic()
+
+        with self._lock:
+            tasks = tuple(self._results.values())
+
+        return WarmupStatus(ready=ready, elapsed=0 if started_at is None else end - started_at, tasks=tasks)
+
+    def _run(self) -> None:
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='warmup')
+        try:
+            futures = [executor.submit(self._run_task, name, task) for name, task in self._tasks.items()]
+            _, pending = wait(futures, self.timeout)
+            if pending:
+                self.logger.warning('Warm-up not finished after %.1fs, %d tasks still pending', self.timeout, len(pending))
+        finally:
+            # Tasks still running are left to finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._ready_at = time.monotonic()
+            self._ready.set()
+
+    def _run_task(self, name: str, task: Callable[[], object]) -> None:
+        start = time.perf_counter()
+        try:
+            task()
+        except Exception as exc:
+            self.logger.exception('Warm-up task %s failed', name)
+            result = WarmupTask(name=name, status='failed', duration=time.perf_counter() - start, error=str(exc))
+        else:
+            result = WarmupTask(name=name, status='done', duration=time.perf_counter() - start, error=None)
+
+        with self._lock:
+            self._results[name] = result